@@ -0,0 +1,27 @@
+import React from 'react'
+import toast from 'react-hot-toast'
+import { useProgramStore } from '../store/programStore'
+import { Button } from './ui/Button'
+
+// The program list comes one page at a time; shown while the server has more
+const LoadMorePrograms: React.FC = () => {
+  const { nextCursor, isLoadingMore, fetchMorePrograms } = useProgramStore()
+
+  if (!nextCursor) return null
+
+  const handleClick = () => {
+    fetchMorePrograms().catch((error: any) => {
+      toast.error(error.message || 'Failed to load more programs')
+    })
+  }
+
+  return (
+    <div className="flex justify-center">
+      <Button variant="outline" onClick={handleClick} disabled={isLoadingMore}>
+        {isLoadingMore ? 'Loading...' : 'Load more programs'}
+      </Button>
+    </div>
+  )
+}
+
+export default LoadMorePrograms
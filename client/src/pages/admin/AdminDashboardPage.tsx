@@ -8,7 +8,9 @@ import { LoadingSpinner } from '../../components/ui/LoadingSpinner'
 import { formatDate, isToday } from '../../utils/date'
 
 const AdminDashboardPage: React.FC = () => {
-  const { programs, isLoading, fetchPrograms } = useProgramStore()
+  const { programs, nextCursor, isLoading, fetchPrograms } = useProgramStore()
+  // Only the first page is loaded; more exist while there is a next cursor
+  const programCount = `${programs.length}${nextCursor ? '+' : ''}`
   const { user, logout } = useAuthStore()
 
   useEffect(() => {
@@ -94,7 +96,7 @@ const AdminDashboardPage: React.FC = () => {
               </div>
           </CardHeader>
           <CardContent>
-              <div className="text-4xl font-black text-primary mb-1 group-hover:scale-105 transition-transform">{programs.length}</div>
+              <div className="text-4xl font-black text-primary mb-1 group-hover:scale-105 transition-transform">{programCount}</div>
               <p className="text-sm text-muted-foreground font-medium">All time programs created</p>
               <div className="mt-3 pt-3 border-t border-border/50">
                 <span className="text-xs text-primary font-semibold">View all →</span>
@@ -244,7 +246,7 @@ const AdminDashboardPage: React.FC = () => {
                 <div className="text-center pt-4">
                   <Button asChild variant="outline" className="shadow-brand hover:shadow-brand-lg">
                     <Link to="/admin/programs">
-                      View All {programs.length} Programs →
+                      View All {programCount} Programs →
                     </Link>
                   </Button>
                 </div>
@@ -6,6 +6,7 @@ import { Card, CardContent, CardHeader, CardTitle } from '../../components/ui/Ca
 import { Button } from '../../components/ui/Button'
 import { LoadingSpinner } from '../../components/ui/LoadingSpinner'
 import { formatDate, isToday } from '../../utils/date'
+import LoadMorePrograms from '../../components/LoadMorePrograms'
 import toast from 'react-hot-toast'
 
 const AdminProgramsPage: React.FC = () => {
@@ -152,6 +153,8 @@ const AdminProgramsPage: React.FC = () => {
           ))}
         </div>
       )}
+
+      <LoadMorePrograms />
     </div>
   )
 }
@@ -6,6 +6,7 @@ import { Card, CardContent, CardHeader, CardTitle } from '../../components/ui/Ca
 import { Button } from '../../components/ui/Button'
 import { LoadingSpinner } from '../../components/ui/LoadingSpinner'
 import { formatDate, isToday } from '../../utils/date'
+import LoadMorePrograms from '../../components/LoadMorePrograms'
 
 const HomePage: React.FC = () => {
   const { programs, isLoading, error: programsError, fetchPrograms } = useProgramStore()
@@ -14,7 +15,7 @@ const HomePage: React.FC = () => {
   const [showInstallButton, setShowInstallButton] = useState(false)
 
   useEffect(() => {
-    // Fetch all active programs
+    // First page of active programs (newest first)
     fetchPrograms(undefined, true).catch((err) => {
       console.error('Failed to fetch programs:', err)
     })
@@ -173,6 +174,7 @@ const HomePage: React.FC = () => {
                 </div>
               ))}
           </div>
+          <LoadMorePrograms />
         </div>
       )}
 
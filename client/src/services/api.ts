@@ -1,5 +1,5 @@
 import axios, { AxiosInstance } from 'axios'
-import { ApiResponse, User, Program, ProgramWithDetails } from '../types'
+import { ApiResponse, User, Program, ProgramPage, ProgramWithDetails } from '../types'
 import { useAuthStore } from '../store/authStore'
 import toast from 'react-hot-toast'
 
@@ -297,15 +297,16 @@ class ApiService {
     }
   }
 
-  async getPrograms(churchId?: number, isActive?: boolean): Promise<Program[]> {
+  async getPrograms(churchId?: number, isActive?: boolean, cursor?: string | null): Promise<ProgramPage> {
     const params = new URLSearchParams()
     if (churchId) params.append('church_id', churchId.toString())
     if (isActive !== undefined) params.append('is_active', isActive.toString())
+    if (cursor) params.append('cursor', cursor)
 
     const response = await this.api.get<ApiResponse<Program[]>>(`/programs?${params.toString()}`)
     
     if (response.data.success && response.data.data) {
-      return response.data.data
+      return { programs: response.data.data, nextCursor: response.data.meta?.next_cursor ?? null }
     }
     throw new Error(response.data.error || 'Failed to fetch programs')
   }
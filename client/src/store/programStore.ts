@@ -4,11 +4,16 @@ import apiService from '../services/api'
 
 interface ProgramStore {
   programs: Program[]
+  // Cursor of the next page of programs (null once every page is loaded)
+  nextCursor: string | null
+  programFilters: { churchId?: number; isActive?: boolean }
   activeProgram: ProgramWithDetails | null
   isLoading: boolean
+  isLoadingMore: boolean
   error: string | null
   
   fetchPrograms: (churchId?: number, isActive?: boolean) => Promise<void>
+  fetchMorePrograms: () => Promise<void>
   fetchProgramById: (id: number) => Promise<void>
   createProgram: (data: any) => Promise<Program>
   updateProgram: (id: number, data: any) => Promise<Program>
@@ -32,23 +37,39 @@ interface ProgramStore {
   reorderSpecialGuests: (programId: number, guests: any[]) => Promise<void>
 }
 
-export const useProgramStore = create<ProgramStore>((set) => ({
+export const useProgramStore = create<ProgramStore>((set, get) => ({
   programs: [],
+  nextCursor: null,
+  programFilters: {},
   activeProgram: null,
   isLoading: false,
+  isLoadingMore: false,
   error: null,
 
   fetchPrograms: async (churchId?: number, isActive?: boolean) => {
-    set({ isLoading: true, error: null })
+    set({ isLoading: true, error: null, programFilters: { churchId, isActive } })
     try {
-      const programs = await apiService.getPrograms(churchId, isActive)
-      set({ programs, isLoading: false })
+      const { programs, nextCursor } = await apiService.getPrograms(churchId, isActive)
+      set({ programs, nextCursor, isLoading: false })
     } catch (error: any) {
       set({ isLoading: false, error: error.message })
       throw error
     }
   },
 
+  fetchMorePrograms: async () => {
+    const { nextCursor: cursor, programFilters, isLoadingMore } = get()
+    if (!cursor || isLoadingMore) return
+    set({ isLoadingMore: true, error: null })
+    try {
+      const { programs, nextCursor } = await apiService.getPrograms(programFilters.churchId, programFilters.isActive, cursor)
+      set(state => ({ programs: [...state.programs, ...programs], nextCursor, isLoadingMore: false }))
+    } catch (error: any) {
+      set({ isLoadingMore: false, error: error.message })
+      throw error
+    }
+  },
+
   fetchProgramById: async (id: number) => {
     set({ isLoading: true, error: null, activeProgram: null })
     try {
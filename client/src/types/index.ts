@@ -71,6 +71,17 @@ export interface ApiResponse<T = any> {
   data?: T
   error?: string
   message?: string
+  meta?: {
+    next_cursor?: string | null
+    limit?: number
+    [key: string]: any
+  }
+}
+
+// One page of GET /programs (newest first); pass nextCursor back for the next page
+export interface ProgramPage {
+  programs: Program[]
+  nextCursor: string | null
 }
 
 // Input types for creating schedule items and special guests (without database-generated fields)
@@ -0,0 +1,42 @@
+"""add composite indexes for hot read paths
+
+Revision ID: 008_add_hot_path_indexes
+Revises: 007_convert_schedule_item_start_time_to_string
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_hot_path_indexes'
+down_revision = '007_convert_schedule_item_start_time_to_string'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Program list keyset order: (date DESC NULLS LAST, id DESC), optionally per church
+    op.create_index(
+        'ix_programs_church_id_date_id', 'programs',
+        ['church_id', sa.text('date DESC NULLS LAST'), sa.text('id DESC')],
+    )
+    op.create_index('ix_programs_date_id', 'programs', [sa.text('date DESC NULLS LAST'), sa.text('id DESC')])
+    # Program details: children of one program in display order
+    op.create_index('ix_schedule_items_program_id_order', 'schedule_items', ['program_id', 'order_index', 'id'])
+    op.create_index('ix_special_guests_program_id_order', 'special_guests', ['program_id', 'display_order', 'id'])
+    # Template list: newest first per church
+    op.create_index(
+        'ix_program_templates_church_id_created_at', 'program_templates',
+        ['church_id', sa.text('created_at DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_program_templates_church_id_created_at', table_name='program_templates')
+    op.drop_index('ix_special_guests_program_id_order', table_name='special_guests')
+    op.drop_index('ix_schedule_items_program_id_order', table_name='schedule_items')
+    op.drop_index('ix_programs_date_id', table_name='programs')
+    op.drop_index('ix_programs_church_id_date_id', table_name='programs')
@@ -0,0 +1,40 @@
+"""add fractional rank keys to schedule items and special guests
+
+Revision ID: 009_add_child_rank_keys
+Revises: 008_add_hot_path_indexes
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_add_child_rank_keys'
+down_revision = '008_add_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+# Backfilled keys: 8 hex digits of (2n - 1) * 4095 for the n-th row of a program.
+# Hex digits are valid rank digits, the keys are evenly spaced and, being odd, never end in "0".
+BACKFILL_SQL = """
+    UPDATE {table} AS t
+    SET rank = lpad(to_hex((2 * ordered.n - 1) * 4095), 8, '0')
+    FROM (
+        SELECT id, row_number() OVER (PARTITION BY program_id ORDER BY {position}, id) AS n
+        FROM {table}
+    ) AS ordered
+    WHERE t.id = ordered.id
+"""
+
+
+def upgrade() -> None:
+    for table, position in (('schedule_items', 'order_index'), ('special_guests', 'display_order')):
+        op.add_column(table, sa.Column('rank', sa.String(length=64, collation='C'), nullable=True))
+        op.execute(BACKFILL_SQL.format(table=table, position=position))
+
+
+def downgrade() -> None:
+    op.drop_column('special_guests', 'rank')
+    op.drop_column('schedule_items', 'rank')
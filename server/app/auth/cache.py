@@ -0,0 +1,45 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+from app.config import settings
+from app.programs.cache import ResponseCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as endpoints see it (get_current_user). A plain value
+    rather than a User row, so it can be cached across requests and sessions.
+    """
+    id: int
+    username: str
+    role: Optional[str]
+    church_id: Optional[int]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, username=user.username, role=user.role, church_id=user.church_id)
+
+
+# Principals keyed by user id; only users that exist are cached
+principal_cache = ResponseCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Decoded access token payloads keyed by token digest; never outlive the token's exp
+token_cache = ResponseCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+def token_digest(token: str) -> bytes:
+    # Keys are digests so the cache does not keep bearer tokens in memory
+    return hashlib.sha256(token.encode()).digest()
+
+
+def invalidate_user(user_id: int) -> None:
+    """Call after committing any change to a user outside the ORM (e.g. a Core UPDATE)."""
+    principal_cache.invalidate(user_id)
+
@@ -1,5 +1,7 @@
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
+from app.auth.cache import token_cache, token_digest
 from app.config import settings
 
 
@@ -18,10 +20,23 @@ def create_refresh_token(data: dict) -> str:
 
 
 def verify_access_token(token: str):
+    """
+    Decoded payload of a valid access token, or None. Valid tokens are cached until
+    their exp (token_cache), so repeat requests with the same token skip the decode.
+    """
+    key = token_digest(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+    load = token_cache.begin_load()
     try:
-        return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
     except JWTError:
         return None
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        token_cache.set(key, payload, load, ttl_seconds=expires_at - time.time())
+    return payload
 
 
 def verify_refresh_token(token: str):
@@ -1,19 +1,47 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database.connection import get_db
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.database.connection import get_async_db
 from app.models.database import User
+from app.auth.cache import Principal, invalidate_user, principal_cache
 from app.auth.jwt_handler import verify_access_token
 
 security = HTTPBearer(auto_error=False)
 
 
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    # ORM writes to users, sync or async, drop the cached principal at flush and
+    # again after commit: a request in between can still cache the old row
+    invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _user_changes_committed(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _user_changes_rolled_back(session):
+    session.info.pop("changed_user_ids", None)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """
     Get current authenticated user from JWT token.
+    
+    The user is looked up once and then served from principal_cache until it
+    changes or the entry expires; a cache hit never touches the database.
     """
     if not credentials:
         raise HTTPException(
@@ -39,12 +67,19 @@ async def get_current_user(
             detail="Invalid token payload"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    
+    load = principal_cache.begin_load()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(user_id, principal, load)
+    return principal
 
@@ -1,9 +1,21 @@
-from passlib.context import CryptContext
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.config import settings
 
 
-# Use bcrypt without deprecated="auto" to force the scheme
-# The "auto" flag causes passlib to select bcrypt_sha256, which has issues
-pwd_context = CryptContext(schemes=["bcrypt"])
+@functools.lru_cache(maxsize=None)
+def pwd_context():
+    """
+    The passlib context, built on first use: only login, register and seeding hash
+    passwords, so other workers never import passlib/bcrypt.
+    """
+    from passlib.context import CryptContext
+    # Use bcrypt without deprecated="auto" to force the scheme
+    # The "auto" flag causes passlib to select bcrypt_sha256, which has issues
+    return CryptContext(schemes=["bcrypt"])
 
 
 def hash_password(password: str) -> str:
@@ -16,7 +28,7 @@ def hash_password(password: str) -> str:
         password = password_bytes.decode('utf-8', 'ignore')
         print(f"⚠️  Password truncated from {original_len} to {len(password)} bytes")
     
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -27,5 +39,100 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         password_bytes = password_bytes[:72]
         plain_password = password_bytes.decode('utf-8', 'ignore')
     
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
+
+
+class PasswordHashPoolBusy(Exception):
+    """Raised when too many password hash/verify calls are already waiting."""
+
+
+class PasswordHashPool:
+    """
+    Dedicated, size-limited thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so threads are enough to keep the ~200ms of CPU
+    per call off the event loop. Submissions beyond max_pending (running +
+    queued) are rejected instead of piling up behind the workers.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._max_run_seconds = 0.0
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHashPoolBusy(f"{self._pending} password operations already pending")
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+
+        def timed_call():
+            started_at = time.perf_counter()
+            result = func(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        try:
+            future = self._executor.submit(timed_call)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # Accounting follows the worker, not this coroutine: a cancelled caller (client
+        # gone mid-login) does not stop a hash that is already running
+        future.add_done_callback(self._finished)
+        result, _, _ = await asyncio.wrap_future(future)
+        return result
+
+    def _finished(self, future) -> None:
+        """Runs when the worker finishes the call, or when it is cancelled before it started."""
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            _, wait_seconds, run_seconds = future.result()
+            self._completed += 1
+            self._wait_seconds += wait_seconds
+            self._run_seconds += run_seconds
+            self._max_run_seconds = max(self._max_run_seconds, run_seconds)
+
+    def stats(self) -> dict:
+        """Snapshot of pool depth and timing counters."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "queue_depth": max(0, self._pending - self.max_workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_seconds_total": self._wait_seconds,
+                "run_seconds_total": self._run_seconds,
+                "run_seconds_max": self._max_run_seconds,
+            }
+
+
+password_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt pool; raises PasswordHashPoolBusy when saturated."""
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt pool; raises PasswordHashPoolBusy when saturated."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
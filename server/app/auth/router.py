@@ -1,14 +1,16 @@
 import logging
+import traceback
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from app.database.connection import get_db
+from app.database.connection import ReleaseSessionRoute, get_async_db
 from app.models.database import User, Church
 from app.models.schemas import (
     LoginRequest, LoginResponse, UserResponse,
     RefreshResponse, LogoutResponse, SuccessResponse
 )
-from app.auth.password import verify_password, hash_password
+from app.auth.password import verify_password_async, hash_password_async, PasswordHashPoolBusy
 from app.auth.jwt_handler import (
     create_access_token, create_refresh_token,
     verify_access_token, verify_refresh_token
@@ -16,16 +18,16 @@ from app.auth.jwt_handler import (
 from app.config import settings
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=ReleaseSessionRoute)
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(credentials: LoginRequest, response: Response, db: Session = Depends(get_db)):
+async def login(credentials: LoginRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
     try:
         logger.info("Login attempt", extra={"username": credentials.username})
         
         # Query user from database
-        user = db.query(User).filter(User.username == credentials.username).first()
+        user = await db.scalar(select(User).where(User.username == credentials.username))
         
         # Check if user exists and password is valid
         if not user:
@@ -35,8 +37,11 @@ async def login(credentials: LoginRequest, response: Response, db: Session = Dep
                 detail="Invalid credentials"
             )
         
+        # Hand the connection back before bcrypt, which can queue (see PASSWORD_HASH_MAX_PENDING)
+        await db.close()
+        
         # Verify password
-        password_valid = verify_password(credentials.password, user.password_hash)
+        password_valid = await verify_password_async(credentials.password, user.password_hash)
         if not password_valid:
             logger.warning("Login failed: invalid password", extra={"username": credentials.username})
             raise HTTPException(
@@ -65,6 +70,12 @@ async def login(credentials: LoginRequest, response: Response, db: Session = Dep
     except HTTPException:
         # Re-raise HTTP exceptions (401 for invalid credentials)
         raise
+    except PasswordHashPoolBusy:
+        logger.warning("Login rejected: password hashing pool saturated", extra={"username": credentials.username})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service busy, please retry"
+        )
     except SQLAlchemyError as e:
         # Database connection/query errors
         logger.error("Database error during login", exc_info=True, extra={"username": credentials.username})
@@ -82,7 +93,7 @@ async def login(credentials: LoginRequest, response: Response, db: Session = Dep
 
 
 @router.post("/refresh", response_model=RefreshResponse)
-async def refresh_token(request: Request, db: Session = Depends(get_db)):
+async def refresh_token(request: Request, db: AsyncSession = Depends(get_async_db)):
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token missing")
@@ -93,7 +104,7 @@ async def refresh_token(request: Request, db: Session = Depends(get_db)):
 
     username = payload.get("sub")
     user_id = payload.get("user_id")
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
@@ -102,7 +113,7 @@ async def refresh_token(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(request: Request, db: Session = Depends(get_db)):
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)):
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
@@ -113,7 +124,7 @@ async def get_current_user(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     username = payload.get("sub")
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
@@ -133,24 +144,26 @@ async def logout(response: Response):
 
 
 @router.post("/register", response_model=SuccessResponse)
-async def register(credentials: LoginRequest, db: Session = Depends(get_db)):
+async def register(credentials: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     try:
-        existing_user = db.query(User).filter(User.username == credentials.username).first()
+        existing_user = await db.scalar(select(User).where(User.username == credentials.username))
         if existing_user:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
 
-        church = db.query(Church).first()
+        church = await db.scalar(select(Church).limit(1))
         if not church:
             church = Church(name="Default Church")
             db.add(church)
-            db.commit()
-            db.refresh(church)
+            await db.commit()
+            await db.refresh(church)
         
         # Ensure church has an ID
         if not church or not church.id:
             raise ValueError(f"Failed to create or retrieve church. Church: {church}")
 
-        hashed_password = hash_password(credentials.password)
+        # Not holding a connection while bcrypt runs; the INSERT below takes a fresh one
+        await db.close()
+        hashed_password = await hash_password_async(credentials.password)
         user = User(
             username=credentials.username,
             email=None,  # Email is optional
@@ -159,14 +172,18 @@ async def register(credentials: LoginRequest, db: Session = Depends(get_db)):
             church_id=church.id
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         
         return SuccessResponse(success=True, message="User registered successfully")
     except HTTPException:
         raise
+    except PasswordHashPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Registration service busy, please retry"
+        )
     except Exception as e:
-        import traceback
         print(f"❌ Register error: {e}")
         print(f"📋 Traceback:\n{traceback.format_exc()}")
         raise HTTPException(
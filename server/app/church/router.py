@@ -1,29 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.database.connection import get_db
-from app.models.database import Church, User
+from app.database.connection import ReleaseSessionRoute, get_async_db, get_read_db
+from app.models.database import Church
 from app.models.schemas import ChurchUpdate, ChurchResponse, create_api_response
-from app.auth.middleware import get_current_user
+from app.auth.middleware import Principal, get_current_user
+from app.etag import TaggedBody, conditional_response
+from app.singleflight import SingleFlight
 
-router = APIRouter()
+router = APIRouter(route_class=ReleaseSessionRoute)
+
+church_info_loads = SingleFlight()
+
+
+def invalidate_church_info(church_id: int) -> None:
+    """Call after committing a change to a church: later requests must not join a load that began before it."""
+    church_info_loads.forget(church_id)
+    # /info without church_id serves the first church, which may be this one
+    church_info_loads.forget(None)
 
 
 @router.get("/info")
-async def get_church_info(church_id: Optional[int] = None, db: Session = Depends(get_db)):
+async def get_church_info(request: Request, church_id: Optional[int] = None, db: AsyncSession = Depends(get_read_db)):
     """
     Get public church information.
-    No authentication required.
+    No authentication required. Honors If-None-Match.
     """
+    # Concurrent identical requests share one DB load
+    church_data = await church_info_loads.do(church_id, lambda: load_church_info(db, church_id))
+    return conditional_response(request, TaggedBody.from_content(create_api_response(data=church_data)))
+
+
+async def load_church_info(db: AsyncSession, church_id: Optional[int]):
     if church_id:
-        church = db.query(Church).filter(Church.id == church_id).first()
+        church = await db.scalar(select(Church).where(Church.id == church_id))
     else:
         # Get first church as default
-        church = db.query(Church).first()
+        church = await db.scalar(select(Church).limit(1))
     
     if not church:
         # Return a default church if none exists
-        default_church = {
+        return {
             "id": 0,
             "name": "Numz",
             "short_name": None,
@@ -32,22 +50,20 @@ async def get_church_info(church_id: Optional[int] = None, db: Session = Depends
             "theme_config": None,
             "created_at": None
         }
-        return create_api_response(data=default_church)
     
-    church_response = ChurchResponse.model_validate(church)
-    return create_api_response(data=church_response)
+    return ChurchResponse.model_validate(church)
 
 
 @router.get("/settings")
 async def get_church_settings(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get church settings (requires authentication)."""
     if not current_user.church_id:
         return create_api_response(error="User has no associated church")
     
-    church = db.query(Church).filter(Church.id == current_user.church_id).first()
+    church = await db.scalar(select(Church).where(Church.id == current_user.church_id))
     if not church:
         return create_api_response(error="Church not found")
     
@@ -58,31 +74,25 @@ async def get_church_settings(
 @router.put("/settings")
 async def update_church_settings(
     settings: ChurchUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Update church settings (requires authentication)."""
+    """Update church settings (requires authentication). One UPDATE ... RETURNING."""
     if not current_user.church_id:
         return create_api_response(error="User has no associated church")
     
-    church = db.query(Church).filter(Church.id == current_user.church_id).first()
+    changes = settings.model_dump(exclude_none=True)
+    if changes:
+        church = await db.scalar(
+            update(Church).where(Church.id == current_user.church_id).values(changes).returning(Church)
+        )
+    else:
+        church = await db.scalar(select(Church).where(Church.id == current_user.church_id))
     if not church:
         return create_api_response(error="Church not found")
     
-    # Update fields
-    if settings.name is not None:
-        church.name = settings.name
-    if settings.short_name is not None:
-        church.short_name = settings.short_name
-    if settings.address is not None:
-        church.address = settings.address
-    if settings.description is not None:
-        church.description = settings.description
-    if settings.theme_config is not None:
-        church.theme_config = settings.theme_config
-    
-    db.commit()
-    db.refresh(church)
+    await db.commit()
+    invalidate_church_info(current_user.church_id)
     
     church_response = ChurchResponse.model_validate(church)
     return create_api_response(data=church_response)
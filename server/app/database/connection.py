@@ -1,16 +1,88 @@
+import functools
+import inspect
+from fastapi import Request
+from fastapi.routing import APIRoute
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
+from app.database.instrumentation import instrument_engine
+from app.database.pool import PoolStats, pool_options
+from app.database.replicas import ReadRouter, Replica
 
 
 is_postgres = settings.DATABASE_URL.startswith("postgres://") or settings.DATABASE_URL.startswith("postgresql://")
 connect_args = {"sslmode": "require"} if is_postgres else {}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+sync_pool_stats = PoolStats()
+engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, **pool_options(sync_pool_stats, is_async=False))
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching asyncio driver (asyncpg / aiosqlite)."""
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+# asyncpg takes "ssl" instead of libpq's "sslmode"
+async_connect_args = {"ssl": "require"} if is_postgres else {}
+
+async_pool_stats = PoolStats()
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    connect_args=async_connect_args,
+    **pool_options(async_pool_stats, is_async=True),
+)
+instrument_engine(async_engine)
+# expire_on_commit=False: attributes must stay readable after commit without an implicit (blocking) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def create_read_engine(url: str, stats: PoolStats):
+    """
+    Engine for public reads: autocommit, so a request's SELECTs go out without BEGIN/ROLLBACK
+    around them, and on Postgres read-only for the whole connection (set at connect time,
+    no extra round trip), so a write through it fails instead of committing.
+    """
+    read_connect_args = {}
+    if url.startswith("postgres://") or url.startswith("postgresql://"):
+        read_connect_args = {"ssl": "require", "server_settings": {"default_transaction_read_only": "on"}}
+    read_engine = create_async_engine(
+        get_async_database_url(url),
+        connect_args=read_connect_args,
+        isolation_level="AUTOCOMMIT",
+        **pool_options(stats, is_async=True),
+    )
+    instrument_engine(read_engine)
+    return read_engine
+
+
+def read_sessionmaker(read_engine) -> async_sessionmaker:
+    return async_sessionmaker(read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+read_pool_stats = PoolStats()
+async_read_engine = create_read_engine(settings.DATABASE_URL, read_pool_stats)
+AsyncReadSessionLocal = read_sessionmaker(async_read_engine)
+
+# Optional read replicas for get_read_db (see app/database/replicas.py)
+replica_pool_stats = [PoolStats() for _ in settings.DATABASE_REPLICA_URLS]
+replica_engines = [create_read_engine(url, stats) for url, stats in zip(settings.DATABASE_REPLICA_URLS, replica_pool_stats)]
+read_router = ReadRouter(
+    AsyncReadSessionLocal,
+    [Replica(f"replica-{index}", replica_engine, read_sessionmaker(replica_engine))
+     for index, replica_engine in enumerate(replica_engines)],
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -18,3 +90,56 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db(request: Request):
+    """
+    Async variant of get_db used by the API routers; never blocks the event loop on DB I/O.
+    
+    The session takes a pooled connection only when its first statement runs. Routers
+    built with ReleaseSessionRoute give it back as soon as the endpoint returns. Its
+    commits pin the request's user and program to the primary for reads (read_router).
+    """
+    async with AsyncSessionLocal() as db:
+        read_router.track_writes(db, request)
+        yield db
+
+
+async def get_read_db(request: Request):
+    """
+    Session for public GET endpoints on a read-only autocommit engine: a replica when
+    DATABASE_REPLICA_URLS is set (see read_router), otherwise the primary. Each statement
+    is its own implicit transaction: no BEGIN/ROLLBACK round trips and no snapshot held
+    between statements. Only for handlers that never write.
+    """
+    async with read_router.sessionmaker_for(request)() as db:
+        yield db
+
+
+class ReleaseSessionRoute(APIRoute):
+    """
+    Route class that closes the endpoint's AsyncSession arguments as soon as the endpoint
+    returns, instead of at dependency teardown, which on this FastAPI version only runs
+    after the response has been serialized and sent. The connection goes back to the pool
+    before any of that; uncommitted work is rolled back exactly as at teardown. ORM objects
+    stay readable afterwards (loaded attributes, expire_on_commit=False), just detached.
+    
+    Sessions shared with sub-dependencies are the same object (FastAPI caches get_async_db
+    per request), so get_current_user's lookup is released here too.
+    """
+    
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _release_sessions_on_return(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _release_sessions_on_return(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            for value in kwargs.values():
+                if isinstance(value, AsyncSession):
+                    await value.close()
+    return wrapper
@@ -34,7 +34,7 @@ def ensure_admin_user():
             db.add(church)
             db.commit()
             db.refresh(church)
-            logger.info("Default church created", extra={"church_id": church.id, "name": church.name})
+            logger.info("Default church created", extra={"church_id": church.id, "church_name": church.name})
         
         # Create admin user
         hashed_password_str = hash_password("password")
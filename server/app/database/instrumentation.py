@@ -0,0 +1,136 @@
+"""
+Per-request SQL statistics from engine events.
+
+instrument_engine() hooks before/after_cursor_execute on an engine. While a
+QueryStats is active in the current context (see ServerTimingMiddleware), every
+statement sent through an instrumented engine adds to its count and time. Async
+sessions run their statements in greenlets that share the calling task's context,
+so statements from get_async_db / get_read_db sessions are attributed to the
+request that issued them.
+
+The same events drive a development-time N+1 guard (QUERY_REPEAT_THRESHOLD):
+statements are grouped by shape, their SQL with literals and bind parameter
+lists collapsed, and a request that sends one shape more than the threshold
+allows is reported to repeated_query_detector. A loop issuing one SELECT or
+INSERT per item shows up as a single shape with a count that grows with the
+input; an executemany() batch is one statement.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional
+from sqlalchemy import event
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![$\w])\d+(?:\.\d+)?\b")
+# (?, ?), ($1, $2), (%(id_1)s, ...), (:id_1, ...): expanded IN lists and VALUES rows
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|\$\d+|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s|:\w+))*\s*\)")
+_ROW_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with literals and parameter lists collapsed, so per-row variants compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _LITERALS.sub("?", shape)
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _ROW_LIST.sub("(?)", shape)
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised when QUERY_REPEAT_RAISE is on and a request repeats a statement shape too often."""
+
+
+@dataclass
+class RepeatedQuery:
+    request: str
+    shape: str
+    count: int
+
+
+class RepeatedQueryDetector:
+    """
+    Collects requests that send the same statement shape more than `threshold` times.
+
+    Off when threshold is 0. Each offending shape is reported once per request,
+    when its count first exceeds the threshold: logged as a warning, appended to
+    `violations` (the test suite fails on new entries), and raised as
+    RepeatedQueryError if raise_errors is set. Raising from inside the cursor
+    event aborts the statement, so the traceback points at the loop issuing it.
+    """
+
+    def __init__(self, threshold: int = 0, raise_errors: bool = False):
+        self.threshold = threshold
+        self.raise_errors = raise_errors
+        self.violations: List[RepeatedQuery] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def record(self, stats: "QueryStats", statement: str) -> None:
+        shape = statement_shape(statement)
+        stats.shapes[shape] += 1
+        count = stats.shapes[shape]
+        if count != self.threshold + 1:
+            return
+        violation = RepeatedQuery(stats.label, shape, count)
+        self.violations.append(violation)
+        logger.warning("Repeated query shape (possible N+1)", extra={
+            "request": stats.label,
+            "statement": shape,
+            "threshold": self.threshold,
+        })
+        if self.raise_errors:
+            raise RepeatedQueryError(
+                f"{stats.label} sent this statement more than {self.threshold} times: {shape}"
+            )
+
+
+repeated_query_detector = RepeatedQueryDetector(settings.QUERY_REPEAT_THRESHOLD, settings.QUERY_REPEAT_RAISE)
+
+
+class QueryStats:
+    def __init__(self, label: str = ""):
+        self.statements = 0
+        self.seconds = 0.0
+        self.label = label
+        # Statement shape -> count, only while the repeated-query guard is on
+        self.shapes: Optional[Counter] = Counter() if repeated_query_detector.enabled else None
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += time.perf_counter() - started
+        if stats.shapes is not None:
+            repeated_query_detector.record(stats, statement)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Count statements and time spent in the database per request (sync or async engine)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
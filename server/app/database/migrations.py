@@ -1,14 +1,24 @@
+"""
+Alembic migrations and the boot-time revision check. alembic is imported only by the
+functions that run it (deploys, MIGRATE_ON_STARTUP): check_migrations does not need it.
+"""
 from app.database.connection import engine, Base
 from app.models.database import User, Church, Program, ProgramTemplate, ScheduleItem, SpecialGuest  # noqa: F401
 from app.config import settings
-from alembic import command
-from alembic.config import Config
+from sqlalchemy import inspect, text
+import functools
+import logging
 import os
+import re
 from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
 
 
 def get_alembic_config():
     """Get Alembic configuration."""
+    from alembic.config import Config
     # Get the server directory (parent of app directory)
     server_dir = Path(__file__).parent.parent.parent
     alembic_ini_path = server_dir / "alembic.ini"
@@ -28,6 +38,7 @@ def run_migrations(environment: str = "production"):
         - In production: Only logs warnings, doesn't auto-apply
         - In development: Auto-applies migrations
     """
+    from alembic import command
     try:
         alembic_cfg = get_alembic_config()
         
@@ -39,7 +50,6 @@ def run_migrations(environment: str = "production"):
         print(f"📌 Target revision: {head_revision}")
         
         # Check if alembic_version table exists (tracks applied migrations)
-        from sqlalchemy import inspect, text
         inspector = inspect(engine)
         existing_tables = inspector.get_table_names()
         
@@ -70,6 +80,8 @@ def run_migrations(environment: str = "production"):
             print("⚠️  Production environment: Applying migrations...")
             print("💡 Consider backing up database before major migrations")
         
+        widen_version_table()
+        
         # Run migrations (will skip already-applied ones)
         # If we stamped at 001_initial, this will only run 002_add_address
         command.upgrade(alembic_cfg, "head")
@@ -82,15 +94,56 @@ def run_migrations(environment: str = "production"):
         create_tables()
 
 
-def check_migrations():
-    """Check if there are pending migrations without applying them."""
-    try:
-        alembic_cfg = get_alembic_config()
-        # This would require connecting to DB to check current vs target revision
-        # For now, we'll just note that migrations will run on startup
-        print("✅ Migration system ready")
-    except Exception as e:
-        print(f"⚠️  Could not check migrations: {e}")
+def widen_version_table():
+    """
+    Alembic creates alembic_version.version_num as VARCHAR(32), shorter than some of
+    our revision ids (007_...), so Postgres rejected upgrades past 006. Create the
+    table with room for them, or widen an existing one, before upgrading.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if not inspector.has_table("alembic_version"):
+            conn.execute(text(
+                "CREATE TABLE alembic_version (version_num VARCHAR(255) NOT NULL, "
+                "CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+            ))
+        elif conn.dialect.name == "postgresql":
+            conn.execute(text("ALTER TABLE alembic_version ALTER COLUMN version_num TYPE VARCHAR(255)"))
+
+
+# revision = '...' / down_revision: Union[str, None] = '...' in a migration script
+_REVISION_LINE = re.compile(r"""^(down_revision|revision)\b[^=]*=\s*['"]([^'"]+)['"]""", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def head_revision() -> Optional[str]:
+    """
+    Head revision of the migration scripts, read from their revision/down_revision
+    lines without importing alembic or the scripts. Cached for the life of the process.
+    """
+    versions_dir = Path(__file__).parent.parent.parent / "alembic" / "versions"
+    revisions, parents = set(), set()
+    for script in versions_dir.glob("*.py"):
+        for name, value in _REVISION_LINE.findall(script.read_text()):
+            (revisions if name == "revision" else parents).add(value)
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+def check_migrations(current_revision: Optional[str]) -> bool:
+    """
+    Whether the database is at the head revision, given its alembic_version
+    (see SchemaRegistry.revision). Nothing is applied: deploys run
+    `python -m app.manage migrate` for that.
+    """
+    head = head_revision()
+    if current_revision == head:
+        return True
+    logger.warning("Database is not at the migration head; run `python -m app.manage migrate`", extra={
+        "alembic_revision": current_revision,
+        "head_revision": head,
+    })
+    return False
 
 
 def create_tables():
@@ -103,7 +156,6 @@ def create_tables():
     
     # Ensure address column exists in churches table (fix for current issue)
     try:
-        from sqlalchemy import text
         with engine.begin() as conn:
             # Check if column exists, add if missing
             result = conn.execute(text("""
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """
+    How long requests wait for a pooled connection, per engine.
+
+    "Wait" is the time from asking the pool for a connection until getting
+    one, including opening a new connection when the pool has to. Timeouts
+    are checkouts that gave up after DB_POOL_TIMEOUT_SECONDS: the pool was
+    exhausted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class _TimedCheckout:
+    """Mixin for QueuePool classes that records every checkout into self.stats."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            logger.warning("Database pool exhausted, checkout timed out", extra={
+                "pool_size": self.size(),
+                "overflow": self.overflow(),
+                "timeout_seconds": self.timeout(),
+            })
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return entry
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(stats: PoolStats, is_async: bool) -> dict:
+    """create_engine() keyword arguments for the pool, from Settings."""
+    pool_class = TimedAsyncQueuePool if is_async else TimedQueuePool
+    return {
+        "poolclass": type(pool_class.__name__, (pool_class,), {"stats": stats}),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_snapshot(engine) -> dict:
+    """Current pool occupancy plus the engine's checkout wait statistics."""
+    pool = engine.pool
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    snapshot = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool counts overflow from -pool_size; only connections beyond the pool are overflow
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+    }
+    if stats is not None:
+        snapshot.update({
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_seconds_total": round(stats.wait_seconds_total, 6),
+            "wait_seconds_max": round(stats.wait_seconds_max, 6),
+        })
+    return snapshot
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> int:
+    """
+    Open `connections` pooled connections at once and run SELECT 1 on each, so
+    the TLS handshake and authentication happen here rather than in a request.
+    They go back to the pool afterwards. Returns how many connections answered.
+    """
+    connections = max(0, min(connections, settings.DB_POOL_SIZE))
+    opened = await asyncio.gather(*(_ping(engine) for _ in range(connections)), return_exceptions=True)
+    try:
+        failures = [result for result in opened if isinstance(result, BaseException)]
+        if failures:
+            logger.warning("Database warm-up could not open every connection", extra={
+                "requested": connections,
+                "failed": len(failures),
+                "error": str(failures[0]),
+            })
+        return connections - len(failures)
+    finally:
+        for connection in opened:
+            if not isinstance(connection, BaseException):
+                await connection.close()
+
+
+async def _ping(engine: AsyncEngine):
+    # Connections stay checked out until warm_up() closes them, so each ping uses its own
+    connection = await engine.connect()
+    try:
+        await connection.execute(text("SELECT 1"))
+        await connection.rollback()
+    except BaseException:
+        await connection.close()
+        raise
+    return connection
+
+
+async def keep_alive(engine: AsyncEngine, interval_seconds: float, connections: int):
+    """
+    Background task: every interval, ping the warm connections so idle ones are
+    neither dropped by the server/proxy nor found stale by the next request.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await warm_up(engine, connections)
+        except Exception:
+            logger.warning("Database keepalive ping failed", exc_info=True)
@@ -0,0 +1,133 @@
+"""
+Read-replica routing for the public GET endpoints (get_read_db).
+
+Reads go round-robin to the healthy replicas in DATABASE_REPLICA_URLS; writes
+always use the primary. Replicas lag, so after a commit the writing user, and the
+program the request wrote to, read from the primary for READ_YOUR_WRITES_SECONDS:
+an editor reloading a program right after bulk_update_program sees the new data,
+and the program cache is never refilled from a replica that has not caught up.
+The window is tracked per process.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Sequence
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette.requests import Request
+from app.auth.jwt_handler import verify_access_token
+
+logger = logging.getLogger(__name__)
+
+# Expired read-your-writes entries are pruned once the table grows past this
+PRUNE_AFTER_ENTRIES = 1024
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine, sessionmaker: async_sessionmaker):
+        self.name = name
+        self.engine = engine
+        self.sessionmaker = sessionmaker
+        self.healthy = True
+        event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # A dropped or refused connection takes the replica out until the next health check passes
+        if context.is_disconnect and self.healthy:
+            self.healthy = False
+            logger.warning("Read replica disconnected, routing reads elsewhere", extra={"replica": self.name})
+
+
+class ReadRouter:
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[Replica],
+        sticky_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.sticky_seconds = sticky_seconds
+        self._clock = clock
+        self._turn = itertools.count()
+        self._sticky_until: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def sessionmaker_for(self, request: Request) -> async_sessionmaker:
+        """Where this GET should read: the next healthy replica, or the primary."""
+        if self.enabled and not self.is_sticky(request_keys(request)):
+            healthy = [replica for replica in self.replicas if replica.healthy]
+            if healthy:
+                self.replica_reads += 1
+                return healthy[next(self._turn) % len(healthy)].sessionmaker
+        self.primary_reads += 1
+        return self.primary
+
+    def track_writes(self, db: AsyncSession, request: Request):
+        """Pin the request's user and program to the primary whenever `db` commits."""
+        if not self.enabled:
+            return
+        keys = request_keys(request)
+        event.listen(db.sync_session, "after_commit", lambda session: self.mark_write(keys))
+
+    def mark_write(self, keys: Sequence[Hashable]):
+        now = self._clock()
+        with self._lock:
+            if len(self._sticky_until) > PRUNE_AFTER_ENTRIES:
+                self._sticky_until = {key: until for key, until in self._sticky_until.items() if until > now}
+            for key in keys:
+                self._sticky_until[key] = now + self.sticky_seconds
+
+    def is_sticky(self, keys: Sequence[Hashable]) -> bool:
+        now = self._clock()
+        return any(self._sticky_until.get(key, 0.0) > now for key in keys)
+
+    async def check_health(self, timeout_seconds: float) -> List[bool]:
+        """Ping every replica; a replica is healthy when SELECT 1 answers within the timeout."""
+        return await asyncio.gather(*(self._check(replica, timeout_seconds) for replica in self.replicas))
+
+    async def _check(self, replica: Replica, timeout_seconds: float) -> bool:
+        try:
+            async with asyncio.timeout(timeout_seconds):
+                async with replica.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            healthy = True
+        except Exception as e:
+            healthy = False
+            error = str(e)
+        if healthy != replica.healthy:
+            if healthy:
+                logger.info("Read replica healthy again", extra={"replica": replica.name})
+            else:
+                logger.warning("Read replica failed health check", extra={"replica": replica.name, "error": error})
+        replica.healthy = healthy
+        return healthy
+
+    async def run_health_checks(self, interval_seconds: float):
+        """Background task: re-check the replicas every interval."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.check_health(timeout_seconds=interval_seconds)
+
+
+def request_keys(request: Request) -> List[Hashable]:
+    """Read-your-writes keys of a request: the bearer token's user and the program in the path."""
+    keys: List[Hashable] = []
+    authorization = request.headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        payload = verify_access_token(authorization[7:].strip())
+        if payload and payload.get("user_id") is not None:
+            keys.append(("user", payload["user_id"]))
+    program_id = request.path_params.get("program_id")
+    if program_id is not None:
+        keys.append(("program", str(program_id)))
+    return keys
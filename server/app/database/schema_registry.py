@@ -0,0 +1,172 @@
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+from sqlalchemy import Column, Integer, MetaData, Table, bindparam, insert, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.types import NullType
+from app.database.connection import Base, is_postgres
+
+logger = logging.getLogger(__name__)
+
+# Tables whose optional columns the routers care about, with the minimal
+# column set to assume if the table cannot be inspected at all
+TRACKED_TABLES = {
+    "schedule_items": ("id", "program_id", "title"),
+    "special_guests": ("id", "program_id", "name"),
+}
+
+# Whether insert_many_statement() returns ids in parameter order. SQLite falls back to one
+# statement per row when asked for ordering, but assigns rowids in VALUES order, so callers
+# there can sort the ids of a batch instead
+ORDERED_RETURNING = is_postgres
+
+# How often (at most) a process re-reads alembic_version to notice a new migration
+REVISION_CHECK_INTERVAL_SECONDS = 60.0
+
+
+class SchemaRegistry:
+    """
+    Process-wide view of which columns actually exist in the database.
+
+    Built once at startup (after run_migrations) and re-inspected only when
+    the alembic revision changes, so write endpoints no longer pay catalog
+    round trips per request. Also caches the INSERT ... RETURNING
+    statement for every column set the routers ask for.
+    """
+
+    def __init__(self, tracked_tables: Dict[str, Tuple[str, ...]] = TRACKED_TABLES):
+        self.tracked_tables = tracked_tables
+        self.revision: Optional[str] = None
+        self.loaded = False
+        self._columns: Dict[str, FrozenSet[str]] = {}
+        self._insert_statements: Dict[Tuple[str, Tuple[str, ...], Tuple[str, ...]], Insert] = {}
+        self._insert_many_statements: Dict[Tuple[str, Tuple[str, ...]], Insert] = {}
+        self._last_revision_check = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, connection: Connection) -> None:
+        """Inspect the tracked tables and record the current alembic revision."""
+        inspector = inspect(connection)
+        existing_tables = set(inspector.get_table_names())
+        columns = {}
+        for table_name, minimal_columns in self.tracked_tables.items():
+            table_columns = []
+            if table_name in existing_tables:
+                table_columns = [col['name'] for col in inspector.get_columns(table_name)]
+            if not table_columns:
+                logger.warning("Could not inspect columns, using minimal set", extra={"table": table_name})
+                table_columns = list(minimal_columns)
+            columns[table_name] = frozenset(table_columns)
+
+        revision = self._read_revision(connection, "alembic_version" in existing_tables)
+        with self._lock:
+            if columns != self._columns:
+                self._insert_statements.clear()
+                self._insert_many_statements.clear()
+            self._columns = columns
+            self.revision = revision
+            self.loaded = True
+            self._last_revision_check = time.monotonic()
+        logger.info("Schema registry loaded", extra={
+            "alembic_revision": revision,
+            "columns": {table: sorted(cols) for table, cols in columns.items()},
+        })
+
+    def refresh_if_revision_changed(self, connection: Connection) -> bool:
+        """
+        Re-inspect when the alembic revision differs from the one loaded.
+        The revision itself is read at most every REVISION_CHECK_INTERVAL_SECONDS.
+        Returns True if the registry was (re)loaded.
+        """
+        if not self.loaded:
+            self.load(connection)
+            return True
+        if time.monotonic() - self._last_revision_check < REVISION_CHECK_INTERVAL_SECONDS:
+            return False
+
+        has_version_table = inspect(connection).has_table("alembic_version")
+        revision = self._read_revision(connection, has_version_table)
+        self._last_revision_check = time.monotonic()
+        if revision == self.revision:
+            return False
+        logger.info("Alembic revision changed, reloading schema registry", extra={
+            "previous_revision": self.revision,
+            "alembic_revision": revision,
+        })
+        self.load(connection)
+        return True
+
+    def needs_check(self) -> bool:
+        return not self.loaded or time.monotonic() - self._last_revision_check >= REVISION_CHECK_INTERVAL_SECONDS
+
+    def columns(self, table_name: str) -> FrozenSet[str]:
+        return self._columns.get(table_name, frozenset(self.tracked_tables.get(table_name, ())))
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return column_name in self.columns(table_name)
+
+    def insert_statement(self, table_name: str, columns: Iterable[str], returning: Iterable[str] = ("id",)) -> Insert:
+        """
+        Cached parameterized INSERT ... RETURNING for exactly these columns, for one row.
+        `returning` names the columns the statement hands back (ids only by default), so
+        a caller can build its response from the INSERT itself instead of reading the row again.
+        """
+        columns, returning = tuple(columns), tuple(returning)
+        key = (table_name, columns, returning)
+        statement = self._insert_statements.get(key)
+        if statement is None:
+            table = self._private_table(table_name, dict.fromkeys(columns + returning))
+            statement = insert(table).values({col: bindparam(col) for col in columns}).returning(
+                *[table.c[col] for col in returning]
+            )
+            self._insert_statements[key] = statement
+        return statement
+
+    def insert_many_statement(self, table_name: str, columns: Iterable[str]) -> Insert:
+        """
+        Cached INSERT ... RETURNING id for exactly these columns, meant for a list of parameter sets.
+
+        SQLAlchemy batches the list into multi-row VALUES statements. On Postgres the ids
+        come back in parameter order; SQLite cannot batch with that guarantee, so there the
+        ids are returned unordered (see ORDERED_RETURNING). The statement targets a private
+        Table holding only these columns (typed like the model), so model-side defaults
+        never add a column the database lacks.
+        """
+        columns = tuple(columns)
+        key = (table_name, columns)
+        statement = self._insert_many_statements.get(key)
+        if statement is None:
+            table = self._private_table(table_name, columns)
+            statement = insert(table).returning(table.c.id, sort_by_parameter_order=ORDERED_RETURNING)
+            self._insert_many_statements[key] = statement
+        return statement
+
+    @staticmethod
+    def _private_table(table_name: str, columns: Iterable[str]) -> Table:
+        """A Table with only `columns` (plus id), typed like the model, so nothing the database lacks is ever rendered."""
+        model_table = Base.metadata.tables.get(table_name)
+        return Table(
+            table_name, MetaData(),
+            Column("id", Integer, primary_key=True),
+            *[Column(col, model_table.c[col].type if model_table is not None and col in model_table.c else NullType())
+              for col in columns if col != "id"],
+        )
+
+    @staticmethod
+    def _read_revision(connection: Connection, has_version_table: bool) -> Optional[str]:
+        if not has_version_table:
+            return None
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+schema_registry = SchemaRegistry()
+
+
+async def get_schema_registry(db: AsyncSession) -> SchemaRegistry:
+    """Return the registry, loading it or re-checking the alembic revision only when due."""
+    if schema_registry.needs_check():
+        await db.run_sync(lambda sync_session: schema_registry.refresh_if_revision_changed(sync_session.connection()))
+    return schema_registry
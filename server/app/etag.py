@@ -0,0 +1,51 @@
+"""
+Conditional GET support for public read endpoints.
+
+ETags are strong validators computed from the exact response bytes, so any
+change to a program or its children (including reorders, which do not touch
+programs.updated_at) yields a new tag without extra bookkeeping on writes.
+"""
+import hashlib
+from typing import NamedTuple, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Clients may keep the body but must revalidate before reusing it
+CACHE_CONTROL = "no-cache"
+
+
+class TaggedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, body: bytes) -> "TaggedBody":
+        return cls(body, compute_etag(body))
+
+    @classmethod
+    def from_content(cls, content) -> "TaggedBody":
+        """Serialize exactly as FastAPI would for a plain return value."""
+        return cls.of(JSONResponse(content=jsonable_encoder(content)).body)
+
+
+def compute_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison (RFC 9110 13.1.2), so W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_response(request: Request, tagged: TaggedBody) -> Response:
+    """304 with no body if the client already holds this representation, otherwise the full body."""
+    headers = {"ETag": tagged.etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), tagged.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=tagged.body, media_type="application/json", headers=headers)
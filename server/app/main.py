@@ -1,17 +1,27 @@
+import asyncio
 import logging
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from app.database.migrations import run_migrations
+from app.database.migrations import check_migrations, run_migrations
+from app.database.connection import async_engine, async_read_engine, engine, read_router, replica_engines
+from app.database.pool import keep_alive, pool_snapshot, warm_up
+from app.database.schema_registry import schema_registry
 from app.database.init_data import ensure_admin_user
 from app.middleware.cors import setup_cors
 from app.middleware.error_handler import validation_exception_handler, general_exception_handler
+from app.middleware.timing import ServerTimingMiddleware
 from app.auth.router import router as auth_router
 from app.programs.router import router as programs_router
 from app.church.router import router as church_router
 from app.templates.router import router as templates_router
 from app.config import settings
+from app.auth.cache import principal_cache, token_cache
+from app.auth.password import password_pool
+from app.metrics import registry as metrics_registry
+from app.programs.cache import program_cache
 
 # Configure logging
 logging.basicConfig(
@@ -52,6 +62,9 @@ setup_cors(app)
 # Trust proxy headers AFTER CORS (this runs first to process headers)
 app.add_middleware(ProxyHeadersMiddleware)
 
+# Outermost, so its timing (Server-Timing header, request metrics) covers the other middleware too
+app.add_middleware(ServerTimingMiddleware)
+
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
@@ -61,28 +74,94 @@ app.include_router(programs_router, prefix="/api/v1/programs", tags=["programs"]
 app.include_router(church_router, prefix="/api/v1/church", tags=["church"])
 app.include_router(templates_router, prefix="/api/v1/templates", tags=["templates"])
 
+# starting -> warming -> ready, reported by /health (see warm_up_app)
+app.state.startup = "starting"
 
-@app.on_event("startup")
-async def startup_event():
+
+def load_schema_registry():
+    # Record which optional columns exist once, instead of inspecting per request
+    with engine.connect() as connection:
+        schema_registry.load(connection)
+    check_migrations(schema_registry.revision)
+
+
+async def warm_up_app():
+    """
+    Boot work that only makes the first requests faster: routers load the schema
+    registry lazily and pools open connections on demand if any of it fails.
+    """
+    app.state.startup = "warming"
     try:
-        # Run Alembic migrations to ensure database schema is up to date
-        logger.info("Running database migrations...")
-        run_migrations(environment=settings.ENVIRONMENT)
-        logger.info("Database migrations completed successfully")
+        await asyncio.to_thread(load_schema_registry)
     except Exception as e:
-        # Do not crash app on startup if migrations fail; log and continue
-        logger.warning(f"Database migrations skipped due to error: {e}")
-        logger.warning("Server will continue, but database may be out of sync")
+        logger.warning(f"Schema registry not loaded at startup: {e}")
     
     try:
-        # Ensure admin user exists
-        logger.info("Checking for admin user...")
-        ensure_admin_user()
-        logger.info("Admin user initialization completed")
+        # Open connections now so the first requests do not pay for the handshake
+        warmed = await asyncio.gather(*(
+            warm_up(pool_engine, settings.DB_POOL_WARMUP_CONNECTIONS)
+            for pool_engine in (async_engine, async_read_engine, *replica_engines)
+        ))
+        logger.info("Database pools warmed up", extra={"connections": warmed})
     except Exception as e:
-        # Do not crash app on startup if initialization fails; log and continue
-        logger.warning(f"Admin user initialization failed: {e}")
-        logger.warning("Server will continue, but admin user may not exist")
+        logger.warning(f"Database pool warm-up failed: {e}")
+    app.state.startup = "ready"
+
+
+@app.on_event("startup")
+async def startup_event():
+    if settings.MIGRATE_ON_STARTUP:
+        try:
+            # Run Alembic migrations to ensure database schema is up to date
+            logger.info("Running database migrations...")
+            run_migrations(environment=settings.ENVIRONMENT)
+            logger.info("Database migrations completed successfully")
+        except Exception as e:
+            # Do not crash app on startup if migrations fail; log and continue
+            logger.warning(f"Database migrations skipped due to error: {e}")
+            logger.warning("Server will continue, but database may be out of sync")
+    
+    if settings.SEED_ON_STARTUP:
+        try:
+            # Ensure admin user exists
+            logger.info("Checking for admin user...")
+            ensure_admin_user()
+            logger.info("Admin user initialization completed")
+        except Exception as e:
+            # Do not crash app on startup if initialization fails; log and continue
+            logger.warning(f"Admin user initialization failed: {e}")
+            logger.warning("Server will continue, but admin user may not exist")
+    
+    if settings.STARTUP_IN_BACKGROUND:
+        app.state.warm_up_task = asyncio.create_task(warm_up_app())
+    else:
+        await warm_up_app()
+    
+    if settings.DB_KEEPALIVE_INTERVAL_SECONDS > 0:
+        app.state.keepalive_tasks = [
+            asyncio.create_task(keep_alive(pool_engine, settings.DB_KEEPALIVE_INTERVAL_SECONDS, settings.DB_POOL_WARMUP_CONNECTIONS))
+            for pool_engine in (async_engine, async_read_engine, *replica_engines)
+        ]
+    
+    if read_router.enabled:
+        # Replicas that stop answering are skipped until a later check passes
+        app.state.replica_health_task = asyncio.create_task(
+            read_router.run_health_checks(settings.REPLICA_HEALTH_CHECK_SECONDS)
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    warm_up_task = getattr(app.state, "warm_up_task", None)
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    for keepalive_task in getattr(app.state, "keepalive_tasks", []):
+        keepalive_task.cancel()
+    replica_health_task = getattr(app.state, "replica_health_task", None)
+    if replica_health_task is not None:
+        replica_health_task.cancel()
+    for pool_engine in (async_engine, async_read_engine, *replica_engines):
+        await pool_engine.dispose()
 
 
 @app.get("/")
@@ -108,6 +187,76 @@ async def api_v1_info():
 
 @app.get("/health")
 async def health_check():
-    return {"success": True, "status": "healthy"}
+    # Pool occupancy and checkout waits, so pool exhaustion shows up before requests time out
+    return {
+        "success": True,
+        "status": "healthy",
+        "startup": app.state.startup,
+        "database_pool": pool_snapshot(async_engine),
+        "database_read_pool": pool_snapshot(async_read_engine),
+        "database_replicas": [
+            {"name": replica.name, "healthy": replica.healthy, "pool": pool_snapshot(replica.engine)}
+            for replica in read_router.replicas
+        ],
+    }
+
+
+
+
+def pool_engines() -> dict:
+    return {
+        "primary": async_engine,
+        "read": async_read_engine,
+        **{replica.name: replica.engine for replica in read_router.replicas},
+    }
+
+
+def register_runtime_metrics():
+    """Scrape-time metrics read from counters the pools, caches and bcrypt pool already keep."""
+    for name, kind, key, help in (
+        ("db_pool_size", "gauge", "size", "Configured pool size."),
+        ("db_pool_checked_out", "gauge", "checked_out", "Connections currently checked out."),
+        ("db_pool_checked_in", "gauge", "checked_in", "Idle connections in the pool."),
+        ("db_pool_overflow", "gauge", "overflow", "Connections open beyond the pool size."),
+        ("db_pool_checkouts_total", "counter", "checkouts", "Connection checkouts."),
+        ("db_pool_timeouts_total", "counter", "timeouts", "Checkouts that timed out on an exhausted pool."),
+        ("db_pool_wait_seconds_total", "counter", "wait_seconds_total", "Time spent waiting for connections."),
+    ):
+        metrics_registry.callback(name, help, kind, lambda key=key: [
+            ({"engine": engine_name}, pool_snapshot(pool_engine)[key]) for engine_name, pool_engine in pool_engines().items()
+        ])
+    
+    caches = {"program": program_cache, "principal": principal_cache, "token": token_cache}
+    for name, kind, key, help in (
+        ("cache_hits_total", "counter", "hits", "Cache lookups that found an entry."),
+        ("cache_misses_total", "counter", "misses", "Cache lookups that did not."),
+        ("cache_hit_ratio", "gauge", "hit_ratio", "Hits over lookups since start."),
+        ("cache_entries", "gauge", "entries", "Entries currently cached."),
+        ("cache_evictions_total", "counter", "evictions", "Entries evicted to stay under the size limit."),
+    ):
+        metrics_registry.callback(name, help, kind, lambda key=key: [
+            ({"cache": cache_name}, cache.stats()[key]) for cache_name, cache in caches.items()
+        ])
+    
+    for name, kind, key, help in (
+        ("password_hash_queue_depth", "gauge", "queue_depth", "bcrypt calls waiting for a worker."),
+        ("password_hash_pending", "gauge", "pending", "bcrypt calls running or waiting."),
+        ("password_hash_completed_total", "counter", "completed", "bcrypt calls completed."),
+        ("password_hash_rejected_total", "counter", "rejected", "bcrypt calls rejected with the pool full."),
+        ("password_hash_wait_seconds_total", "counter", "wait_seconds_total", "Time bcrypt calls spent queued."),
+    ):
+        metrics_registry.callback(name, help, kind, lambda key=key: [({}, password_pool.stats()[key])])
+    
+    metrics_registry.callback("db_reads_total", "Public reads by where they were routed.", "counter", lambda: [
+        ({"target": "replica"}, read_router.replica_reads),
+        ({"target": "primary"}, read_router.primary_reads),
+    ])
+
+
+register_runtime_metrics()
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
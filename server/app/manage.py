@@ -0,0 +1,54 @@
+"""
+Deploy-time tasks, kept out of the server's boot path:
+
+    python -m app.manage migrate   # alembic upgrade head (stamps pre-alembic databases first)
+    python -m app.manage seed      # create the default church and admin user if missing
+    python -m app.manage check     # exit 1 when the database is behind the migration head
+
+Run migrate and seed before starting (or restarting) the server after a deploy,
+e.g. as Render's preDeployCommand. Set MIGRATE_ON_STARTUP / SEED_ON_STARTUP to
+have the server do it at boot instead.
+"""
+import argparse
+import logging
+import sys
+from app.config import settings
+
+
+def migrate() -> int:
+    from app.database.migrations import run_migrations
+    run_migrations(environment=settings.ENVIRONMENT)
+    # run_migrations logs and falls back to create_tables on errors; fail the deploy if not at head
+    return check()
+
+
+def seed() -> int:
+    from app.database.init_data import ensure_admin_user
+    ensure_admin_user()
+    return 0
+
+
+def check() -> int:
+    from app.database.connection import engine
+    from app.database.migrations import check_migrations, head_revision
+    from app.database.schema_registry import SchemaRegistry
+    with engine.connect() as connection:
+        current = SchemaRegistry._read_revision(connection, engine.dialect.has_table(connection, "alembic_version"))
+    up_to_date = check_migrations(current)
+    print(f"database: {current}, head: {head_revision()}")
+    return 0 if up_to_date else 1
+
+
+COMMANDS = {"migrate": migrate, "seed": seed, "check": check}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description="Church Program Pro deploy tasks")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    return COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
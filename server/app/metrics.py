@@ -0,0 +1,172 @@
+"""
+In-process metrics in the Prometheus text exposition format, served by GET /metrics.
+
+Counters and histograms are updated on the request path: a dict lookup and a few
+additions under a lock. Everything that already keeps its own counters (pools,
+caches, the bcrypt pool) is read only when /metrics is scraped, through
+callback metrics, so it costs nothing per request.
+"""
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+        lines = []
+        for key, counts, total, count in snapshot:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for upper, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(upper)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class CallbackMetric:
+    """A gauge or counter whose samples are read from `collect` at scrape time."""
+
+    def __init__(self, name: str, help: str, kind: str, collect: Callable[[], Iterable[Sample]]):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in self.collect()]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, kind: str, collect: Callable[[], Iterable[Sample]]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, kind, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time until the response started, by method and route template.", ("method", "route"),
+)
+bulk_rows = registry.counter(
+    "bulk_rows_total", "Child rows written by bulk import/update, by operation, table and action.",
+    ("operation", "table", "action"),
+)
+
+
+def route_template(scope) -> str:
+    """The matched route's path template (/api/v1/programs/{program_id}), so ids do not become labels."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or "unmatched"
+
+
+def observe_request(scope, status_code: int, seconds: float) -> None:
+    route = route_template(scope)
+    http_requests.inc(method=scope["method"], route=route, status=status_code)
+    http_request_duration.observe(seconds, method=scope["method"], route=route)
+
+
+def count_bulk_rows(operation: str, table: str, counts: Dict[str, int]) -> None:
+    """Add a bulk write's per-action row counts ({"inserted": 3, "deleted": 1, ...})."""
+    for action, rows in counts.items():
+        if rows:
+            bulk_rows.inc(rows, operation=operation, table=table, action=action)
@@ -1,13 +1,15 @@
+import logging
+import traceback
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.encoders import jsonable_encoder
 
+logger = logging.getLogger(__name__)
+
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     # Log validation errors for debugging
-    import logging
-    logger = logging.getLogger(__name__)
     logger.warning("Validation error", extra={
         "errors": exc.errors(),
         "body": exc.body if hasattr(exc, 'body') else None,
@@ -41,9 +43,6 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 async def general_exception_handler(request: Request, exc: Exception):
     # Log the full error for debugging
-    import traceback
-    import logging
-    logger = logging.getLogger(__name__)
     error_trace = traceback.format_exc()
     logger.error(f"❌ Error: {exc}")
     logger.error(f"📋 Traceback:\n{error_trace}")
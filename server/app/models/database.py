@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.database.connection import Base
 
+# Fractional rank keys must compare byte-wise; SQLite's default collation already does
+RANK_TYPE = String(64).with_variant(String(64, collation="C"), "postgresql")
+
 
 class Church(Base):
     __tablename__ = "churches"
@@ -40,6 +43,12 @@ class Program(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Keyset order of the program list (see app/programs/pagination.py); SQLite cannot index NULLS LAST
+    __table_args__ = (
+        Index("ix_programs_church_id_date_id", church_id, date.desc().nulls_last(), id.desc()).ddl_if(dialect="postgresql"),
+        Index("ix_programs_date_id", date.desc().nulls_last(), id.desc()).ddl_if(dialect="postgresql"),
+    )
+
 
 class ScheduleItem(Base):
     __tablename__ = "schedule_items"
@@ -51,9 +60,12 @@ class ScheduleItem(Base):
     start_time = Column(String(16))
     duration_minutes = Column(Integer)
     order_index = Column(Integer)
+    rank = Column(RANK_TYPE)  # tie-breaker within equal order_index, see app/programs/ranking.py
     type = Column(String(50), default="worship")  # worship, sermon, announcement, special
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (Index("ix_schedule_items_program_id_order", program_id, order_index, id),)
+
 
 class SpecialGuest(Base):
     __tablename__ = "special_guests"
@@ -66,8 +78,11 @@ class SpecialGuest(Base):
     bio = Column(Text)
     photo_url = Column(String(500))
     display_order = Column(Integer, default=0)
+    rank = Column(RANK_TYPE)  # tie-breaker within equal display_order, see app/programs/ranking.py
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (Index("ix_special_guests_program_id_order", program_id, display_order, id),)
+
 
 class ProgramTemplate(Base):
     __tablename__ = "program_templates"
@@ -78,3 +93,5 @@ class ProgramTemplate(Base):
     content = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (Index("ix_program_templates_church_id_created_at", church_id, created_at.desc()),)
+
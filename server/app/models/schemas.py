@@ -51,16 +51,22 @@ class ApiResponse(BaseModel):
     data: Optional[Any] = None
     error: Optional[str] = None
     message: Optional[str] = None
+    meta: Optional[dict] = None
 
 
-def create_api_response(data: Any = None, error: str = None, message: str = None) -> dict:
+def create_api_response(data: Any = None, error: str = None, message: str = None, meta: dict = None) -> dict:
     """Helper function to create standardized API responses."""
-    return {
+    response = {
         "success": error is None,
         "data": data,
         "error": error,
         "message": message
     }
+    # meta (list paging, bulk update change counts) is added only when given, so bodies
+    # of endpoints that pass none keep their original shape
+    if meta is not None:
+        response["meta"] = meta
+    return response
 
 
 # Program schemas
@@ -219,6 +225,12 @@ class ReorderGuestsRequest(BaseModel):
     guests: List[dict]  # List of {id: int, display_order: int}
 
 
+class MoveRequest(BaseModel):
+    # Place the row directly before and/or after another row of the same program
+    before_id: Optional[int] = None
+    after_id: Optional[int] = None
+
+
 class ScheduleItemResponse(ScheduleItemBase):
     id: int
     program_id: int
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from app.config import settings
+from app.singleflight import SingleFlight
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized responses with a per-entry TTL.
+
+    Writers call invalidate() after committing. A load that started before
+    an invalidation is not stored (see begin_load/set), so a slow read can
+    never put pre-write data back into the cache.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def begin_load(self) -> int:
+        """Token to pass to set(); becomes stale as soon as anything is invalidated."""
+        return self._epoch
+
+    def set(self, key: Hashable, value: Any, token: int, ttl_seconds: Optional[float] = None) -> bool:
+        """Store `value`; ttl_seconds can only shorten the cache's TTL for this entry."""
+        if not self.enabled:
+            return False
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return False
+        with self._lock:
+            if token != self._epoch:
+                return False
+            self._entries[key] = (value, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._epoch += 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# Serialized GET /programs/{id} bodies and their ETags (TaggedBody) keyed by program id
+program_cache = ResponseCache(
+    max_entries=settings.PROGRAM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PROGRAM_CACHE_TTL_SECONDS,
+)
+
+# In-flight GET /programs/{id} loads, so a burst of misses runs one query
+program_loads = SingleFlight()
+
+
+def invalidate_program(program_id: int) -> None:
+    """Call after committing any change to a program or its children."""
+    program_cache.invalidate(program_id)
+    # Requests arriving after the commit must not join a load that began before it
+    program_loads.forget(program_id)
@@ -0,0 +1,77 @@
+"""
+Keyset pagination for the program list.
+
+Programs are listed newest first by (date DESC NULLS LAST, id DESC). A page
+ends with the key of its last row; the next page starts strictly after it,
+so every page is one indexed range scan no matter how deep the client goes
+(no OFFSET). Cursors are opaque to clients: base64url-encoded JSON of that key.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import Select, and_, func, or_, select
+from app.models.database import Program
+
+CursorKey = Tuple[Optional[datetime], int]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(program: Program) -> str:
+    key = [program.date.isoformat() if program.date else None, program.id]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date_value, program_id = json.loads(raw)
+        date = datetime.fromisoformat(date_value) if date_value is not None else None
+        if not isinstance(program_id, int):
+            raise TypeError(program_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    return date, program_id
+
+
+def after_cursor(key: CursorKey):
+    """Rows that sort after `key` in (date DESC NULLS LAST, id DESC) order."""
+    date, program_id = key
+    if date is None:
+        return and_(Program.date.is_(None), Program.id < program_id)
+    return or_(
+        Program.date < date,
+        and_(Program.date == date, Program.id < program_id),
+        Program.date.is_(None),
+    )
+
+
+def program_list_statement(
+    church_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    upcoming: bool = False,
+    cursor: Optional[CursorKey] = None,
+    limit: int = 50,
+) -> Select:
+    """One page plus one extra row, which only tells the caller whether another page exists."""
+    query = select(Program)
+    if church_id:
+        query = query.where(Program.church_id == church_id)
+    if is_active is not None:
+        query = query.where(Program.is_active == is_active)
+    if date_from is not None:
+        query = query.where(Program.date >= date_from)
+    if date_to is not None:
+        query = query.where(Program.date < date_to)
+    if upcoming:
+        # Database clock, so naive and timezone-aware columns compare the same way
+        query = query.where(Program.date >= func.now())
+    if cursor is not None:
+        query = query.where(after_cursor(cursor))
+    return query.order_by(Program.date.desc().nulls_last(), Program.id.desc()).limit(limit + 1)
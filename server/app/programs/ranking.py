@@ -0,0 +1,110 @@
+"""
+Fractional rank keys for schedule items and special guests.
+
+Children are ordered by (position, rank, id), where position is order_index
+or display_order and rank is a string compared byte-wise (COLLATE "C" on
+Postgres). Ranks only break ties between equal positions, so every existing
+path that writes positions keeps working. A single move picks a position and
+a rank between the new neighbours and updates exactly one row.
+
+A rank is read as a base-36 fraction ("i" = 0.5). Keys never end in "0", so
+there is always room between two of them; keys only grow when one gap is
+split many times, and a program whose keys got long is rebalanced.
+"""
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Rebalance a program once a move produces a key longer than this
+REBALANCE_LENGTH = 16
+
+
+def rank_between(lower: Optional[str], upper: Optional[str]) -> str:
+    """A key strictly between lower and upper (None means unbounded on that side)."""
+    if lower is not None and upper is not None and not lower < upper:
+        raise ValueError(f"rank {lower!r} is not below {upper!r}")
+    lower = lower or ""
+    key = []
+    position = 0
+    while True:
+        low = DIGITS.index(lower[position]) if position < len(lower) else 0
+        high = DIGITS.index(upper[position]) if upper is not None and position < len(upper) else BASE
+        if high - low > 1:
+            key.append(DIGITS[(low + high) // 2])
+            return "".join(key)
+        key.append(DIGITS[low])
+        if high > low:
+            # Keep lower's digit; from here on only lower constrains the key
+            upper = None
+        position += 1
+
+
+def spread_ranks(count: int) -> List[str]:
+    """`count` evenly spaced fixed-width keys in ascending order (none ending in "0")."""
+    width = 2
+    while BASE ** width < 4 * (count + 1):
+        width += 1
+    # Odd multiples of an odd step are odd, so the last base-36 digit is never 0
+    step = BASE ** width // (2 * count + 1) if count else 1
+    step -= 1 - step % 2
+    return [_to_digits((2 * index + 1) * step, width) for index in range(count)]
+
+
+def _to_digits(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits))
+
+
+class RankedRow(NamedTuple):
+    id: int
+    position: Optional[int]
+    rank: Optional[str]
+
+
+@dataclass
+class Placement:
+    position: int
+    rank: Optional[str]
+
+
+def place_between(previous, following) -> Optional[Placement]:
+    """
+    Position and rank that sort between two neighbouring rows (either may be
+    None at the ends of the list). Each row has .position and .rank. Returns
+    None when the neighbours are tied on both, or have no position, and the
+    program needs rebalance_positions() first.
+    """
+    if any(row is not None and row.position is None for row in (previous, following)):
+        return None
+    if previous is None and following is None:
+        return Placement(0, None)
+    if previous is None:
+        if following.rank is None:
+            return Placement(following.position - 1, None)
+        return Placement(following.position, rank_between(None, following.rank))
+
+    position = previous.position
+    if following is not None and following.position == position:
+        if following.rank is None or (previous.rank is not None and previous.rank >= following.rank):
+            return None
+        return Placement(position, rank_between(previous.rank, following.rank))
+    return Placement(position, rank_between(previous.rank, None))
+
+
+def rebalance_positions(rows: List[RankedRow]) -> List[RankedRow]:
+    """
+    Fresh, evenly spaced ranks for rows already in display order. Positions are
+    kept; a missing one takes the position of the row before it (or 0), which
+    keeps the order because those rows already sorted there.
+    """
+    rebalanced = []
+    position = 0
+    for row, rank in zip(rows, spread_ranks(len(rows))):
+        position = row.position if row.position is not None else position
+        rebalanced.append(RankedRow(row.id, position, rank))
+    return rebalanced
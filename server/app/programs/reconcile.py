@@ -0,0 +1,96 @@
+"""
+Diff planning for bulk program updates.
+
+Given the child rows a program has and the rows an editor sent, work out the
+smallest set of inserts, updates and deletes that turns one into the other,
+so unchanged rows keep their ids and are not rewritten.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class ChildChanges:
+    inserts: List[dict] = field(default_factory=list)
+    # (row id, only the columns whose value changed)
+    updates: List[Tuple[int, dict]] = field(default_factory=list)
+    deletes: List[int] = field(default_factory=list)
+    unchanged: int = 0
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "inserted": len(self.inserts),
+            "updated": len(self.updates),
+            "deleted": len(self.deletes),
+            "unchanged": self.unchanged,
+        }
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+
+def plan_child_changes(
+    existing: Sequence[dict],
+    incoming: Sequence[Tuple[Optional[int], dict]],
+    columns: Sequence[str],
+    position_column: Optional[str] = None,
+) -> ChildChanges:
+    """
+    existing: current rows, each with "id" plus `columns`.
+    incoming: (id the client sent or None, row values for `columns`) in payload order.
+
+    Incoming rows are matched to existing ones, in this order of preference:
+      1. by id, when the client sent an id this program owns;
+      2. by identical content (the editor does not send ids, so this is the
+         common "nothing changed here" case);
+      3. by position, pairing what is left in display order, so an edited
+         row becomes an UPDATE rather than a DELETE plus an INSERT.
+    Leftover incoming rows are inserted; leftover existing rows are deleted.
+    """
+    changes = ChildChanges()
+    remaining = {row["id"]: row for row in existing}
+    pairs: List[Tuple[dict, dict]] = []
+    unmatched: List[dict] = []
+
+    for row_id, values in incoming:
+        if row_id is not None and row_id in remaining:
+            pairs.append((remaining.pop(row_id), values))
+        else:
+            unmatched.append(values)
+
+    by_content = defaultdict(list)
+    for row in sorted(remaining.values(), key=lambda row: row["id"]):
+        by_content[_content_key(row, columns)].append(row)
+    still_unmatched = []
+    for values in unmatched:
+        candidates = by_content.get(_content_key(values, columns))
+        if candidates:
+            row = candidates.pop(0)
+            del remaining[row["id"]]
+            pairs.append((row, values))
+        else:
+            still_unmatched.append(values)
+
+    leftovers = sorted(remaining.values(), key=lambda row: (_sortable(row.get(position_column)), row["id"]))
+    for row, values in zip(leftovers, still_unmatched):
+        pairs.append((row, values))
+    changes.inserts = still_unmatched[len(leftovers):]
+    changes.deletes = [row["id"] for row in leftovers[len(still_unmatched):]]
+
+    for row, values in pairs:
+        diff = {col: values[col] for col in columns if row.get(col) != values[col]}
+        if diff:
+            changes.updates.append((row["id"], diff))
+        else:
+            changes.unchanged += 1
+    return changes
+
+
+def _content_key(row: dict, columns: Sequence[str]) -> tuple:
+    return tuple(row.get(col) for col in columns)
+
+
+def _sortable(value) -> tuple:
+    return (value is None, value if value is not None else 0)
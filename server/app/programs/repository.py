@@ -0,0 +1,224 @@
+"""
+Read repository for program details.
+
+Loads a program together with its ordered schedule items and special guests
+in a single round trip and validates the whole payload in one pass. On
+Postgres it can instead have the database render the response JSON.
+
+Children sort by position, then rank, then id. rank only exists from migration
+009 on, so both paths leave it out when the schema registry does not report it.
+"""
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import select, union_all, cast, null, literal_column, text, Integer, String, Text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database.connection import is_postgres
+from app.database.schema_registry import get_schema_registry
+from app.models.database import Program, ScheduleItem, SpecialGuest
+from app.models.schemas import ProgramWithDetailsResponse
+
+SCHEDULE_ITEM_KIND = "schedule_item"
+SPECIAL_GUEST_KIND = "special_guest"
+
+programs = Program.__table__
+schedule_items = ScheduleItem.__table__
+special_guests = SpecialGuest.__table__
+
+
+async def children_are_ranked(db: AsyncSession) -> bool:
+    """Whether schedule items and guests have the rank column yet (see schema_registry)."""
+    schema = await get_schema_registry(db)
+    return schema.has_column("schedule_items", "rank") and schema.has_column("special_guests", "rank")
+
+
+def _children_subquery(ranked: bool):
+    """Schedule items and guests stacked into one column layout (no items x guests product)."""
+    items = select(
+        literal_column(f"'{SCHEDULE_ITEM_KIND}'").label("kind"),
+        schedule_items.c.id,
+        schedule_items.c.program_id,
+        schedule_items.c.title.label("name"),
+        schedule_items.c.description,
+        schedule_items.c.start_time,
+        schedule_items.c.duration_minutes,
+        schedule_items.c.type,
+        cast(null(), String).label("role"),
+        cast(null(), Text).label("bio"),
+        cast(null(), String).label("photo_url"),
+        schedule_items.c.order_index.label("position"),
+        *([schedule_items.c.rank] if ranked else []),
+        schedule_items.c.created_at,
+    )
+    guests = select(
+        literal_column(f"'{SPECIAL_GUEST_KIND}'"),
+        special_guests.c.id,
+        special_guests.c.program_id,
+        special_guests.c.name,
+        special_guests.c.description,
+        cast(null(), String),
+        cast(null(), Integer),
+        cast(null(), String),
+        special_guests.c.role,
+        special_guests.c.bio,
+        special_guests.c.photo_url,
+        special_guests.c.display_order,
+        *([special_guests.c.rank] if ranked else []),
+        special_guests.c.created_at,
+    )
+    return union_all(items, guests).subquery("children")
+
+
+def program_details_statement(program_id: int, ranked: bool = True):
+    children = _children_subquery(ranked)
+    ordering = (children.c.position, children.c.rank.nulls_first()) if ranked else (children.c.position,)
+    return (
+        select(
+            programs.c.id.label("program_id"),
+            programs.c.church_id.label("program_church_id"),
+            programs.c.title.label("program_title"),
+            programs.c.date.label("program_date"),
+            programs.c.theme.label("program_theme"),
+            programs.c.is_active.label("program_is_active"),
+            programs.c.created_at.label("program_created_at"),
+            *[column for column in children.c if column.key not in ("program_id", "rank")],
+        )
+        .select_from(programs.outerjoin(children, children.c.program_id == programs.c.id))
+        .where(programs.c.id == program_id)
+        .order_by(children.c.kind, *ordering, children.c.id)
+    )
+
+
+def build_program_details(rows) -> Optional[ProgramWithDetailsResponse]:
+    """Fold the joined rows into one payload and validate it in a single call."""
+    if not rows:
+        return None
+
+    first = rows[0]
+    payload = {
+        "id": first.program_id,
+        "church_id": first.program_church_id,
+        "title": first.program_title or "",
+        "date": first.program_date,
+        "theme": first.program_theme,
+        "is_active": first.program_is_active if first.program_is_active is not None else True,
+        "created_at": first.program_created_at or datetime.now(),
+        "schedule_items": [],
+        "special_guests": [],
+    }
+    for row in rows:
+        if row.kind == SCHEDULE_ITEM_KIND:
+            payload["schedule_items"].append({
+                "id": row.id,
+                "program_id": first.program_id,
+                "title": row.name or "",
+                "description": row.description,
+                "start_time": row.start_time,
+                "duration_minutes": row.duration_minutes,
+                "order_index": row.position if row.position is not None else 0,
+                "type": row.type or "worship",
+                "created_at": row.created_at or datetime.now(),
+            })
+        elif row.kind == SPECIAL_GUEST_KIND:
+            payload["special_guests"].append({
+                "id": row.id,
+                "program_id": first.program_id,
+                "name": row.name or "",
+                "role": row.role,
+                "description": row.description,
+                "bio": row.bio,
+                "photo_url": row.photo_url,
+                "display_order": row.position if row.position is not None else 0,
+                "created_at": row.created_at or datetime.now(),
+            })
+
+    return ProgramWithDetailsResponse.model_validate(payload)
+
+
+async def get_program_details(db: AsyncSession, program_id: int) -> Optional[ProgramWithDetailsResponse]:
+    """Program with ordered schedule items and guests, or None if it does not exist. One query."""
+    result = await db.execute(program_details_statement(program_id, await children_are_ranked(db)))
+    return build_program_details(result.all())
+
+
+def _iso_timestamp(column: str) -> str:
+    """
+    SQL rendering a timestamptz the way Pydantic serializes the UTC datetimes asyncpg
+    returns (2025-03-09T08:30:00Z, microseconds only when present), whatever the
+    session time zone; json_build_object alone would print +00:00 or the local offset.
+    """
+    utc = f"({column} AT TIME ZONE 'UTC')"
+    return (
+        f"CASE WHEN date_trunc('second', {utc}) = {utc} "
+        f"""THEN to_char({utc}, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') """
+        f"""ELSE to_char({utc}, 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') END"""
+    )
+
+
+def _program_details_json_sql(ranked: bool):
+    """Whole API envelope built by Postgres; same keys, ordering and timestamp format as the Python path."""
+    item_rank, guest_rank = ("si.rank NULLS FIRST, ", "sg.rank NULLS FIRST, ") if ranked else ("", "")
+    return text(f"""
+    SELECT json_build_object(
+        'success', true,
+        'data', json_build_object(
+            'title', COALESCE(p.title, ''),
+            'date', {_iso_timestamp('p.date')},
+            'theme', p.theme,
+            'is_active', COALESCE(p.is_active, true),
+            'id', p.id,
+            'church_id', p.church_id,
+            'created_at', {_iso_timestamp('COALESCE(p.created_at, now())')},
+            'schedule_items', COALESCE((
+                SELECT json_agg(json_build_object(
+                    'title', COALESCE(si.title, ''),
+                    'description', si.description,
+                    'start_time', si.start_time,
+                    'duration_minutes', si.duration_minutes,
+                    'order_index', COALESCE(si.order_index, 0),
+                    'type', COALESCE(si.type, 'worship'),
+                    'id', si.id,
+                    'program_id', si.program_id,
+                    'created_at', {_iso_timestamp('COALESCE(si.created_at, now())')}
+                ) ORDER BY si.order_index, {item_rank}si.id)
+                FROM schedule_items si
+                WHERE si.program_id = p.id
+            ), '[]'::json),
+            'special_guests', COALESCE((
+                SELECT json_agg(json_build_object(
+                    'name', COALESCE(sg.name, ''),
+                    'role', sg.role,
+                    'description', sg.description,
+                    'bio', sg.bio,
+                    'photo_url', sg.photo_url,
+                    'display_order', COALESCE(sg.display_order, 0),
+                    'id', sg.id,
+                    'program_id', sg.program_id,
+                    'created_at', {_iso_timestamp('COALESCE(sg.created_at, now())')}
+                ) ORDER BY sg.display_order, {guest_rank}sg.id)
+                FROM special_guests sg
+                WHERE sg.program_id = p.id
+            ), '[]'::json)
+        ),
+        'error', NULL,
+        'message', NULL
+    )::text
+    FROM programs p
+    WHERE p.id = :program_id
+""")
+
+
+PROGRAM_DETAILS_JSON_SQL = _program_details_json_sql(ranked=True)
+PROGRAM_DETAILS_JSON_SQL_UNRANKED = _program_details_json_sql(ranked=False)
+
+
+def json_aggregation_enabled() -> bool:
+    """The Postgres-rendered path is opt-in and only exists on Postgres."""
+    return settings.PROGRAM_DETAILS_JSON_AGG and is_postgres
+
+
+async def get_program_details_json(db: AsyncSession, program_id: int) -> Optional[bytes]:
+    """Complete response body rendered by Postgres (no ORM hydration, no Pydantic), or None if not found."""
+    statement = PROGRAM_DETAILS_JSON_SQL if await children_are_ranked(db) else PROGRAM_DETAILS_JSON_SQL_UNRANKED
+    body = await db.scalar(statement, {"program_id": program_id})
+    return body.encode("utf-8") if body is not None else None
@@ -1,58 +1,79 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Integer, bindparam, case, delete, insert, select, union_all, update
+from sqlalchemy import column as sa_column, values as sa_values
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import re
-from app.database.connection import get_db
+from app.database.connection import AsyncSessionLocal, ReleaseSessionRoute, get_async_db, get_read_db, is_postgres
+from app.database.schema_registry import ORDERED_RETURNING, get_schema_registry
+from app.etag import TaggedBody, conditional_response
+from app.metrics import count_bulk_rows
+from app.config import settings
+from app.programs.cache import program_cache, program_loads, invalidate_program
+from app.programs.pagination import InvalidCursor, decode_cursor, encode_cursor, program_list_statement
+from app.programs.ranking import REBALANCE_LENGTH, RankedRow, place_between, rebalance_positions
+from app.programs.reconcile import ChildChanges, plan_child_changes
+from app.programs.repository import get_program_details, get_program_details_json, json_aggregation_enabled
 from app.models.database import Program, ScheduleItem, SpecialGuest, Church
 from app.models.schemas import (
-    ProgramCreate, ProgramUpdate, ProgramResponse, ProgramWithDetailsResponse,
+    ProgramBase, ProgramCreate, ProgramUpdate, ProgramResponse, ProgramWithDetailsResponse,
     ScheduleItemCreate, ScheduleItemUpdate, ScheduleItemResponse,
     SpecialGuestCreate, SpecialGuestUpdate, SpecialGuestResponse,
-    ReorderItemsRequest, ReorderGuestsRequest,
+    ReorderItemsRequest, ReorderGuestsRequest, MoveRequest,
     SuccessResponse, create_api_response
 )
-from app.auth.middleware import get_current_user
-from app.models.database import User
+from app.auth.middleware import Principal, get_current_user
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ReleaseSessionRoute)
 
 
 @router.get("/")
 async def get_programs(
+    request: Request,
     church_id: Optional[int] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    upcoming: bool = False,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all programs with optional filters."""
-    query = db.query(Program)
+    """
+    Get programs newest first, one page at a time. Honors If-None-Match.
     
-    if church_id:
-        query = query.filter(Program.church_id == church_id)
+    `from` is inclusive and `to` exclusive; `upcoming=true` keeps programs dated
+    from now on. Pages hold `limit` programs (PROGRAM_LIST_DEFAULT_LIMIT when
+    omitted, never more than PROGRAM_LIST_MAX_LIMIT). Pass `meta.next_cursor`
+    back as `cursor` for the next page; it is null on the last page.
+    """
+    try:
+        cursor_key = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        return create_api_response(error="Invalid cursor")
     
-    if is_active is not None:
-        query = query.filter(Program.is_active == is_active)
+    page_size = min(limit or settings.PROGRAM_LIST_DEFAULT_LIMIT, settings.PROGRAM_LIST_MAX_LIMIT)
+    query = program_list_statement(
+        church_id=church_id,
+        is_active=is_active,
+        date_from=date_from,
+        date_to=date_to,
+        upcoming=upcoming,
+        cursor=cursor_key,
+        limit=page_size,
+    )
+    programs = (await db.scalars(query)).all()
+    page = programs[:page_size]
+    next_cursor = encode_cursor(page[-1]) if len(programs) > page_size else None
     
-    programs = query.order_by(Program.date.desc()).all()
-    programs_data = [ProgramResponse.model_validate(p) for p in programs]
-    return create_api_response(data=programs_data)
-
-
-def safe_get_attr(obj, attr, default=None):
-    """Safely get attribute from SQLAlchemy model, handling missing columns."""
-    try:
-        value = getattr(obj, attr, default)
-        # If attribute exists but is None and we have a default, check if column exists
-        if value is None and default is not None and hasattr(obj.__class__, attr):
-            # Check if it's a column that might not exist in DB yet
-            return default
-        return value if value is not None else default
-    except (AttributeError, KeyError):
-        return default
+    programs_data = [ProgramResponse.model_validate(p) for p in page]
+    response = create_api_response(data=programs_data, meta={"next_cursor": next_cursor, "limit": page_size})
+    return conditional_response(request, TaggedBody.from_content(response))
 
 
 def normalize_start_time_value(value):
@@ -81,91 +102,37 @@ def normalize_start_time_value(value):
         return str(value)
 
 
+async def load_program_body(db: AsyncSession, program_id: int) -> Optional[TaggedBody]:
+    """Serialized program detail response and its ETag (cached on the way out), or None if not found."""
+    cache_token = program_cache.begin_load()
+    if json_aggregation_enabled():
+        # Postgres renders the full envelope; hand its bytes straight to the client
+        body = await get_program_details_json(db, program_id)
+        tagged = TaggedBody.of(body) if body is not None else None
+    else:
+        program = await get_program_details(db, program_id)
+        tagged = TaggedBody.from_content(create_api_response(data=program)) if program else None
+    
+    if tagged is not None:
+        program_cache.set(program_id, tagged, cache_token)
+    return tagged
+
+
 @router.get("/{program_id}")
-async def get_program_by_id(program_id: int, db: Session = Depends(get_db)):
-    """Get a single program with all details."""
+async def get_program_by_id(program_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    """
+    Get a single program with all details (one query via the program read repository).
+    Answers 304 when If-None-Match carries the current ETag; on a cache hit that needs no DB work at all.
+    """
     try:
-        # Fetch program
-        program = db.query(Program).filter(Program.id == program_id).first()
-        if not program:
+        tagged = program_cache.get(program_id)
+        if tagged is None:
+            # Concurrent misses for the same program share one DB load
+            tagged = await program_loads.do(program_id, lambda: load_program_body(db, program_id))
+        if tagged is None:
             return create_api_response(error="Program not found")
         
-        # Load related data - handle missing columns gracefully
-        schedule_items = []
-        try:
-            schedule_items = db.query(ScheduleItem).filter(ScheduleItem.program_id == program_id).order_by(ScheduleItem.order_index).all()
-        except (AttributeError, Exception) as e:
-            logger.warning("Error ordering schedule_items by order_index - column may not exist", exc_info=True, extra={"program_id": program_id})
-            try:
-                schedule_items = db.query(ScheduleItem).filter(ScheduleItem.program_id == program_id).order_by(ScheduleItem.id).all()
-            except Exception as e2:
-                logger.error("Error fetching schedule_items", exc_info=True, extra={"program_id": program_id, "error": str(e2)})
-                schedule_items = []
-        
-        special_guests = []
-        try:
-            special_guests = db.query(SpecialGuest).filter(SpecialGuest.program_id == program_id).order_by(SpecialGuest.display_order).all()
-        except (AttributeError, Exception) as e:
-            logger.warning("Error ordering special_guests by display_order - column may not exist", exc_info=True, extra={"program_id": program_id})
-            try:
-                special_guests = db.query(SpecialGuest).filter(SpecialGuest.program_id == program_id).order_by(SpecialGuest.id).all()
-            except Exception as e2:
-                logger.error("Error fetching special_guests", exc_info=True, extra={"program_id": program_id, "error": str(e2)})
-                special_guests = []
-        
-        # Build response - provide defaults for missing columns
-        schedule_items_data = []
-        for si in schedule_items:
-            try:
-                item_dict = {
-                    "id": si.id,
-                    "program_id": si.program_id,
-                    "title": safe_get_attr(si, 'title', ''),
-                    "description": safe_get_attr(si, 'description', None),
-                    "start_time": safe_get_attr(si, 'start_time', None),
-                    "duration_minutes": safe_get_attr(si, 'duration_minutes', None),
-                    "order_index": safe_get_attr(si, 'order_index', 0),
-                    "type": safe_get_attr(si, 'type', 'worship'),
-                    "created_at": safe_get_attr(si, 'created_at', None) or datetime.now()
-                }
-                schedule_items_data.append(ScheduleItemResponse.model_validate(item_dict))
-            except Exception as e:
-                logger.warning("Error validating schedule item", exc_info=True, extra={"item_id": getattr(si, 'id', None), "error": str(e)})
-                continue
-        
-        special_guests_data = []
-        for sg in special_guests:
-            try:
-                guest_dict = {
-                    "id": sg.id,
-                    "program_id": sg.program_id,
-                    "name": safe_get_attr(sg, 'name', ''),
-                    "role": safe_get_attr(sg, 'role', None),
-                    "description": safe_get_attr(sg, 'description', None),
-                    "bio": safe_get_attr(sg, 'bio', None),
-                    "photo_url": safe_get_attr(sg, 'photo_url', None),
-                    "display_order": safe_get_attr(sg, 'display_order', 0),
-                    "created_at": safe_get_attr(sg, 'created_at', None) or datetime.now()
-                }
-                special_guests_data.append(SpecialGuestResponse.model_validate(guest_dict))
-            except Exception as e:
-                logger.warning("Error validating special guest", exc_info=True, extra={"guest_id": getattr(sg, 'id', None), "error": str(e)})
-                continue
-        
-        # Build program response
-        program_dict = {
-            "id": program.id,
-            "church_id": safe_get_attr(program, 'church_id', None),
-            "title": safe_get_attr(program, 'title', ''),
-            "date": safe_get_attr(program, 'date', None),
-            "theme": safe_get_attr(program, 'theme', None),
-            "is_active": safe_get_attr(program, 'is_active', True),
-            "created_at": safe_get_attr(program, 'created_at', None) or datetime.now(),
-            "schedule_items": schedule_items_data,
-            "special_guests": special_guests_data
-        }
-        
-        return create_api_response(data=program_dict)
+        return conditional_response(request, tagged)
     
     except Exception as e:
         logger.error("Error fetching program by ID", exc_info=True, extra={"program_id": program_id, "error": str(e), "error_type": type(e).__name__})
@@ -175,8 +142,8 @@ async def get_program_by_id(program_id: int, db: Session = Depends(get_db)):
 @router.post("/")
 async def create_program(
     program_data: ProgramCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new program."""
     try:
@@ -196,23 +163,23 @@ async def create_program(
             logger.info("Using user's church_id", extra={"church_id": church_id, "user_id": current_user.id})
         
         # Verify church exists
-        church = db.query(Church).filter(Church.id == church_id).first()
-        if not church:
+        church_exists = await db.scalar(select(Church.id).where(Church.id == church_id))
+        if not church_exists:
             logger.warning("Church not found", extra={"church_id": church_id})
             return create_api_response(error="Church not found")
         
-        # Create program
-        program = Program(
-            church_id=church_id,
-            title=program_data.title,
-            date=program_data.date,
-            theme=program_data.theme,
-            is_active=program_data.is_active if program_data.is_active is not None else True,
-            created_by=current_user.id  # Set creator to current authenticated user
+        # Create program; RETURNING hands back server defaults (id, created_at) with the INSERT
+        program = await db.scalar(
+            insert(Program).values(
+                church_id=church_id,
+                title=program_data.title,
+                date=program_data.date,
+                theme=program_data.theme,
+                is_active=program_data.is_active if program_data.is_active is not None else True,
+                created_by=current_user.id  # Set creator to current authenticated user
+            ).returning(Program)
         )
-        db.add(program)
-        db.commit()
-        db.refresh(program)
+        await db.commit()
         
         logger.info("Program created successfully", extra={
             "program_id": program.id,
@@ -226,14 +193,14 @@ async def create_program(
     except SQLAlchemyError as e:
         # Capture user_id BEFORE rollback to avoid lazy-loading issues
         user_id = current_user.id if current_user else None
-        db.rollback()
+        await db.rollback()
         logger.error("Database error during program creation", exc_info=True, extra={"user_id": user_id})
         return create_api_response(error="Database error occurred while creating program")
     except Exception as e:
         # Capture user_id BEFORE any potential rollback
         user_id = current_user.id if current_user else None
         if db:
-            db.rollback()
+            await db.rollback()
         logger.error("Unexpected error during program creation", exc_info=True, extra={"user_id": user_id})
         return create_api_response(error="Failed to create program")
 
@@ -242,26 +209,18 @@ async def create_program(
 async def update_program(
     program_id: int,
     program_data: ProgramUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Update an existing program."""
-    program = db.query(Program).filter(Program.id == program_id).first()
+    """Update an existing program (one UPDATE ... RETURNING)."""
+    changes = program_data.model_dump(exclude_none=True)
+    program = await update_returning(db, Program, changes, Program.id == program_id)
     if not program:
         return create_api_response(error="Program not found")
     
-    # Update fields
-    if program_data.title is not None:
-        program.title = program_data.title
-    if program_data.date is not None:
-        program.date = program_data.date
-    if program_data.theme is not None:
-        program.theme = program_data.theme
-    if program_data.is_active is not None:
-        program.is_active = program_data.is_active
-    
-    db.commit()
-    db.refresh(program)
+    await db.commit()
+    if changes:
+        invalidate_program(program_id)
     
     program_response = ProgramResponse.model_validate(program)
     return create_api_response(data=program_response)
@@ -270,21 +229,22 @@ async def update_program(
 @router.delete("/{program_id}")
 async def delete_program(
     program_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a program and all related data."""
-    program = db.query(Program).filter(Program.id == program_id).first()
+    program = await db.scalar(select(Program).where(Program.id == program_id))
     if not program:
         return create_api_response(error="Program not found")
     
     # Delete related data first
-    db.query(ScheduleItem).filter(ScheduleItem.program_id == program_id).delete()
-    db.query(SpecialGuest).filter(SpecialGuest.program_id == program_id).delete()
+    await db.execute(delete(ScheduleItem).where(ScheduleItem.program_id == program_id))
+    await db.execute(delete(SpecialGuest).where(SpecialGuest.program_id == program_id))
     
     # Delete program
-    db.delete(program)
-    db.commit()
+    await db.delete(program)
+    await db.commit()
+    invalidate_program(program_id)
     
     return create_api_response(message="Program deleted successfully")
 
@@ -293,36 +253,19 @@ async def delete_program(
 async def add_schedule_item(
     program_id: int,
     item_data: ScheduleItemCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a schedule item to a program."""
     try:
         # Verify program exists
-        program = db.query(Program).filter(Program.id == program_id).first()
-        if not program:
+        program_exists = await db.scalar(select(Program.id).where(Program.id == program_id))
+        if not program_exists:
             return create_api_response(error="Program not found")
         
-        # Check which columns exist in the database
-        from sqlalchemy import inspect, text
-        from app.database.connection import engine
-        
-        # Use engine directly for inspection (more reliable than db.bind)
-        inspector = inspect(engine)
-        columns = [col['name'] for col in inspector.get_columns('schedule_items')]
-        
-        # Fallback: if inspection fails, query information_schema directly
-        if not columns:
-            try:
-                result = db.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'schedule_items'
-                """))
-                columns = [row[0] for row in result.fetchall()]
-            except Exception as e:
-                logger.warning("Could not inspect columns, using minimal set", exc_info=True)
-                columns = ['id', 'program_id', 'title']  # Minimal safe set
+        # Check which columns exist in the database (cached; no catalog query per request)
+        schema = await get_schema_registry(db)
+        columns = schema.columns('schedule_items')
         
         # Log received data for debugging
         logger.info("Adding schedule item", extra={
@@ -337,56 +280,45 @@ async def add_schedule_item(
         
         # Use raw SQL INSERT with parameterized queries to only insert columns that exist
         # This avoids SQLAlchemy trying to insert columns defined in model but missing in DB
-        from sqlalchemy import text
-        
         insert_cols = ['program_id', 'title']
         params = {'program_id': program_id, 'title': item_data.title}
-        placeholders = [':program_id', ':title']
         
         if 'description' in columns:
             insert_cols.append('description')
-            placeholders.append(':description')
             params['description'] = item_data.description
         
         if 'start_time' in columns and item_data.start_time:
             insert_cols.append('start_time')
-            placeholders.append(':start_time')
             params['start_time'] = normalize_start_time_value(item_data.start_time)
         
         if 'duration_minutes' in columns and item_data.duration_minutes is not None:
             insert_cols.append('duration_minutes')
-            placeholders.append(':duration_minutes')
             params['duration_minutes'] = item_data.duration_minutes
         
         if 'order_index' in columns:
             insert_cols.append('order_index')
-            placeholders.append(':order_index')
             params['order_index'] = item_data.order_index if item_data.order_index is not None else 0
         
         if 'type' in columns:
             insert_cols.append('type')
-            placeholders.append(':type')
             params['type'] = item_data.type if item_data.type else 'worship'
         
         # Build and execute parameterized SQL
         try:
-            sql = f"INSERT INTO schedule_items ({', '.join(insert_cols)}) VALUES ({', '.join(placeholders)}) RETURNING id"
+            # The response is built from RETURNING: no second read of the new row
+            statement = schema.insert_statement('schedule_items', insert_cols, returning_columns(ScheduleItem, columns))
             logger.info("Executing SQL INSERT", extra={
-                "sql": sql,
+                "sql": str(statement),
                 "params": params,
                 "columns_to_insert": insert_cols,
                 "existing_columns": columns
             })
-            result = db.execute(text(sql), params)
-            item_id = result.scalar()
-            db.commit()
-            logger.info("Schedule item created successfully", extra={"item_id": item_id})
-            
-            # Fetch the created item
-            schedule_item = db.query(ScheduleItem).filter(ScheduleItem.id == item_id).first()
-            db.refresh(schedule_item)
+            schedule_item = (await db.execute(statement, params)).one()
+            await db.commit()
+            invalidate_program(program_id)
+            logger.info("Schedule item created successfully", extra={"item_id": schedule_item.id})
         except SQLAlchemyError as commit_error:
-            db.rollback()
+            await db.rollback()
             # Capture the actual database error message
             error_msg = str(commit_error.orig) if hasattr(commit_error, 'orig') else str(commit_error)
             logger.error("Database error during commit", exc_info=True, extra={
@@ -413,7 +345,7 @@ async def add_schedule_item(
             })
     
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
         logger.error("Database error adding schedule item", exc_info=True, extra={
             "program_id": program_id,
@@ -423,7 +355,7 @@ async def add_schedule_item(
         return create_api_response(error=f"Database error: {error_msg}")
     except Exception as e:
         if db:
-            db.rollback()
+            await db.rollback()
         logger.error("Error adding schedule item", exc_info=True, extra={
             "program_id": program_id,
             "error": str(e),
@@ -436,41 +368,24 @@ async def add_schedule_item(
 async def add_special_guest(
     program_id: int,
     guest_data: SpecialGuestCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a special guest to a program."""
     try:
         # Verify program exists
-        program = db.query(Program).filter(Program.id == program_id).first()
-        if not program:
+        program_exists = await db.scalar(select(Program.id).where(Program.id == program_id))
+        if not program_exists:
             return create_api_response(error="Program not found")
         
-        # Check which columns exist in the database
-        from sqlalchemy import inspect, text
-        from app.database.connection import engine
-        
-        # Use engine directly for inspection (more reliable than db.bind)
-        inspector = inspect(engine)
-        columns = [col['name'] for col in inspector.get_columns('special_guests')]
-        
-        # Fallback: if inspection fails, query information_schema directly
-        if not columns:
-            try:
-                result = db.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'special_guests'
-                """))
-                columns = [row[0] for row in result.fetchall()]
-            except Exception as e:
-                logger.warning("Could not inspect columns, using minimal set", exc_info=True)
-                columns = ['id', 'program_id', 'name']  # Minimal safe set
+        # Check which columns exist in the database (cached; no catalog query per request)
+        schema = await get_schema_registry(db)
+        columns = schema.columns('special_guests')
         
         # Log received data for debugging
         logger.info("Adding special guest", extra={
             "program_id": program_id,
-            "name": guest_data.name,
+            "guest_name": guest_data.name,
             "has_role": guest_data.role is not None,
             "has_bio": guest_data.bio is not None,
             "has_photo_url": guest_data.photo_url is not None,
@@ -482,52 +397,43 @@ async def add_special_guest(
         # This avoids SQLAlchemy trying to insert columns defined in model but missing in DB
         insert_cols = ['program_id', 'name']
         params = {'program_id': program_id, 'name': guest_data.name}
-        placeholders = [':program_id', ':name']
         
         if 'role' in columns:
             insert_cols.append('role')
-            placeholders.append(':role')
             params['role'] = guest_data.role
         
         if 'description' in columns:
             insert_cols.append('description')
-            placeholders.append(':description')
             params['description'] = guest_data.description
         
         if 'bio' in columns:
             insert_cols.append('bio')
-            placeholders.append(':bio')
             params['bio'] = guest_data.bio
         
         if 'photo_url' in columns:
             insert_cols.append('photo_url')
-            placeholders.append(':photo_url')
             params['photo_url'] = guest_data.photo_url
         
         if 'display_order' in columns:
             insert_cols.append('display_order')
-            placeholders.append(':display_order')
             params['display_order'] = guest_data.display_order if guest_data.display_order is not None else 0
         
         # Build and execute parameterized SQL
         try:
-            sql = f"INSERT INTO special_guests ({', '.join(insert_cols)}) VALUES ({', '.join(placeholders)}) RETURNING id"
+            # The response is built from RETURNING: no second read of the new row
+            statement = schema.insert_statement('special_guests', insert_cols, returning_columns(SpecialGuest, columns))
             logger.info("Executing SQL INSERT", extra={
-                "sql": sql,
+                "sql": str(statement),
                 "params": params,
                 "columns_to_insert": insert_cols,
                 "existing_columns": columns
             })
-            result = db.execute(text(sql), params)
-            guest_id = result.scalar()
-            db.commit()
-            logger.info("Special guest created successfully", extra={"guest_id": guest_id})
-            
-            # Fetch the created guest
-            special_guest = db.query(SpecialGuest).filter(SpecialGuest.id == guest_id).first()
-            db.refresh(special_guest)
+            special_guest = (await db.execute(statement, params)).one()
+            await db.commit()
+            invalidate_program(program_id)
+            logger.info("Special guest created successfully", extra={"guest_id": special_guest.id})
         except SQLAlchemyError as commit_error:
-            db.rollback()
+            await db.rollback()
             # Capture the actual database error message
             error_msg = str(commit_error.orig) if hasattr(commit_error, 'orig') else str(commit_error)
             logger.error("Database error during commit", exc_info=True, extra={
@@ -554,7 +460,7 @@ async def add_special_guest(
             })
     
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
         logger.error("Database error adding special guest", exc_info=True, extra={
             "program_id": program_id,
@@ -564,7 +470,7 @@ async def add_special_guest(
         return create_api_response(error=f"Database error: {error_msg}")
     except Exception as e:
         if db:
-            db.rollback()
+            await db.rollback()
         logger.error("Error adding special guest", exc_info=True, extra={
             "program_id": program_id,
             "error": str(e),
@@ -573,30 +479,86 @@ async def add_special_guest(
         return create_api_response(error=f"Failed to add special guest: {str(e)}")
 
 
+@router.put("/{program_id}/schedule/reorder")
+async def reorder_schedule_items(
+    program_id: int,
+    reorder_data: ReorderItemsRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Reorder schedule items for a program (one set-based UPDATE; see reorder_children)."""
+    # Verify program exists
+    program_exists = await db.scalar(select(Program.id).where(Program.id == program_id))
+    if not program_exists:
+        return create_api_response(error="Program not found")
+    
+    try:
+        positions = {
+            item["id"]: item["order_index"] for item in reorder_data.items
+            if item.get("id") is not None and item.get("order_index") is not None
+        }
+        schedule_items = await reorder_children(db, ScheduleItem, program_id, positions, 'order_index')
+        await db.commit()
+        invalidate_program(program_id)
+        
+        items_data = [ScheduleItemResponse.model_validate(si) for si in schedule_items]
+        return create_api_response(data=items_data)
+    
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error reordering schedule items", exc_info=True, extra={"program_id": program_id})
+        return create_api_response(error="Failed to reorder schedule items")
+
+
+@router.post("/{program_id}/schedule/{item_id}/move")
+async def move_schedule_item(
+    program_id: int,
+    item_id: int,
+    move_data: MoveRequest,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Move one schedule item before/after another; only that item's row is written (see move_child)."""
+    try:
+        moved = await move_child(db, ScheduleItem, program_id, item_id, move_data, 'order_index')
+    except InvalidMove as e:
+        await db.rollback()
+        return create_api_response(error=str(e))
+    if moved is None:
+        return create_api_response(error="Schedule item not found")
+    await db.commit()
+    invalidate_program(program_id)
+    schedule_rebalance(background_tasks, moved, ScheduleItem, program_id, 'order_index')
+    
+    return create_api_response(data=ScheduleItemResponse.model_validate(moved))
+
+
 @router.delete("/{program_id}/schedule/{item_id}")
 async def delete_schedule_item(
     program_id: int,
     item_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a schedule item from a program."""
     # Verify program exists
-    program = db.query(Program).filter(Program.id == program_id).first()
+    program = await db.scalar(select(Program).where(Program.id == program_id))
     if not program:
         return create_api_response(error="Program not found")
     
     # Verify schedule item exists and belongs to program
-    schedule_item = db.query(ScheduleItem).filter(
+    schedule_item = await db.scalar(select(ScheduleItem).where(
         ScheduleItem.id == item_id,
         ScheduleItem.program_id == program_id
-    ).first()
+    ))
     
     if not schedule_item:
         return create_api_response(error="Schedule item not found")
     
-    db.delete(schedule_item)
-    db.commit()
+    await db.delete(schedule_item)
+    await db.commit()
+    invalidate_program(program_id)
     
     return create_api_response(message="Schedule item deleted successfully")
 
@@ -606,131 +568,105 @@ async def update_schedule_item(
     program_id: int,
     item_id: int,
     item_data: ScheduleItemUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Update a schedule item."""
-    # Verify program exists
-    program = db.query(Program).filter(Program.id == program_id).first()
-    if not program:
-        return create_api_response(error="Program not found")
-    
-    # Verify schedule item exists and belongs to program
-    schedule_item = db.query(ScheduleItem).filter(
-        ScheduleItem.id == item_id,
-        ScheduleItem.program_id == program_id
-    ).first()
+    """Update a schedule item (one UPDATE ... RETURNING; the program id is part of its WHERE)."""
+    changes = item_data.model_dump(exclude_none=True)
+    if 'start_time' in changes:
+        changes['start_time'] = normalize_start_time_value(changes['start_time'])
+    schedule_item = await update_child_returning(db, ScheduleItem, program_id, item_id, changes)
     
     if not schedule_item:
         return create_api_response(error="Schedule item not found")
     
-    # Update fields
-    if item_data.title is not None:
-        schedule_item.title = item_data.title
-    if item_data.description is not None:
-        schedule_item.description = item_data.description
-    if item_data.start_time is not None:
-        schedule_item.start_time = normalize_start_time_value(item_data.start_time)
-    if item_data.duration_minutes is not None:
-        schedule_item.duration_minutes = item_data.duration_minutes
-    if item_data.order_index is not None:
-        try:
-            schedule_item.order_index = item_data.order_index
-        except AttributeError:
-            logger.warning("Cannot set order_index - column may not exist")
-            pass
-    if item_data.type is not None:
-        schedule_item.type = item_data.type
-    
-    db.commit()
-    db.refresh(schedule_item)
+    await db.commit()
+    invalidate_program(program_id)
     
     schedule_item_response = ScheduleItemResponse.model_validate(schedule_item)
     return create_api_response(data=schedule_item_response)
 
 
-@router.put("/{program_id}/schedule/reorder")
-async def reorder_schedule_items(
+@router.put("/{program_id}/guests/reorder")
+async def reorder_special_guests(
     program_id: int,
-    reorder_data: ReorderItemsRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    reorder_data: ReorderGuestsRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Reorder schedule items for a program."""
+    """Reorder special guests for a program (one set-based UPDATE; see reorder_children)."""
     # Verify program exists
-    program = db.query(Program).filter(Program.id == program_id).first()
-    if not program:
+    program_exists = await db.scalar(select(Program.id).where(Program.id == program_id))
+    if not program_exists:
         return create_api_response(error="Program not found")
     
     try:
-        # Update order_index for each item
-        for item in reorder_data.items:
-            item_id = item.get("id")
-            order_index = item.get("order_index")
-            
-            if item_id is None or order_index is None:
-                continue
-            
-            schedule_item = db.query(ScheduleItem).filter(
-                ScheduleItem.id == item_id,
-                ScheduleItem.program_id == program_id
-            ).first()
-            
-            if schedule_item:
-                try:
-                    schedule_item.order_index = order_index
-                except AttributeError:
-                    # Column doesn't exist yet - skip setting order_index
-                    logger.warning("Cannot set order_index - column may not exist", extra={"item_id": item_id})
-                    pass
-        
-        db.commit()
-        
-        # Return updated schedule items - handle missing order_index column gracefully
-        try:
-            schedule_items = db.query(ScheduleItem).filter(
-                ScheduleItem.program_id == program_id
-            ).order_by(ScheduleItem.order_index).all()
-        except Exception as e:
-            logger.warning("Error ordering schedule_items by order_index - column may not exist", exc_info=True, extra={"program_id": program_id})
-            # Fallback: order by id
-            schedule_items = db.query(ScheduleItem).filter(
-                ScheduleItem.program_id == program_id
-            ).order_by(ScheduleItem.id).all()
+        positions = {
+            guest["id"]: guest["display_order"] for guest in reorder_data.guests
+            if guest.get("id") is not None and guest.get("display_order") is not None
+        }
+        special_guests = await reorder_children(db, SpecialGuest, program_id, positions, 'display_order')
+        await db.commit()
+        invalidate_program(program_id)
         
-        items_data = [ScheduleItemResponse.model_validate(si) for si in schedule_items]
-        return create_api_response(data=items_data)
+        guests_data = [SpecialGuestResponse.model_validate(sg) for sg in special_guests]
+        return create_api_response(data=guests_data)
     
     except Exception as e:
-        db.rollback()
-        logger.error("Error reordering schedule items", exc_info=True, extra={"program_id": program_id})
-        return create_api_response(error="Failed to reorder schedule items")
+        await db.rollback()
+        logger.error("Error reordering special guests", exc_info=True, extra={"program_id": program_id})
+        return create_api_response(error="Failed to reorder special guests")
+
+
+@router.post("/{program_id}/guests/{guest_id}/move")
+async def move_special_guest(
+    program_id: int,
+    guest_id: int,
+    move_data: MoveRequest,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Move one special guest before/after another; only that guest's row is written (see move_child)."""
+    try:
+        moved = await move_child(db, SpecialGuest, program_id, guest_id, move_data, 'display_order')
+    except InvalidMove as e:
+        await db.rollback()
+        return create_api_response(error=str(e))
+    if moved is None:
+        return create_api_response(error="Special guest not found")
+    await db.commit()
+    invalidate_program(program_id)
+    schedule_rebalance(background_tasks, moved, SpecialGuest, program_id, 'display_order')
+    
+    return create_api_response(data=SpecialGuestResponse.model_validate(moved))
 
 
 @router.delete("/{program_id}/guests/{guest_id}")
 async def delete_special_guest(
     program_id: int,
     guest_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a special guest from a program."""
     # Verify program exists
-    program = db.query(Program).filter(Program.id == program_id).first()
+    program = await db.scalar(select(Program).where(Program.id == program_id))
     if not program:
         return create_api_response(error="Program not found")
     
     # Verify guest exists and belongs to program
-    special_guest = db.query(SpecialGuest).filter(
+    special_guest = await db.scalar(select(SpecialGuest).where(
         SpecialGuest.id == guest_id,
         SpecialGuest.program_id == program_id
-    ).first()
+    ))
     
     if not special_guest:
         return create_api_response(error="Special guest not found")
     
-    db.delete(special_guest)
-    db.commit()
+    await db.delete(special_guest)
+    await db.commit()
+    invalidate_program(program_id)
     
     return create_api_response(message="Special guest deleted successfully")
 
@@ -740,119 +676,358 @@ async def update_special_guest(
     program_id: int,
     guest_id: int,
     guest_data: SpecialGuestUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Update a special guest."""
-    # Verify program exists
-    program = db.query(Program).filter(Program.id == program_id).first()
-    if not program:
-        return create_api_response(error="Program not found")
-    
-    # Verify guest exists and belongs to program
-    special_guest = db.query(SpecialGuest).filter(
-        SpecialGuest.id == guest_id,
-        SpecialGuest.program_id == program_id
-    ).first()
+    """Update a special guest (one UPDATE ... RETURNING; the program id is part of its WHERE)."""
+    changes = guest_data.model_dump(exclude_none=True)
+    special_guest = await update_child_returning(db, SpecialGuest, program_id, guest_id, changes)
     
     if not special_guest:
         return create_api_response(error="Special guest not found")
     
-    # Update fields
-    if guest_data.name is not None:
-        special_guest.name = guest_data.name
-    if guest_data.role is not None:
-        special_guest.role = guest_data.role
-    if guest_data.description is not None:
-        special_guest.description = guest_data.description
-    if guest_data.bio is not None:
-        special_guest.bio = guest_data.bio
-    if guest_data.photo_url is not None:
-        special_guest.photo_url = guest_data.photo_url
-    if guest_data.display_order is not None:
-        try:
-            special_guest.display_order = guest_data.display_order
-        except AttributeError:
-            logger.warning("Cannot set display_order - column may not exist")
-            pass
-    
-    db.commit()
-    db.refresh(special_guest)
+    await db.commit()
+    invalidate_program(program_id)
     
     special_guest_response = SpecialGuestResponse.model_validate(special_guest)
     return create_api_response(data=special_guest_response)
 
 
-@router.put("/{program_id}/guests/reorder")
-async def reorder_special_guests(
-    program_id: int,
-    reorder_data: ReorderGuestsRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Reorder special guests for a program."""
-    # Verify program exists
-    program = db.query(Program).filter(Program.id == program_id).first()
-    if not program:
-        return create_api_response(error="Program not found")
+def child_ordering(table, position_column: str, existing_columns) -> tuple:
+    """ORDER BY for a program's schedule items or guests: position, then rank (see app/programs/ranking.py), then id."""
+    if 'rank' in existing_columns:
+        return (table.c[position_column], table.c.rank.nulls_first(), table.c.id)
+    return (table.c[position_column], table.c.id)
+
+
+def reorder_statement(table, columns, program_id: int, positions: Dict[int, int], position_column: str, existing_columns):
+    """
+    Postgres reorder as one statement: UPDATE ... FROM (VALUES ...) in a CTE, its
+    RETURNING rows merged with the program's untouched rows, in list order.
+    """
+    new_positions = sa_values(
+        sa_column("id", Integer), sa_column("position", Integer), name="new_positions"
+    ).data(list(positions.items()))
+    updated = (
+        update(table)
+        .where(table.c.id == new_positions.c.id, table.c.program_id == program_id)
+        .values({position_column: new_positions.c.position})
+        .returning(*columns)
+        .cte("updated")
+    )
+    untouched = select(*columns).where(table.c.program_id == program_id, table.c.id.not_in(select(updated.c.id)))
+    merged = union_all(untouched, select(*[updated.c[col.name] for col in columns])).subquery("reordered")
+    return select(merged).order_by(*child_ordering(merged, position_column, existing_columns))
+
+
+async def reorder_children(db: AsyncSession, model, program_id: int, positions: Dict[int, int], position_column: str) -> list:
+    """
+    Set new positions for a program's schedule items or guests and return the
+    program's full list in the new order, in a constant number of round trips.
+    
+    Ids that do not belong to the program are ignored by the statement itself.
+    Postgres: a single UPDATE ... FROM (VALUES ...) inside a CTE whose RETURNING
+    rows are merged with the untouched ones. SQLite: one UPDATE with a CASE
+    expression, then one SELECT of the list.
+    """
+    table = model.__table__
+    schema = await get_schema_registry(db)
+    existing_columns = schema.columns(table.name)
+    columns = [col for col in table.columns if col.name in existing_columns]
+    if position_column in existing_columns:
+        ordering = child_ordering(table, position_column, existing_columns)
+    else:
+        # Column not migrated yet: nothing to update, list by id
+        logger.warning("Cannot reorder - column may not exist", extra={"program_id": program_id, "column": position_column})
+        positions, ordering = {}, (table.c.id,)
+    
+    if positions and is_postgres:
+        result = await db.execute(reorder_statement(table, columns, program_id, positions, position_column, existing_columns))
+        return result.all()
+    
+    if positions:
+        await db.execute(
+            update(table)
+            .where(table.c.program_id == program_id, table.c.id.in_(list(positions)))
+            .values({position_column: case(positions, value=table.c.id, else_=table.c[position_column])})
+        )
+    result = await db.execute(select(*columns).where(table.c.program_id == program_id).order_by(*ordering))
+    return result.all()
+
+
+async def update_returning(db: AsyncSession, model, changes: dict, *criteria):
+    """
+    Apply `changes` to the row matching `criteria` and return it as a `model` instance
+    (None if no row matches), in one UPDATE ... RETURNING. With no changes it is a SELECT.
+    """
+    if not changes:
+        return await db.scalar(select(model).where(*criteria))
+    return await db.scalar(update(model).where(*criteria).values(changes).returning(model))
+
+
+def returning_columns(model, existing_columns) -> List[str]:
+    """The model's columns that exist in the database, in model order: what a write hands back."""
+    return [col.name for col in model.__table__.columns if col.name in existing_columns]
+
+
+async def update_child_returning(db: AsyncSession, model, program_id: int, row_id: int, changes: dict):
+    """
+    update_returning() for a schedule item or guest of `program_id`. Changes and the
+    returned row are limited to the columns the database has (see schema_registry).
+    """
+    table = model.__table__
+    schema = await get_schema_registry(db)
+    existing_columns = schema.columns(table.name)
+    skipped = [col for col in changes if col not in existing_columns]
+    if skipped:
+        logger.warning("Cannot set columns - column may not exist", extra={"table": table.name, "columns": skipped})
+    changes = {col: value for col, value in changes.items() if col in existing_columns}
+    columns = [table.c[col] for col in returning_columns(model, existing_columns)]
+    criteria = (table.c.id == row_id, table.c.program_id == program_id)
+    if changes:
+        statement = update(table).where(*criteria).values(changes).returning(*columns)
+    else:
+        statement = select(*columns).where(*criteria)
+    return (await db.execute(statement)).first()
+
+
+class InvalidMove(ValueError):
+    pass
+
+
+async def ranked_children(db: AsyncSession, table, program_id: int, position_column: str, existing_columns) -> List[RankedRow]:
+    result = await db.execute(
+        select(table.c.id, table.c[position_column], table.c.rank)
+        .where(table.c.program_id == program_id)
+        .order_by(*child_ordering(table, position_column, existing_columns))
+    )
+    return [RankedRow(*row) for row in result.all()]
+
+
+async def write_ranks(db: AsyncSession, table, position_column: str, rows: List[RankedRow]):
+    """Store rebalanced positions and ranks: one executemany UPDATE."""
+    if rows:
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values({position_column: bindparam("new_position"), "rank": bindparam("new_rank")}),
+            [{"row_id": row.id, "new_position": row.position, "new_rank": row.rank} for row in rows],
+        )
+
+
+async def move_child(db: AsyncSession, model, program_id: int, row_id: int, move: MoveRequest, position_column: str):
+    """
+    Move one schedule item or guest directly before `move.before_id` and/or after
+    `move.after_id` and return its updated row (None if the program has no such row).
+    
+    The row gets a position and rank that sort between its new neighbours
+    (app/programs/ranking.py), so one UPDATE of the moved row is the only write.
+    Only when the neighbours are tied and have no rank between them are the
+    program's ranks rebalanced first.
+    """
+    table = model.__table__
+    schema = await get_schema_registry(db)
+    existing_columns = schema.columns(table.name)
+    if 'rank' not in existing_columns or position_column not in existing_columns:
+        raise InvalidMove("Moving requires the rank column; run database migrations")
+    if move.before_id is None and move.after_id is None:
+        raise InvalidMove("Either before_id or after_id is required")
     
+    rows = await ranked_children(db, table, program_id, position_column, existing_columns)
+    others = [row for row in rows if row.id != row_id]
+    if len(others) == len(rows):
+        return None
+    index = {row.id: i for i, row in enumerate(others)}
+    if any(anchor is not None and anchor not in index for anchor in (move.before_id, move.after_id)):
+        raise InvalidMove("Anchor must be another item of the same program")
+    if move.after_id is not None:
+        following_index = index[move.after_id] + 1
+        if move.before_id is not None and index[move.before_id] != following_index:
+            raise InvalidMove("after_id and before_id must be next to each other")
+    else:
+        following_index = index[move.before_id]
+    
+    def neighbours():
+        previous = others[following_index - 1] if following_index > 0 else None
+        following = others[following_index] if following_index < len(others) else None
+        return previous, following
+    
+    placement = place_between(*neighbours())
+    if placement is None:
+        others = rebalance_positions(others)
+        await write_ranks(db, table, position_column, others)
+        placement = place_between(*neighbours())
+    
+    columns = [col for col in table.columns if col.name in existing_columns]
+    result = await db.execute(
+        update(table)
+        .where(table.c.id == row_id, table.c.program_id == program_id)
+        .values({position_column: placement.position, "rank": placement.rank})
+        .returning(*columns)
+    )
+    return result.one()
+
+
+def schedule_rebalance(background_tasks: BackgroundTasks, moved, model, program_id: int, position_column: str):
+    """Respace the program's ranks after the response once repeated moves into one gap made a key long."""
+    if moved.rank is not None and len(moved.rank) > REBALANCE_LENGTH:
+        background_tasks.add_task(rebalance_child_ranks, model, program_id, position_column)
+
+
+async def rebalance_child_ranks(model, program_id: int, position_column: str):
+    """Background task: rewrite a program's ranks evenly spaced, keeping the order. Runs in its own session."""
+    table = model.__table__
     try:
-        # Update display_order for each guest
-        for guest in reorder_data.guests:
-            guest_id = guest.get("id")
-            display_order = guest.get("display_order")
-            
-            if guest_id is None or display_order is None:
-                continue
-            
-            special_guest = db.query(SpecialGuest).filter(
-                SpecialGuest.id == guest_id,
-                SpecialGuest.program_id == program_id
-            ).first()
-            
-            if special_guest:
-                try:
-                    special_guest.display_order = display_order
-                except AttributeError:
-                    # Column doesn't exist yet - skip setting display_order
-                    logger.warning("Cannot set display_order - column may not exist", extra={"guest_id": guest_id})
-                    pass
-        
-        db.commit()
-        
-        # Return updated guests - handle missing display_order column gracefully
+        async with AsyncSessionLocal() as db:
+            schema = await get_schema_registry(db)
+            rows = await ranked_children(db, table, program_id, position_column, schema.columns(table.name))
+            await write_ranks(db, table, position_column, rebalance_positions(rows))
+            await db.commit()
+        # Rebalancing fills in missing positions, which the cached body shows
+        invalidate_program(program_id)
+        logger.info("Rebalanced ranks", extra={"program_id": program_id, "table": table.name, "rows": len(rows)})
+    except Exception:
+        logger.error("Error rebalancing ranks", exc_info=True, extra={"program_id": program_id, "table": table.name})
+
+
+SCHEDULE_ITEM_OPTIONAL_COLUMNS = ('description', 'start_time', 'duration_minutes', 'order_index', 'type')
+SPECIAL_GUEST_OPTIONAL_COLUMNS = ('role', 'description', 'bio', 'photo_url', 'display_order')
+
+
+def schedule_item_row(item: dict, program_id: int, columns) -> dict:
+    """
+    Insert parameters for one bulk schedule item, limited to columns that exist.
+    Every row gets the same keys (absent values are NULL, as omitting them was) so the
+    whole payload goes out as one batch.
+    """
+    values = {
+        'description': item.get("description") or None,
+        'start_time': normalize_start_time_value(item.get("start_time")) if item.get("start_time") else None,
+        'duration_minutes': item.get("duration_minutes"),
+        'order_index': item.get("order_index", 0),
+        'type': item.get("type", "worship"),
+    }
+    row = {'program_id': program_id, 'title': item.get("title")}
+    row.update((col, values[col]) for col in SCHEDULE_ITEM_OPTIONAL_COLUMNS if col in columns)
+    return row
+
+
+def special_guest_row(guest: dict, program_id: int, columns) -> dict:
+    """Insert parameters for one bulk special guest; see schedule_item_row."""
+    values = {
+        'role': guest.get("role") or None,
+        'description': guest.get("description") or None,
+        'bio': guest.get("bio") or None,
+        'photo_url': guest.get("photo_url") or None,
+        'display_order': guest.get("display_order", 0),
+    }
+    row = {'program_id': program_id, 'name': guest.get("name")}
+    row.update((col, values[col]) for col in SPECIAL_GUEST_OPTIONAL_COLUMNS if col in columns)
+    return row
+
+
+async def insert_rows(db: AsyncSession, table_name: str, rows: List[dict], skip_failed: bool, log_context: dict) -> List[Optional[int]]:
+    """
+    Insert rows in batches (multi-row VALUES, one round trip per column set and
+    insertmanyvalues page) and return their ids in input order.
+
+    With skip_failed, a failing batch is retried row by row, each in its own
+    savepoint, so only the bad rows are skipped and logged (their id is None).
+    Otherwise the first error propagates.
+    """
+    schema = await get_schema_registry(db)
+    groups = {}
+    for position, row in enumerate(rows):
+        groups.setdefault(tuple(row), []).append(position)
+    
+    ids: List[Optional[int]] = [None] * len(rows)
+    for columns, positions in groups.items():
+        statement = schema.insert_many_statement(table_name, columns)
+        params = [rows[position] for position in positions]
         try:
-            special_guests = db.query(SpecialGuest).filter(
-                SpecialGuest.program_id == program_id
-            ).order_by(SpecialGuest.display_order).all()
+            if skip_failed:
+                async with db.begin_nested():
+                    result = await db.execute(statement, params)
+            else:
+                result = await db.execute(statement, params)
         except Exception as e:
-            logger.warning("Error ordering special_guests by display_order - column may not exist", exc_info=True, extra={"program_id": program_id})
-            # Fallback: order by id
-            special_guests = db.query(SpecialGuest).filter(
-                SpecialGuest.program_id == program_id
-            ).order_by(SpecialGuest.id).all()
-        
-        guests_data = [SpecialGuestResponse.model_validate(sg) for sg in special_guests]
-        return create_api_response(data=guests_data)
+            logger.error("Error inserting rows in batch", exc_info=True, extra={
+                **log_context, "table": table_name, "row_count": len(params),
+                "columns_to_insert": list(columns), "error": str(e),
+            })
+            if not skip_failed:
+                raise
+            for position in positions:
+                try:
+                    async with db.begin_nested():
+                        ids[position] = (await db.execute(statement, [rows[position]])).scalar_one()
+                except Exception as row_error:
+                    logger.error("Skipping row that failed to insert", extra={
+                        **log_context, "table": table_name, "row_position": position, "error": str(row_error),
+                    })
+            continue
+        batch_ids = result.scalars().all()
+        if not ORDERED_RETURNING:
+            batch_ids = sorted(batch_ids)
+        for position, row_id in zip(positions, batch_ids):
+            ids[position] = row_id
+    return ids
+
+
+async def reconcile_children(
+    db: AsyncSession,
+    model,
+    program_id: int,
+    incoming: List[dict],
+    rows: List[dict],
+    position_column: str,
+    log_context: dict,
+) -> ChildChanges:
+    """
+    Bring one child table of a program in line with `rows` (built from the `incoming`
+    payload entries) using the minimal set of writes: one batched INSERT, one
+    executemany UPDATE per changed column set and one DELETE at most.
+    """
+    table = model.__table__
+    # With no incoming rows only the ids matter: everything stored gets deleted
+    columns = [col for col in (rows[0] if rows else {}) if col != 'program_id']
     
-    except Exception as e:
-        db.rollback()
-        logger.error("Error reordering special guests", exc_info=True, extra={"program_id": program_id})
-        return create_api_response(error="Failed to reorder special guests")
+    result = await db.execute(select(table.c.id, *[table.c[col] for col in columns]).where(table.c.program_id == program_id))
+    existing = [dict(row) for row in result.mappings()]
+    client_ids = [entry.get("id") if isinstance(entry.get("id"), int) else None for entry in incoming]
+    changes = plan_child_changes(existing, list(zip(client_ids, rows)), columns, position_column)
+    
+    if changes.deletes:
+        await db.execute(delete(table).where(table.c.id.in_(changes.deletes)))
+    
+    updates_by_columns = {}
+    for row_id, diff in changes.updates:
+        updates_by_columns.setdefault(tuple(diff), []).append({"row_id": row_id, **{f"new_{col}": value for col, value in diff.items()}})
+    for changed_columns, params in updates_by_columns.items():
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values({col: bindparam(f"new_{col}") for col in changed_columns})
+        )
+        await db.execute(statement, params)
+    
+    if changes.inserts:
+        await insert_rows(db, table.name, changes.inserts, skip_failed=False, log_context=log_context)
+    return changes
 
 
 @router.post("/bulk-import")
 async def bulk_import_program(
     program_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Bulk import a complete program with schedule items and guests.
     """
     try:
         # Get or create church for user
-        church = db.query(Church).filter(Church.id == current_user.church_id).first()
+        church = await db.scalar(select(Church).where(Church.id == current_user.church_id))
         if not church:
             return create_api_response(error="User has no associated church")
         
@@ -860,144 +1035,40 @@ async def bulk_import_program(
         program = Program(
             church_id=church.id,
             title=program_data.get("title", "Untitled Program"),
-            date=program_data.get("date"),
+            date=ProgramBase.parse_date(program_data.get("date")),
             theme=program_data.get("theme"),
             is_active=program_data.get("is_active", True),
             created_by=current_user.id
         )
         db.add(program)
-        db.commit()
-        db.refresh(program)
-        
-        # Add schedule items - check which columns exist first (same logic as add_schedule_item)
-        from sqlalchemy import inspect, text
-        from app.database.connection import engine
+        await db.commit()
+        await db.refresh(program)
         
-        inspector = inspect(engine)
-        schedule_columns = [col['name'] for col in inspector.get_columns('schedule_items')]
-        
-        if not schedule_columns:
-            try:
-                result = db.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'schedule_items'
-                """))
-                schedule_columns = [row[0] for row in result.fetchall()]
-            except Exception as e:
-                logger.warning("Could not inspect schedule_items columns, using minimal set", exc_info=True)
-                schedule_columns = ['id', 'program_id', 'title']  # Minimal safe set
+        # Add schedule items and guests, only using columns that exist; rows that fail are skipped and logged
+        schema = await get_schema_registry(db)
+        schedule_columns = schema.columns('schedule_items')
+        guest_columns = schema.columns('special_guests')
+        log_context = {"program_id": program.id, "operation": "bulk_import"}
         
         schedule_items = program_data.get("schedule_items", [])
-        for item in schedule_items:
-            # Build INSERT with only existing columns (same approach as add_schedule_item endpoint)
-            insert_cols = ['program_id', 'title']
-            params = {'program_id': program.id, 'title': item.get("title")}
-            placeholders = [':program_id', ':title']
-            
-            if 'description' in schedule_columns and item.get("description"):
-                insert_cols.append('description')
-                placeholders.append(':description')
-                params['description'] = item.get("description")
-            
-            if 'start_time' in schedule_columns and item.get("start_time"):
-                insert_cols.append('start_time')
-                placeholders.append(':start_time')
-                params['start_time'] = normalize_start_time_value(item.get("start_time"))
-            
-            # Only include duration_minutes if column exists
-            if 'duration_minutes' in schedule_columns and item.get("duration_minutes") is not None:
-                insert_cols.append('duration_minutes')
-                placeholders.append(':duration_minutes')
-                params['duration_minutes'] = item.get("duration_minutes")
-            
-            if 'order_index' in schedule_columns:
-                insert_cols.append('order_index')
-                placeholders.append(':order_index')
-                params['order_index'] = item.get("order_index", 0)
-            
-            if 'type' in schedule_columns:
-                insert_cols.append('type')
-                placeholders.append(':type')
-                params['type'] = item.get("type", "worship")
-            
-            # Execute parameterized SQL INSERT
-            try:
-                sql = f"INSERT INTO schedule_items ({', '.join(insert_cols)}) VALUES ({', '.join(placeholders)}) RETURNING id"
-                result = db.execute(text(sql), params)
-                # Item is automatically committed when we commit later
-            except Exception as e:
-                logger.error("Error adding schedule item in bulk import", exc_info=True, extra={
-                    "program_id": program.id,
-                    "error": str(e)
-                })
-                # Continue with other items even if one fails
-                continue
-        
-        # Add special guests - check which columns exist first (same approach as schedule items)
-        guest_columns = [col['name'] for col in inspector.get_columns('special_guests')]
-        
-        if not guest_columns:
-            try:
-                result = db.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'special_guests'
-                """))
-                guest_columns = [row[0] for row in result.fetchall()]
-            except Exception as e:
-                logger.warning("Could not inspect special_guests columns, using minimal set", exc_info=True)
-                guest_columns = ['id', 'program_id', 'name']  # Minimal safe set
+        item_ids = await insert_rows(db, 'schedule_items', [
+            schedule_item_row(item, program.id, schedule_columns) for item in schedule_items
+        ], skip_failed=True, log_context=log_context)
         
         special_guests = program_data.get("special_guests", [])
-        for guest in special_guests:
-            # Build INSERT with only existing columns
-            insert_cols = ['program_id', 'name']
-            params = {'program_id': program.id, 'name': guest.get("name")}
-            placeholders = [':program_id', ':name']
-            
-            if 'role' in guest_columns and guest.get("role"):
-                insert_cols.append('role')
-                placeholders.append(':role')
-                params['role'] = guest.get("role")
-            
-            if 'description' in guest_columns and guest.get("description"):
-                insert_cols.append('description')
-                placeholders.append(':description')
-                params['description'] = guest.get("description")
-            
-            if 'bio' in guest_columns and guest.get("bio"):
-                insert_cols.append('bio')
-                placeholders.append(':bio')
-                params['bio'] = guest.get("bio")
-            
-            if 'photo_url' in guest_columns and guest.get("photo_url"):
-                insert_cols.append('photo_url')
-                placeholders.append(':photo_url')
-                params['photo_url'] = guest.get("photo_url")
-            
-            if 'display_order' in guest_columns:
-                insert_cols.append('display_order')
-                placeholders.append(':display_order')
-                params['display_order'] = guest.get("display_order", 0)
-            
-            # Execute parameterized SQL INSERT
-            try:
-                sql = f"INSERT INTO special_guests ({', '.join(insert_cols)}) VALUES ({', '.join(placeholders)}) RETURNING id"
-                db.execute(text(sql), params)
-            except Exception as e:
-                logger.error("Error adding special guest in bulk import", exc_info=True, extra={
-                    "program_id": program.id,
-                    "error": str(e)
-                })
-                # Continue with other guests even if one fails
-                continue
+        guest_ids = await insert_rows(db, 'special_guests', [
+            special_guest_row(guest, program.id, guest_columns) for guest in special_guests
+        ], skip_failed=True, log_context=log_context)
         
-        db.commit()
+        await db.commit()
+        invalidate_program(program.id)
+        for table_name, ids in (('schedule_items', item_ids), ('special_guests', guest_ids)):
+            failed = ids.count(None)
+            count_bulk_rows("bulk_import", table_name, {"inserted": len(ids) - failed, "failed": failed})
         
         # Return complete program
-        schedule_items_db = db.query(ScheduleItem).filter(ScheduleItem.program_id == program.id).all()
-        guests_db = db.query(SpecialGuest).filter(SpecialGuest.program_id == program.id).all()
+        schedule_items_db = (await db.scalars(select(ScheduleItem).where(ScheduleItem.program_id == program.id))).all()
+        guests_db = (await db.scalars(select(SpecialGuest).where(SpecialGuest.program_id == program.id))).all()
         
         program_dict = {
             "id": program.id,
@@ -1014,7 +1085,7 @@ async def bulk_import_program(
         return create_api_response(data=program_dict)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error in bulk import", exc_info=True, extra={
             "user_id": current_user.id,
             "error": str(e)
@@ -1026,12 +1097,17 @@ async def bulk_import_program(
 async def bulk_update_program(
     program_id: int,
     program_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a program with schedule items and guests in one atomic operation.
-    This replaces all existing schedule items and guests with the new ones.
+    
+    By default the payload is reconciled with what is stored: rows are matched by id
+    (when sent), then by identical content, then by position, and only the difference
+    is written, so unchanged rows keep their ids. Send "mode": "replace" to delete and
+    re-insert every row instead. meta.changes reports what was written; when nothing
+    changed, caches are left alone.
     """
     logger.info("Bulk update program request received", extra={
         "program_id": program_id,
@@ -1042,7 +1118,7 @@ async def bulk_update_program(
     })
     
     # Verify program exists and user has permission
-    program = db.query(Program).filter(Program.id == program_id).first()
+    program = await db.scalar(select(Program).where(Program.id == program_id))
     if not program:
         logger.warning("Program not found for bulk update", extra={"program_id": program_id})
         return create_api_response(error="Program not found")
@@ -1058,191 +1134,75 @@ async def bulk_update_program(
         return create_api_response(error="Unauthorized")
     
     try:
-        # Update program details
+        # Update program details (assigning an equal value is not a change)
         if "title" in program_data:
             program.title = program_data["title"]
         if "date" in program_data:
-            program.date = program_data["date"]
+            program.date = ProgramBase.parse_date(program_data["date"])
         if "theme" in program_data:
             program.theme = program_data.get("theme")
         if "is_active" in program_data:
             program.is_active = program_data["is_active"]
+        program_changed = db.is_modified(program)
         
-        # Delete all existing schedule items and guests
-        db.query(ScheduleItem).filter(ScheduleItem.program_id == program_id).delete()
-        db.query(SpecialGuest).filter(SpecialGuest.program_id == program_id).delete()
-        
-        # Add new schedule items - check which columns exist first (same logic as bulk_import_program)
-        from sqlalchemy import inspect, text
-        from app.database.connection import engine
-        
-        inspector = inspect(engine)
-        schedule_columns = [col['name'] for col in inspector.get_columns('schedule_items')]
-        
-        if not schedule_columns:
-            try:
-                result = db.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'schedule_items'
-                """))
-                schedule_columns = [row[0] for row in result.fetchall()]
-            except Exception as e:
-                logger.warning("Could not inspect schedule_items columns, using minimal set", exc_info=True)
-                schedule_columns = ['id', 'program_id', 'title']  # Minimal safe set
-        
-        logger.info("Schedule items columns detected", extra={
-            "program_id": program_id,
-            "existing_columns": schedule_columns
-        })
+        # Build rows with only the columns that exist (same logic as bulk_import_program)
+        schema = await get_schema_registry(db)
+        schedule_columns = schema.columns('schedule_items')
+        guest_columns = schema.columns('special_guests')
+        log_context = {"program_id": program_id, "operation": "bulk_update"}
         
         schedule_items = program_data.get("schedule_items", [])
-        logger.info("Processing schedule items", extra={
-            "program_id": program_id,
-            "item_count": len(schedule_items)
-        })
-        for item in schedule_items:
-            # Build INSERT with only existing columns (same approach as add_schedule_item endpoint)
-            insert_cols = ['program_id', 'title']
-            params = {'program_id': program.id, 'title': item.get("title")}
-            placeholders = [':program_id', ':title']
-            
-            if 'description' in schedule_columns and item.get("description"):
-                insert_cols.append('description')
-                placeholders.append(':description')
-                params['description'] = item.get("description")
-            
-            if 'start_time' in schedule_columns and item.get("start_time"):
-                insert_cols.append('start_time')
-                placeholders.append(':start_time')
-                params['start_time'] = normalize_start_time_value(item.get("start_time"))
-            
-            # Only include duration_minutes if column exists
-            if 'duration_minutes' in schedule_columns and item.get("duration_minutes") is not None:
-                insert_cols.append('duration_minutes')
-                placeholders.append(':duration_minutes')
-                params['duration_minutes'] = item.get("duration_minutes")
-            
-            if 'order_index' in schedule_columns:
-                insert_cols.append('order_index')
-                placeholders.append(':order_index')
-                params['order_index'] = item.get("order_index", 0)
-            
-            if 'type' in schedule_columns:
-                insert_cols.append('type')
-                placeholders.append(':type')
-                params['type'] = item.get("type", "worship")
-            
-            # Execute parameterized SQL INSERT
-            try:
-                sql = f"INSERT INTO schedule_items ({', '.join(insert_cols)}) VALUES ({', '.join(placeholders)}) RETURNING id"
-                logger.debug("Executing schedule item INSERT", extra={
-                    "program_id": program.id,
-                    "sql": sql,
-                    "columns_to_insert": insert_cols,
-                    "existing_columns": schedule_columns
-                })
-                db.execute(text(sql), params)
-            except Exception as e:
-                logger.error("Error adding schedule item in bulk update", exc_info=True, extra={
-                    "program_id": program.id,
-                    "item_title": item.get("title"),
-                    "columns_to_insert": insert_cols,
-                    "error": str(e)
-                })
-                db.rollback()
-                raise
-        
-        # Add new special guests - check which columns exist first
-        guest_columns = [col['name'] for col in inspector.get_columns('special_guests')]
-        
-        if not guest_columns:
-            try:
-                result = db.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = 'special_guests'
-                """))
-                guest_columns = [row[0] for row in result.fetchall()]
-            except Exception as e:
-                logger.warning("Could not inspect special_guests columns, using minimal set", exc_info=True)
-                guest_columns = ['id', 'program_id', 'name']
-        
-        logger.info("Special guests columns detected", extra={
-            "program_id": program_id,
-            "existing_columns": guest_columns
-        })
-        
         special_guests = program_data.get("special_guests", [])
-        logger.info("Processing special guests", extra={
+        schedule_rows = [schedule_item_row(item, program_id, schedule_columns) for item in schedule_items]
+        guest_rows = [special_guest_row(guest, program_id, guest_columns) for guest in special_guests]
+        mode = program_data.get("mode", "reconcile")
+        logger.info("Processing schedule items and guests", extra={
             "program_id": program_id,
-            "guest_count": len(special_guests)
+            "item_count": len(schedule_items),
+            "guest_count": len(special_guests),
+            "mode": mode
         })
-        for guest in special_guests:
-            # Build INSERT with only existing columns
-            insert_cols = ['program_id', 'name']
-            params = {'program_id': program.id, 'name': guest.get("name")}
-            placeholders = [':program_id', ':name']
-            
-            if 'role' in guest_columns and guest.get("role"):
-                insert_cols.append('role')
-                placeholders.append(':role')
-                params['role'] = guest.get("role")
-            
-            if 'description' in guest_columns and guest.get("description"):
-                insert_cols.append('description')
-                placeholders.append(':description')
-                params['description'] = guest.get("description")
-            
-            if 'bio' in guest_columns and guest.get("bio"):
-                insert_cols.append('bio')
-                placeholders.append(':bio')
-                params['bio'] = guest.get("bio")
-            
-            if 'photo_url' in guest_columns and guest.get("photo_url"):
-                insert_cols.append('photo_url')
-                placeholders.append(':photo_url')
-                params['photo_url'] = guest.get("photo_url")
-            
-            if 'display_order' in guest_columns:
-                insert_cols.append('display_order')
-                placeholders.append(':display_order')
-                params['display_order'] = guest.get("display_order", 0)
-            
-            # Execute parameterized SQL INSERT
-            try:
-                sql = f"INSERT INTO special_guests ({', '.join(insert_cols)}) VALUES ({', '.join(placeholders)}) RETURNING id"
-                logger.debug("Executing special guest INSERT", extra={
-                    "program_id": program.id,
-                    "sql": sql,
-                    "columns_to_insert": insert_cols,
-                    "existing_columns": guest_columns
-                })
-                db.execute(text(sql), params)
-            except Exception as e:
-                logger.error("Error adding special guest in bulk update", exc_info=True, extra={
-                    "program_id": program.id,
-                    "guest_name": guest.get("name"),
-                    "columns_to_insert": insert_cols,
-                    "error": str(e)
-                })
-                db.rollback()
-                raise
+        
+        # Any failure aborts the whole update (the outer handler rolls back)
+        if mode == "replace":
+            deleted_items = await db.scalars(
+                delete(ScheduleItem).where(ScheduleItem.program_id == program_id).returning(ScheduleItem.id)
+            )
+            item_changes = ChildChanges(inserts=schedule_rows, deletes=list(deleted_items))
+            deleted_guests = await db.scalars(
+                delete(SpecialGuest).where(SpecialGuest.program_id == program_id).returning(SpecialGuest.id)
+            )
+            guest_changes = ChildChanges(inserts=guest_rows, deletes=list(deleted_guests))
+            await insert_rows(db, 'schedule_items', schedule_rows, skip_failed=False, log_context=log_context)
+            await insert_rows(db, 'special_guests', guest_rows, skip_failed=False, log_context=log_context)
+        else:
+            item_changes = await reconcile_children(
+                db, ScheduleItem, program_id, schedule_items, schedule_rows, 'order_index', log_context
+            )
+            guest_changes = await reconcile_children(
+                db, SpecialGuest, program_id, special_guests, guest_rows, 'display_order', log_context
+            )
+        changed = program_changed or item_changes.changed or guest_changes.changed
         
         # Commit everything in one transaction
         logger.info("Committing bulk update transaction", extra={"program_id": program_id})
-        db.commit()
-        db.refresh(program)
+        await db.commit()
+        if changed:
+            invalidate_program(program_id)
+        count_bulk_rows("bulk_update", "schedule_items", item_changes.counts())
+        count_bulk_rows("bulk_update", "special_guests", guest_changes.counts())
+        await db.refresh(program)
         
         logger.info("Bulk update completed successfully", extra={
             "program_id": program_id,
-            "schedule_items_count": len(schedule_items),
-            "special_guests_count": len(special_guests)
+            "schedule_item_changes": item_changes.counts(),
+            "special_guest_changes": guest_changes.counts(),
+            "program_changed": program_changed
         })
         
         # Fetch and return complete updated program
-        schedule_items_db = db.query(ScheduleItem).filter(ScheduleItem.program_id == program.id).all()
-        guests_db = db.query(SpecialGuest).filter(SpecialGuest.program_id == program.id).all()
+        schedule_items_db = (await db.scalars(select(ScheduleItem).where(ScheduleItem.program_id == program.id))).all()
+        guests_db = (await db.scalars(select(SpecialGuest).where(SpecialGuest.program_id == program.id))).all()
         
         program_dict = {
             "id": program.id,
@@ -1256,10 +1216,15 @@ async def bulk_update_program(
             "special_guests": [SpecialGuestResponse.model_validate(sg) for sg in guests_db]
         }
         
-        return create_api_response(data=program_dict)
+        return create_api_response(data=program_dict, meta={"changes": {
+            "changed": changed,
+            "program": program_changed,
+            "schedule_items": item_changes.counts(),
+            "special_guests": guest_changes.counts(),
+        }})
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         error_msg = str(e)
         logger.error("Error in bulk update", exc_info=True, extra={
             "program_id": program_id,
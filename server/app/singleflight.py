@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical loads.
+
+    The first caller for a key runs the loader; callers arriving while it is
+    in flight wait for and share its result (or its exception). If the
+    leading request is cancelled (client went away), one of the waiters
+    takes over and runs the loader itself.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.loads = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+                self.shared += 1
+                return result
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.loads += 1
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved; waiters (if any) re-raise it themselves
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def forget(self, key: Hashable) -> None:
+        """Detach an in-flight load so later callers start a fresh one (e.g. after a write)."""
+        self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._inflight), "loads": self.loads, "shared": self.shared}
@@ -1,24 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database.connection import get_db
-from app.models.database import ProgramTemplate, User
+from app.database.connection import ReleaseSessionRoute, get_async_db
+from app.models.database import ProgramTemplate
 from app.models.schemas import TemplateCreate, TemplateUpdate, TemplateResponse, SuccessResponse, create_api_response
-from app.auth.middleware import get_current_user
+from app.auth.middleware import Principal, get_current_user
 
-router = APIRouter()
+router = APIRouter(route_class=ReleaseSessionRoute)
 
 
 @router.get("/")
 async def get_templates(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all templates for the user's church."""
     if not current_user.church_id:
         return create_api_response(data=[])
     
-    templates = db.query(ProgramTemplate).filter(ProgramTemplate.church_id == current_user.church_id).order_by(ProgramTemplate.created_at.desc()).all()
+    templates = (await db.scalars(
+        select(ProgramTemplate).where(ProgramTemplate.church_id == current_user.church_id).order_by(ProgramTemplate.created_at.desc())
+    )).all()
     templates_data = [TemplateResponse.model_validate(t) for t in templates]
     return create_api_response(data=templates_data)
 
@@ -26,17 +29,17 @@ async def get_templates(
 @router.get("/{template_id}")
 async def get_template_by_id(
     template_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific template."""
     if not current_user.church_id:
         return create_api_response(error="User has no associated church")
 
-    template = db.query(ProgramTemplate).filter(
+    template = await db.scalar(select(ProgramTemplate).where(
         ProgramTemplate.id == template_id,
         ProgramTemplate.church_id == current_user.church_id
-    ).first()
+    ))
     if not template:
         return create_api_response(error="Template not found")
     
@@ -47,8 +50,8 @@ async def get_template_by_id(
 @router.post("/")
 async def create_template(
     template_data: TemplateCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new template."""
     if not current_user.church_id:
@@ -62,8 +65,8 @@ async def create_template(
         content=template_data.content
     )
     db.add(template)
-    db.commit()
-    db.refresh(template)
+    await db.commit()
+    await db.refresh(template)
     
     template_response = TemplateResponse.model_validate(template)
     return create_api_response(data=template_response)
@@ -73,17 +76,17 @@ async def create_template(
 async def update_template(
     template_id: int,
     template_data: TemplateUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an existing template."""
     if not current_user.church_id:
         return create_api_response(error="User has no associated church")
 
-    template = db.query(ProgramTemplate).filter(
+    template = await db.scalar(select(ProgramTemplate).where(
         ProgramTemplate.id == template_id,
         ProgramTemplate.church_id == current_user.church_id
-    ).first()
+    ))
     if not template:
         return create_api_response(error="Template not found")
     
@@ -92,8 +95,8 @@ async def update_template(
     if template_data.content is not None:
         template.content = template_data.content
     
-    db.commit()
-    db.refresh(template)
+    await db.commit()
+    await db.refresh(template)
     
     template_response = TemplateResponse.model_validate(template)
     return create_api_response(data=template_response)
@@ -102,8 +105,8 @@ async def update_template(
 @router.delete("/{template_id}", response_model=SuccessResponse)
 async def delete_template(
     template_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a template."""
     if not current_user.church_id:
@@ -112,18 +115,18 @@ async def delete_template(
             detail="Template not found"
         )
 
-    template = db.query(ProgramTemplate).filter(
+    template = await db.scalar(select(ProgramTemplate).where(
         ProgramTemplate.id == template_id,
         ProgramTemplate.church_id == current_user.church_id
-    ).first()
+    ))
     if not template:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Template not found"
         )
     
-    db.delete(template)
-    db.commit()
+    await db.delete(template)
+    await db.commit()
     
     return SuccessResponse(success=True, message="Template deleted successfully")
 
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: blocking Session vs AsyncSession inside async route handlers.
+
+Fires N concurrent requests at two equivalent endpoints. Each one runs a
+query that takes ~DB_LATENCY_MS to answer (pg_sleep on Postgres, a
+registered pg_sleep() function on SQLite):
+
+  /blocking  - sync Session inside `async def` (the old get_db pattern)
+  /async     - AsyncSession (the get_async_db pattern the routers use now)
+
+Usage (from the server directory):
+    DATABASE_URL=sqlite:///./bench.db python benchmarks/bench_async_db.py
+    DATABASE_URL=postgresql://... python benchmarks/bench_async_db.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.database.connection import connect_args, async_connect_args, get_async_database_url, is_postgres
+
+DB_LATENCY_MS = int(os.environ.get("DB_LATENCY_MS", "20"))
+CONCURRENCY_LEVELS = [1, 10, 50, 100]
+
+# Pools sized to the highest concurrency level so neither path is capped by
+# pool exhaustion (with a small pool the blocking path simply deadlocks until
+# pool_timeout, because the loop thread ends up waiting on itself).
+POOL_SIZE = max(CONCURRENCY_LEVELS)
+engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, pool_size=POOL_SIZE)
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL), connect_args=async_connect_args, pool_size=POOL_SIZE
+)
+BenchSession = sessionmaker(bind=engine)
+AsyncBenchSession = async_sessionmaker(async_engine)
+
+SLOW_QUERY = text("SELECT pg_sleep(:seconds)")
+
+if not is_postgres:
+    # SQLite has no sleep; register one so both paths see the same latency
+    def _register_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("pg_sleep", 1, lambda seconds: time.sleep(seconds) or 0)
+
+    event.listen(engine, "connect", _register_sleep)
+    event.listen(async_engine.sync_engine, "connect", _register_sleep)
+
+
+async def get_db():
+    # Async generator so FastAPI does not route setup/teardown through its
+    # 40-thread pool; the query itself still blocks the loop like before
+    db = BenchSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncBenchSession() as db:
+        yield db
+
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/blocking")
+async def blocking_read(db: Session = Depends(get_db)):
+    db.execute(SLOW_QUERY, {"seconds": DB_LATENCY_MS / 1000})
+    return {"ok": True}
+
+
+@bench_app.get("/async")
+async def async_read(db: AsyncSession = Depends(get_async_db)):
+    await db.execute(SLOW_QUERY, {"seconds": DB_LATENCY_MS / 1000})
+    return {"ok": True}
+
+
+async def run(path: str, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm the pool
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    assert all(r.status_code == 200 for r in responses)
+    return concurrency / elapsed
+
+
+async def main():
+    print(f"Simulated DB latency: {DB_LATENCY_MS}ms per query")
+    print(f"{'concurrency':>12} {'blocking req/s':>16} {'async req/s':>14} {'speedup':>9}")
+    for concurrency in CONCURRENCY_LEVELS:
+        blocking = await run("/blocking", concurrency)
+        non_blocking = await run("/async", concurrency)
+        print(f"{concurrency:>12} {blocking:>16.1f} {non_blocking:>14.1f} {non_blocking / blocking:>8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: writing bulk import/update children row by row vs in batches.
+
+  row_by_row - one INSERT ... RETURNING id per schedule item and guest (previous behavior)
+  batched    - insert_rows(): one multi-row INSERT per table and column set
+
+Reports database round trips (statements sent) and wall time per payload. Each
+payload has N schedule items plus N/10 guests and is rolled back afterwards.
+
+Usage (from the server directory):
+    DATABASE_URL=postgresql://... python benchmarks/bench_bulk_insert.py
+(with the default SQLite URL it runs against a local file database)
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database.connection import AsyncSessionLocal, Base, async_engine, engine
+from app.database.schema_registry import get_schema_registry
+from app.models.database import Church, Program
+from app.programs.router import insert_rows, schedule_item_row, special_guest_row
+
+ITEM_COUNTS = [10, 100, 1000]
+REPEATS = int(os.environ.get("BENCH_REPEATS", "5"))
+
+
+def seed_program() -> int:
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        church = Church(name="Benchmark Church")
+        db.add(church)
+        db.flush()
+        program = Program(church_id=church.id, title="Bulk benchmark")
+        db.add(program)
+        db.commit()
+        return program.id
+
+
+def delete_program(program_id: int):
+    with Session(engine) as db:
+        program = db.get(Program, program_id)
+        church = db.get(Church, program.church_id)
+        db.delete(program)
+        db.flush()
+        db.delete(church)
+        db.commit()
+
+
+def payload(items: int):
+    schedule_items = [
+        {"title": f"Session {i}", "description": "x" * 80, "start_time": "10:00", "duration_minutes": 20, "order_index": i}
+        for i in range(items)
+    ]
+    special_guests = [{"name": f"Speaker {i}", "role": "Speaker", "bio": "y" * 200, "display_order": i} for i in range(max(1, items // 10))]
+    return schedule_items, special_guests
+
+
+async def row_by_row(db, program_id, schedule_items, special_guests):
+    schema = await get_schema_registry(db)
+    for table_name, rows in (
+        ("schedule_items", [schedule_item_row(item, program_id, schema.columns("schedule_items")) for item in schedule_items]),
+        ("special_guests", [special_guest_row(guest, program_id, schema.columns("special_guests")) for guest in special_guests]),
+    ):
+        for row in rows:
+            await db.execute(schema.insert_statement(table_name, row), row)
+
+
+async def batched(db, program_id, schedule_items, special_guests):
+    schema = await get_schema_registry(db)
+    await insert_rows(db, "schedule_items", [
+        schedule_item_row(item, program_id, schema.columns("schedule_items")) for item in schedule_items
+    ], skip_failed=False, log_context={})
+    await insert_rows(db, "special_guests", [
+        special_guest_row(guest, program_id, schema.columns("special_guests")) for guest in special_guests
+    ], skip_failed=False, log_context={})
+
+
+async def measure(strategy, program_id: int, items: int):
+    schedule_items, special_guests = payload(items)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    elapsed = []
+    for _ in range(REPEATS):
+        async with AsyncSessionLocal() as db:
+            await get_schema_registry(db)
+            event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+            statements.clear()
+            started = time.perf_counter()
+            await strategy(db, program_id, schedule_items, special_guests)
+            elapsed.append(time.perf_counter() - started)
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+            await db.rollback()
+    return len(statements), min(elapsed) * 1000
+
+
+async def main():
+    program_id = seed_program()
+    print(f"{async_engine.dialect.name}, best of {REPEATS}")
+    print(f"{'items':>6} {'row trips':>10} {'batch trips':>12} {'row ms':>9} {'batch ms':>9}")
+    try:
+        for items in ITEM_COUNTS:
+            row_trips, row_ms = await measure(row_by_row, program_id, items)
+            batch_trips, batch_ms = await measure(batched, program_id, items)
+            print(f"{items:>6} {row_trips:>10} {batch_trips:>12} {row_ms:>9.1f} {batch_ms:>9.1f}")
+    finally:
+        delete_program(program_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how long requests hold a pooled connection, and how many they hold at once.
+
+  teardown - plain APIRoute: the session is closed by get_async_db's teardown, after
+             the response is serialized and sent (previous behavior)
+  release  - ReleaseSessionRoute: the session is closed as soon as the endpoint returns
+
+Both serve GET /api/v1/templates/ (current user lookup plus a list of templates) to
+CONCURRENCY clients at once. SLOW_SEND_MS delays every response body chunk, standing
+in for clients on slow networks. Reports peak connections checked out, connections
+held on average over the run (total hold time / wall time), mean time a connection
+stays checked out per checkout, and wall time.
+
+Usage (from the server directory):
+    DATABASE_URL=postgresql://... python benchmarks/bench_connection_hold.py
+(with the default SQLite URL it runs against a local file database)
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.auth.jwt_handler import create_access_token
+from app.database.connection import Base, ReleaseSessionRoute, async_engine, engine
+from app.models.database import Church, ProgramTemplate, User
+from app.templates.router import get_templates
+
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", "10"))
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "5"))
+TEMPLATES = 200
+SLOW_SEND_MS = float(os.environ.get("SLOW_SEND_MS", "20"))
+
+
+def seed():
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        church = Church(name="Benchmark Church")
+        db.add(church)
+        db.flush()
+        user = User(username="bench-hold", password_hash="x", role="admin", church_id=church.id)
+        db.add(user)
+        db.add_all(ProgramTemplate(church_id=church.id, name=f"Template {i}", content="x" * 400) for i in range(TEMPLATES))
+        db.commit()
+        return church.id, user.id
+
+
+def cleanup(church_id: int, user_id: int):
+    with Session(engine) as db:
+        db.query(ProgramTemplate).filter(ProgramTemplate.church_id == church_id).delete()
+        db.query(User).filter(User.id == user_id).delete()
+        db.flush()
+        db.query(Church).filter(Church.id == church_id).delete()
+        db.commit()
+
+
+def build_app(route_class):
+    router = APIRouter(route_class=route_class)
+    router.add_api_route("/api/v1/templates/", get_templates, methods=["GET"])
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def slow_client(app):
+    """Delay each response body chunk, as a slow network would."""
+    async def wrapped(scope, receive, send):
+        async def slow_send(message):
+            if message["type"] == "http.response.body":
+                await asyncio.sleep(SLOW_SEND_MS / 1000)
+            await send(message)
+        await app(scope, receive, slow_send)
+    return wrapped
+
+
+class HoldTracker:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self.holds = []
+        self._started = {}
+
+    def checkout(self, dbapi_connection, record, proxy):
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        self._started[id(record)] = time.perf_counter()
+
+    def checkin(self, dbapi_connection, record):
+        started = self._started.pop(id(record), None)
+        if started is not None:
+            self.current -= 1
+            self.holds.append(time.perf_counter() - started)
+
+
+async def measure(route_class, headers):
+    tracker = HoldTracker()
+    event.listen(async_engine.sync_engine, "checkout", tracker.checkout)
+    event.listen(async_engine.sync_engine, "checkin", tracker.checkin)
+    transport = httpx.ASGITransport(app=slow_client(build_app(route_class)))
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            for _ in range(ROUNDS):
+                responses = await asyncio.gather(*(
+                    client.get("/api/v1/templates/", headers=headers) for _ in range(CONCURRENCY)
+                ))
+                assert all(len(r.json()["data"]) == TEMPLATES for r in responses)
+            elapsed = time.perf_counter() - started
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", tracker.checkout)
+        event.remove(async_engine.sync_engine, "checkin", tracker.checkin)
+    held = sum(tracker.holds)
+    return tracker.peak, held / elapsed, held / len(tracker.holds) * 1000, elapsed * 1000
+
+
+async def main():
+    church_id, user_id = seed()
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "bench-hold", "user_id": user_id})}
+    print(f"{async_engine.dialect.name}, {CONCURRENCY} concurrent requests x {ROUNDS} rounds, "
+          f"{SLOW_SEND_MS:.0f} ms per body chunk sent")
+    print(f"{'strategy':>9} {'peak conns':>11} {'avg conns':>10} {'mean hold ms':>13} {'wall ms':>9}")
+    try:
+        for name, route_class in (("teardown", APIRoute), ("release", ReleaseSessionRoute)):
+            peak, average, hold_ms, wall_ms = await measure(route_class, headers)
+            print(f"{name:>9} {peak:>11} {average:>10.1f} {hold_ms:>13.1f} {wall_ms:>9.1f}")
+    finally:
+        await async_engine.dispose()
+        cleanup(church_id, user_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
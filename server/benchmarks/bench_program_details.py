@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU per request for GET /programs/{id}, Python path vs Postgres JSON path.
+
+  python  - one query, row folding, Pydantic validation, FastAPI JSON encoding
+  pg_json - Postgres builds the envelope with json_build_object/json_agg and
+            the API returns the bytes untouched (PROGRAM_DETAILS_JSON_AGG=true)
+
+CPU is measured with time.process_time(), so it only counts work done by this
+process, not by the database server.
+
+Usage (from the server directory, Postgres only):
+    DATABASE_URL=postgresql://... python benchmarks/bench_program_details.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.database.connection import AsyncSessionLocal, engine, is_postgres
+from app.models.database import Church, Program, ScheduleItem, SpecialGuest
+from app.models.schemas import create_api_response
+from app.programs.repository import get_program_details, get_program_details_json
+
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", "500"))
+ITEM_COUNTS = [5, 30, 100]
+
+
+def seed_program(items: int) -> int:
+    with Session(engine) as db:
+        church = db.query(Church).first() or Church(name="Benchmark Church")
+        db.add(church)
+        db.flush()
+        program = Program(church_id=church.id, title=f"Benchmark ({items} items)", theme="Load")
+        db.add(program)
+        db.flush()
+        db.add_all(
+            ScheduleItem(program_id=program.id, title=f"Item {i}", description="x" * 80,
+                         start_time="10:00", duration_minutes=5, order_index=i)
+            for i in range(items)
+        )
+        db.add_all(SpecialGuest(program_id=program.id, name=f"Guest {i}", bio="y" * 200, display_order=i)
+                   for i in range(max(1, items // 10)))
+        db.commit()
+        return program.id
+
+
+def delete_program(program_id: int):
+    with Session(engine) as db:
+        db.query(ScheduleItem).filter(ScheduleItem.program_id == program_id).delete()
+        db.query(SpecialGuest).filter(SpecialGuest.program_id == program_id).delete()
+        db.query(Program).filter(Program.id == program_id).delete()
+        db.commit()
+
+
+async def python_path(db, program_id: int) -> bytes:
+    program = await get_program_details(db, program_id)
+    return JSONResponse(content=jsonable_encoder(create_api_response(data=program))).body
+
+
+async def pg_json_path(db, program_id: int) -> bytes:
+    return await get_program_details_json(db, program_id)
+
+
+async def measure(path, program_id: int):
+    async with AsyncSessionLocal() as db:
+        await path(db, program_id)  # warm up
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        for _ in range(REQUESTS):
+            await path(db, program_id)
+        cpu = time.process_time() - cpu_started
+        wall = time.perf_counter() - wall_started
+    return cpu / REQUESTS * 1e6, wall / REQUESTS * 1e6
+
+
+async def main():
+    if not is_postgres:
+        sys.exit("This benchmark needs a Postgres DATABASE_URL")
+    print(f"{REQUESTS} requests per cell; microseconds per request")
+    print(f"{'items':>6} {'python cpu':>11} {'pg_json cpu':>12} {'python wall':>12} {'pg_json wall':>13}")
+    for items in ITEM_COUNTS:
+        program_id = seed_program(items)
+        try:
+            py_cpu, py_wall = await measure(python_path, program_id)
+            pg_cpu, pg_wall = await measure(pg_json_path, program_id)
+        finally:
+            delete_program(program_id)
+        print(f"{items:>6} {py_cpu:>11.0f} {pg_cpu:>12.0f} {py_wall:>12.0f} {pg_wall:>13.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: database round trips per public GET, transactional session vs read session.
+
+  transactional - get_async_db: pool pre-ping, BEGIN, the SELECTs, ROLLBACK at close
+                  (previous behavior)
+  read          - get_read_db: autocommit read-only engine, just the SELECTs (and the ping)
+
+Round trips are counted at the asyncpg driver: simple queries (BEGIN/COMMIT/ROLLBACK),
+pings, PREPAREs that miss the statement cache and prepared statement executions. The
+program cache is cleared before every request so each one reaches the database.
+
+Postgres only (asyncpg). Usage (from the server directory):
+    DATABASE_URL=postgresql://... python benchmarks/bench_read_round_trips.py
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+import httpx
+from asyncpg.prepared_stmt import PreparedStatement
+from sqlalchemy.orm import Session
+
+from app.database.connection import Base, async_engine, async_read_engine, engine, get_async_db, get_read_db
+from app.main import app
+from app.models.database import Church, Program, ScheduleItem, SpecialGuest
+from app.programs.cache import program_cache
+
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", "200"))
+
+round_trips = 0
+
+
+def counted(method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        global round_trips
+        round_trips += 1
+        return await method(*args, **kwargs)
+    return wrapper
+
+
+for cls, name in (
+    (asyncpg.Connection, "execute"),
+    (asyncpg.Connection, "executemany"),
+    (asyncpg.Connection, "fetchrow"),
+    (asyncpg.Connection, "prepare"),
+    (PreparedStatement, "fetch"),
+):
+    setattr(cls, name, counted(getattr(cls, name)))
+
+
+def seed():
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        church = Church(name="Benchmark Church")
+        db.add(church)
+        db.flush()
+        program = Program(church_id=church.id, title="Round trips")
+        db.add(program)
+        db.flush()
+        db.add_all(ScheduleItem(program_id=program.id, title=f"Item {i}", order_index=i) for i in range(10))
+        db.add_all(SpecialGuest(program_id=program.id, name=f"Guest {i}", display_order=i) for i in range(2))
+        db.commit()
+        return church.id, program.id
+
+
+def cleanup(church_id: int, program_id: int):
+    with Session(engine) as db:
+        db.query(ScheduleItem).filter(ScheduleItem.program_id == program_id).delete()
+        db.query(SpecialGuest).filter(SpecialGuest.program_id == program_id).delete()
+        db.query(Program).filter(Program.id == program_id).delete()
+        db.flush()
+        db.query(Church).filter(Church.id == church_id).delete()
+        db.commit()
+
+
+async def measure(client, path: str):
+    global round_trips
+    await client.get(path)  # warm the connection and its statement cache
+    round_trips = 0
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        program_cache.clear()
+        response = await client.get(path)
+        assert response.status_code == 200 and response.json()["success"], response.text
+    elapsed = time.perf_counter() - started
+    return round_trips / REQUESTS, elapsed / REQUESTS * 1000
+
+
+async def main():
+    church_id, program_id = seed()
+    paths = [
+        "/api/v1/programs/?limit=20",
+        f"/api/v1/programs/{program_id}",
+        f"/api/v1/church/info?church_id={church_id}",
+    ]
+    print(f"{async_engine.dialect.name}, {REQUESTS} requests per endpoint")
+    print(f"{'endpoint':<36} {'session':>13} {'trips/req':>10} {'ms/req':>8}")
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for path in paths:
+                for name, dependency in (("transactional", get_async_db), ("read", get_read_db)):
+                    app.dependency_overrides[get_read_db] = dependency
+                    trips, ms = await measure(client, path)
+                    print(f"{path:<36} {name:>13} {trips:>10.1f} {ms:>8.2f}")
+    finally:
+        app.dependency_overrides.clear()
+        await async_engine.dispose()
+        await async_read_engine.dispose()
+        cleanup(church_id, program_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
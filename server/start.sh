@@ -2,11 +2,9 @@
 set -euo pipefail
 
 echo "🚀 Starting Church Program Pro FastAPI..."
-python - <<'PY'
-from app.database.migrations import create_tables
-create_tables()
-print('✅ Tables ensured')
-PY
+# The server no longer migrates or seeds at boot (MIGRATE_ON_STARTUP /
+# SEED_ON_STARTUP default to false), so do both before it starts
+python -m app.manage migrate
+python -m app.manage seed
 
 exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
-
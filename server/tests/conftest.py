@@ -0,0 +1,128 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before anything imports app.config
+_db_dir = tempfile.mkdtemp(prefix="program-pro-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("ENVIRONMENT", "test")
+# Fail tests whose requests send one statement shape more than this many times (N+1 loops)
+os.environ.setdefault("QUERY_REPEAT_THRESHOLD", "5")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database.connection import Base, engine, async_engine, async_read_engine, SessionLocal
+from app.models.database import Church, User, Program, ScheduleItem, SpecialGuest, ProgramTemplate  # noqa: F401
+from app.auth.jwt_handler import create_access_token
+from app.main import app
+from app.auth.cache import principal_cache, token_cache
+from app.programs.cache import program_cache
+from app.database.instrumentation import repeated_query_detector
+from app.database.schema_registry import schema_registry
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def loaded_schema_registry():
+    """Load the schema registry up front (the server does at startup) so statement counts do not include its catalog checks."""
+    if schema_registry.needs_check():
+        with engine.connect() as connection:
+            schema_registry.load(connection)
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    program_cache.clear()
+    principal_cache.clear()
+    token_cache.clear()
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@pytest.fixture(autouse=True)
+def no_repeated_queries(request):
+    """Fail the test if an API request repeated a statement shape (see QUERY_REPEAT_THRESHOLD)."""
+    seen = len(repeated_query_detector.violations)
+    yield
+    new = repeated_query_detector.violations[seen:]
+    if new and request.node.get_closest_marker("allow_repeated_queries") is None:
+        pytest.fail("Possible N+1 queries:\n" + "\n".join(
+            f"  {v.request}: {v.count}+ x {v.shape}" for v in new
+        ))
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def queries():
+    """SQL statements the API (async and read engines) sends while the test runs; call .clear() to reset."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for api_engine in (async_engine, async_read_engine):
+        event.listen(api_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    for api_engine in (async_engine, async_read_engine):
+        event.remove(api_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def church(db):
+    church = Church(name="Test Church")
+    db.add(church)
+    db.commit()
+    db.refresh(church)
+    return church
+
+
+@pytest.fixture
+def admin_user(db, church):
+    # Password hash is irrelevant here: tests authenticate with a minted token
+    user = User(username="admin", password_hash="x", role="admin", church_id=church.id)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(admin_user):
+    token = create_access_token({"sub": admin_user.username, "user_id": admin_user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def program(db, church, admin_user):
+    program = Program(church_id=church.id, title="Sunday Service", theme="Grace", created_by=admin_user.id)
+    db.add(program)
+    db.commit()
+    db.refresh(program)
+    for index, title in enumerate(["Opening Prayer", "Worship", "Sermon"]):
+        db.add(ScheduleItem(program_id=program.id, title=title, order_index=index, type="worship"))
+    for index, name in enumerate(["Pastor A", "Choir B"]):
+        db.add(SpecialGuest(program_id=program.id, name=name, display_order=index))
+    db.commit()
+    return program
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from app.auth import jwt_handler
+from app.auth.cache import principal_cache, token_cache
+from app.auth.jwt_handler import create_access_token, verify_access_token
+from app.models.database import Church
+
+
+def user_lookups(queries):
+    return [statement for statement in queries if "FROM users" in statement]
+
+
+def test_repeat_requests_skip_the_user_query(client, auth_headers, queries):
+    for _ in range(3):
+        assert client.get("/api/v1/templates/", headers=auth_headers).json()["success"]
+
+    assert len(user_lookups(queries)) == 1
+    assert principal_cache.stats()["hits"] == 2
+
+
+def test_user_change_invalidates_the_principal(client, auth_headers, admin_user, db):
+    assert client.get("/api/v1/church/settings", headers=auth_headers).json()["data"]["name"] == "Test Church"
+
+    other = Church(name="Other Church")
+    db.add(other)
+    db.flush()
+    admin_user.church_id = other.id
+    db.commit()
+
+    assert client.get("/api/v1/church/settings", headers=auth_headers).json()["data"]["name"] == "Other Church"
+
+    db.delete(admin_user)
+    db.commit()
+    assert client.get("/api/v1/church/settings", headers=auth_headers).status_code == 401
+
+
+def test_principal_cached_between_flush_and_commit_is_dropped(client, auth_headers, admin_user, db):
+    other = Church(name="Other Church")
+    db.add(other)
+    db.flush()
+    admin_user.church_id = other.id
+    db.flush()
+
+    # A request between flush and commit reads (and caches) the committed row
+    assert client.get("/api/v1/church/settings", headers=auth_headers).json()["data"]["name"] == "Test Church"
+    db.commit()
+
+    assert client.get("/api/v1/church/settings", headers=auth_headers).json()["data"]["name"] == "Other Church"
+
+
+def test_tokens_are_decoded_once_until_they_expire(monkeypatch):
+    decodes = []
+    decode = jwt_handler.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decodes.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_handler.jwt, "decode", counting_decode)
+    token = create_access_token({"sub": "admin", "user_id": 1})
+
+    assert verify_access_token(token)["user_id"] == 1
+    assert verify_access_token(token)["user_id"] == 1
+    assert len(decodes) == 1
+
+    expired = create_access_token({"sub": "admin", "user_id": 1}, expires_delta=timedelta(seconds=-1))
+    assert verify_access_token(expired) is None
+    assert verify_access_token("not-a-token") is None
+    assert token_cache.stats()["entries"] == 1
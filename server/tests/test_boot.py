@@ -0,0 +1,111 @@
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+SERVER_DIR = Path(__file__).parent.parent
+
+# How long a boot may take before the test gives up on it (not a performance budget)
+BOOT_TIMEOUT_SECONDS = 60.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot(database: Path, **env):
+    """Start uvicorn; returns (seconds to first byte of /health, its body, the process)."""
+    port = free_port()
+    process_env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "ENVIRONMENT": "test",
+        **env,
+    }
+    # Let the first boot write the bytecode cache for the next ones
+    process_env.pop("PYTHONDONTWRITEBYTECODE", None)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=SERVER_DIR, env=process_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = started + BOOT_TIMEOUT_SECONDS
+    while time.perf_counter() < deadline:
+        try:
+            response = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return time.perf_counter() - started, response.json(), process
+        except httpx.TransportError:
+            if process.poll() is not None:
+                pytest.fail(f"server exited with {process.returncode}")
+            time.sleep(0.02)
+    process.terminate()
+    pytest.fail("server did not answer /health")
+
+
+def stop(process) -> None:
+    process.terminate()
+    process.wait(timeout=10)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Boot a server on a fresh SQLite file; returns (seconds, /health body, database path)."""
+    processes = []
+
+    def start(**env):
+        database = tmp_path / f"boot-{len(processes)}.db"
+        seconds, health, process = boot(database, **env)
+        processes.append(process)
+        return seconds, health, database
+
+    yield start
+    for process in processes:
+        stop(process)
+
+
+def tables(database: Path) -> set:
+    with sqlite3.connect(database) as connection:
+        return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_boot_skips_migrations_and_seeding(server):
+    _, health, database = server()
+
+    assert health["startup"] == "ready"
+    # No alembic run and no admin user: those are `python -m app.manage migrate|seed`
+    assert not tables(database) & {"alembic_version", "users"}
+
+
+def test_boot_is_faster_than_migrating_and_seeding_at_startup(tmp_path):
+    at_startup = {"MIGRATE_ON_STARTUP": "true", "SEED_ON_STARTUP": "true"}
+
+    def best_of_two(label, **env):
+        seconds = []
+        for attempt in range(2):
+            database = tmp_path / f"{label}-{attempt}.db"
+            elapsed, _, process = boot(database, **env)
+            stop(process)
+            seconds.append(elapsed)
+        return min(seconds), database
+
+    # Untimed boot first, so neither side pays for an empty bytecode cache
+    stop(boot(tmp_path / "warm-up.db", **at_startup)[2])
+    migrating, migrated_database = best_of_two("migrating", **at_startup)
+    skipping, _ = best_of_two("skipping")
+
+    assert "users" in tables(migrated_database)
+    assert skipping < migrating, f"{skipping:.2f}s without migrations vs {migrating:.2f}s with"
+
+
+def test_background_startup_answers_while_warming(server):
+    _, health, _ = server(STARTUP_IN_BACKGROUND="true")
+
+    assert health["startup"] in ("warming", "ready")
@@ -0,0 +1,61 @@
+import pytest
+
+from app.etag import compute_etag, etag_matches
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ('"other"', False),
+    ("*", True),
+])
+def test_if_none_match_parsing(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+@pytest.mark.parametrize("path", ["/api/v1/programs/", "/api/v1/church/info"])
+def test_public_reads_revalidate_with_304(client, program, path):
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert etag == compute_etag(first.content)
+
+    second = client.get(path, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_program_detail_304_is_served_from_cache(client, program, queries):
+    etag = client.get(f"/api/v1/programs/{program.id}").headers["etag"]
+    queries.clear()
+
+    response = client.get(f"/api/v1/programs/{program.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert queries == []
+
+
+def test_child_edits_change_program_etag(client, program, auth_headers):
+    path = f"/api/v1/programs/{program.id}"
+    detail = client.get(path)
+    etag = detail.headers["etag"]
+    item_id = detail.json()["data"]["schedule_items"][0]["id"]
+
+    client.put(f"{path}/schedule/{item_id}", json={"order_index": 99}, headers=auth_headers)
+    response = client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["data"]["schedule_items"][-1]["id"] == item_id
+
+
+def test_program_list_etag_changes_after_update(client, program, auth_headers):
+    etag = client.get("/api/v1/programs/").headers["etag"]
+
+    client.put(f"/api/v1/programs/{program.id}", json={"title": "Renamed"}, headers=auth_headers)
+    response = client.get("/api/v1/programs/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["data"][0]["title"] == "Renamed"
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).parent.parent
+
+# Cumulative `import app.main` time as reported by -X importtime with a warm bytecode
+# cache (about 0.75 s here, most of it fastapi, pydantic and sqlalchemy), and the share
+# spent in our own modules. Compiling on an empty cache costs seconds more, so
+# import_times() imports once untimed first
+IMPORT_BUDGET_SECONDS = 1.5
+APP_MODULES_BUDGET_SECONDS = 0.3
+
+# Only needed by deploy tasks (python -m app.manage) or password hashing. (The bcrypt
+# extension itself still loads, under 1 ms, through jose's cryptography backend.)
+LAZY_MODULES = ("alembic", "mako", "passlib")
+
+
+def import_times(module: str) -> dict:
+    """{module: (self seconds, cumulative seconds)} for a fresh interpreter importing `module`."""
+    env = {**os.environ, "DATABASE_URL": "sqlite://", "ENVIRONMENT": "test"}
+    # Warm-up: write the bytecode cache (even where PYTHONDONTWRITEBYTECODE is set) so the
+    # timed run measures imports, not compilation
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=SERVER_DIR, capture_output=True, check=True, env=env)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR, capture_output=True, text=True, check=True, env=env,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+    return times
+
+
+def test_deploy_and_hashing_modules_load_lazily():
+    times = import_times("app.main")
+
+    loaded_lazy = sorted(name for name in times if name.split(".")[0] in LAZY_MODULES)
+    assert loaded_lazy == [], "imported at startup, should load on first use"
+
+
+def test_app_import_time_budget():
+    times = import_times("app.main")
+
+    total = times["app.main"][1]
+    assert total < IMPORT_BUDGET_SECONDS, f"import app.main took {total:.3f}s"
+
+    own = sum(self_seconds for name, (self_seconds, _) in times.items() if name == "app" or name.startswith("app."))
+    assert own < APP_MODULES_BUDGET_SECONDS, f"app modules took {own:.3f}s"
@@ -0,0 +1,81 @@
+import re
+
+from app.metrics import Registry
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+
+
+def scrape(client) -> dict:
+    """{(name, frozenset of label pairs): value} from GET /metrics."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line.startswith("#") or not line:
+            continue
+        name, labels, value = SAMPLE.match(line).groups()
+        pairs = frozenset(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', labels or ""))
+        samples[(name, pairs)] = float(value)
+    return samples
+
+
+def sample(samples, name, **labels) -> float:
+    return samples.get((name, frozenset(labels.items())), 0.0)
+
+
+def test_histogram_and_counter_exposition():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    errors = registry.counter("errors_total", "Errors.", ("reason",))
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+    errors.inc(reason='bad "quote"\n')
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.55',
+        'latency_seconds_count{route="/a"} 3',
+        "# HELP errors_total Errors.",
+        "# TYPE errors_total counter",
+        'errors_total{reason="bad \\"quote\\"\\n"} 1',
+    ]
+
+
+def test_scrape_reports_requests_by_route_template(client, program):
+    before = scrape(client)
+    for _ in range(3):
+        client.get(f"/api/v1/programs/{program.id}")
+    client.get("/api/v1/programs/999999")
+    after = scrape(client)
+
+    route = {"method": "GET", "route": "/api/v1/programs/{program_id}"}
+    assert sample(after, "http_requests_total", status="200", **route) - sample(before, "http_requests_total", status="200", **route) == 4
+    assert sample(after, "http_request_duration_seconds_count", **route) - sample(before, "http_request_duration_seconds_count", **route) == 4
+    assert sample(after, "http_request_duration_seconds_bucket", le="+Inf", **route) == sample(after, "http_request_duration_seconds_count", **route)
+    assert not any("999999" in dict(labels).get("route", "") for _, labels in after)
+
+    assert sample(after, "cache_hits_total", cache="program") - sample(before, "cache_hits_total", cache="program") == 2
+    assert ("db_pool_checked_out", frozenset({("engine", "read")})) in after
+    assert ("password_hash_queue_depth", frozenset()) in after
+
+
+def test_scrape_counts_bulk_rows(client, program, auth_headers):
+    before = scrape(client)
+    payload = {"mode": "replace", "schedule_items": [{"title": "One"}, {"title": "Two"}], "special_guests": []}
+    client.put(f"/api/v1/programs/{program.id}/bulk-update", json=payload, headers=auth_headers)
+    client.post("/api/v1/programs/bulk-import", json={"title": "Imported", "special_guests": [{"name": "A"}]}, headers=auth_headers)
+    after = scrape(client)
+
+    def delta(**labels):
+        return sample(after, "bulk_rows_total", **labels) - sample(before, "bulk_rows_total", **labels)
+
+    assert delta(operation="bulk_update", table="schedule_items", action="inserted") == 2
+    assert delta(operation="bulk_update", table="schedule_items", action="deleted") == 3
+    assert delta(operation="bulk_update", table="special_guests", action="deleted") == 2
+    assert delta(operation="bulk_import", table="special_guests", action="inserted") == 1
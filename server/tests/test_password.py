@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.auth.password import (
+    PasswordHashPool, PasswordHashPoolBusy,
+    hash_password, hash_password_async, verify_password_async,
+)
+
+
+def test_hash_and_verify_run_on_pool():
+    async def scenario():
+        hashed = await hash_password_async("s3cret")
+        return await verify_password_async("s3cret", hashed), await verify_password_async("wrong", hashed)
+
+    assert asyncio.run(scenario()) == (True, False)
+
+
+def test_pool_rejects_when_pending_limit_reached():
+    pool = PasswordHashPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["pending"] == 1
+        with pytest.raises(PasswordHashPoolBusy):
+            await pool.run(lambda: None)
+        release.set()
+        await blocked
+
+    asyncio.run(scenario())
+    stats = pool.stats()
+    assert stats["pending"] == 0
+    assert stats["completed"] == 1
+    assert stats["rejected"] == 1
+    assert stats["run_seconds_max"] > 0
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_worker_finishes():
+    pool = PasswordHashPool(max_workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: None))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        queued.cancel()
+        await asyncio.gather(running, queued, return_exceptions=True)
+        # The queued call never starts; the running one still occupies the worker
+        assert pool.stats()["pending"] == 1
+        release.set()
+        while pool.stats()["pending"]:
+            await asyncio.sleep(0.005)
+        await pool.run(lambda: None)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+    assert pool.stats()["completed"] == 2
+
+
+def test_login_verifies_password_off_loop(client, db, church):
+    from app.models.database import User
+
+    db.add(User(username="pastor", password_hash=hash_password("amen"), role="admin", church_id=church.id))
+    db.commit()
+
+    ok = client.post("/api/v1/auth/login", json={"username": "pastor", "password": "amen"})
+    bad = client.post("/api/v1/auth/login", json={"username": "pastor", "password": "nope"})
+
+    assert ok.status_code == 200 and ok.json()["accessToken"]
+    assert bad.status_code == 401
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database.connection import engine
+from app.database.pool import PoolStats, pool_options, pool_snapshot, warm_up
+
+
+def small_engine(stats, **overrides):
+    options = {**pool_options(stats, is_async=False), "pool_size": 1, "max_overflow": 0, "pool_timeout": 0.05, **overrides}
+    return create_engine(engine.url, **options)
+
+
+def test_checkouts_and_exhaustion_are_recorded():
+    stats = PoolStats()
+    pool_engine = small_engine(stats)
+    try:
+        with pool_engine.connect() as held:
+            held.execute(text("SELECT 1"))
+            assert pool_snapshot(pool_engine)["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                pool_engine.connect()
+
+        snapshot = pool_snapshot(pool_engine)
+        assert snapshot["checked_out"] == 0
+        assert snapshot["checkouts"] == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["wait_seconds_max"] >= 0.05
+    finally:
+        pool_engine.dispose()
+
+
+def test_warm_up_leaves_connections_open_in_the_pool(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    stats = PoolStats()
+    async_engine = create_async_engine(
+        str(engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1), **pool_options(stats, is_async=True)
+    )
+
+    async def run():
+        try:
+            warmed = await warm_up(async_engine, 5)  # capped at the pool size
+            return warmed, pool_snapshot(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    warmed, snapshot = asyncio.run(run())
+    assert warmed == 3
+    assert snapshot["checked_in"] == 3 and snapshot["checked_out"] == 0
+    assert snapshot["checkouts"] == 3
+
+
+def test_health_reports_pool(client):
+    pool = client.get("/health").json()["database_pool"]
+
+    assert {"size", "checked_out", "overflow", "checkouts", "timeouts", "wait_seconds_max"} <= set(pool)
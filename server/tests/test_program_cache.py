@@ -0,0 +1,90 @@
+from app.programs.cache import ResponseCache, program_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_counters():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    for key in (1, 2):
+        cache.set(key, b"body", cache.begin_load())
+    assert cache.get(1) == b"body"  # 1 is now most recently used
+    cache.set(3, b"body", cache.begin_load())
+
+    assert cache.get(2) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 1, 1, 2)
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=10, ttl_seconds=30, clock=clock)
+    cache.set(1, b"body", cache.begin_load())
+
+    clock.now = 29
+    assert cache.get(1) == b"body"
+    clock.now = 30
+    assert cache.get(1) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_load_started_before_invalidation_is_not_stored():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    token = cache.begin_load()
+    cache.invalidate(1)
+
+    assert cache.set(1, b"stale", token) is False
+    assert cache.get(1) is None
+
+
+def test_program_detail_is_served_from_cache(client, program, queries):
+    first = client.get(f"/api/v1/programs/{program.id}")
+    queries.clear()
+    hits = program_cache.stats()["hits"]
+    second = client.get(f"/api/v1/programs/{program.id}")
+
+    assert second.content == first.content
+    assert queries == []
+    assert program_cache.stats()["hits"] == hits + 1
+
+
+def test_writes_invalidate_cached_program(client, program, auth_headers):
+    item_ids = [i["id"] for i in client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"]]
+
+    client.put(f"/api/v1/programs/{program.id}", json={"title": "Renamed"}, headers=auth_headers)
+    assert client.get(f"/api/v1/programs/{program.id}").json()["data"]["title"] == "Renamed"
+
+    client.post(f"/api/v1/programs/{program.id}/guests", json={"name": "New Guest"}, headers=auth_headers)
+    assert len(client.get(f"/api/v1/programs/{program.id}").json()["data"]["special_guests"]) == 3
+
+    client.delete(f"/api/v1/programs/{program.id}/schedule/{item_ids[0]}", headers=auth_headers)
+    assert len(client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"]) == 2
+
+    client.put(
+        f"/api/v1/programs/{program.id}/bulk-update",
+        json={"title": "Bulk", "schedule_items": [{"title": "Solo"}], "special_guests": []},
+        headers=auth_headers,
+    )
+    data = client.get(f"/api/v1/programs/{program.id}").json()["data"]
+    assert data["title"] == "Bulk" and [i["title"] for i in data["schedule_items"]] == ["Solo"]
+
+    client.delete(f"/api/v1/programs/{program.id}", headers=auth_headers)
+    assert client.get(f"/api/v1/programs/{program.id}").json()["error"] == "Program not found"
+
+
+def test_entry_ttl_can_only_be_shortened():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=10, ttl_seconds=30, clock=clock)
+    cache.set(1, b"short", cache.begin_load(), ttl_seconds=5)
+    cache.set(2, b"capped", cache.begin_load(), ttl_seconds=300)
+    assert not cache.set(3, b"expired", cache.begin_load(), ttl_seconds=-1)
+
+    clock.now = 5
+    assert cache.get(1) is None and cache.get(2) == b"capped"
+    clock.now = 30
+    assert cache.get(2) is None
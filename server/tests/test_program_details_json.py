@@ -0,0 +1,107 @@
+"""
+The Postgres-rendered program details (PROGRAM_DETAILS_JSON_AGG) must match the
+Python path: same keys in the same order, same child ordering, same values and
+the same timestamp format. Postgres only: set TEST_POSTGRES_URL as for
+test_query_plans. The suite works in its own schema and drops it afterwards.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database.connection import Base
+from app.etag import TaggedBody
+from app.models.database import Church, Program, ScheduleItem, SpecialGuest
+from app.models.schemas import create_api_response
+from app.programs.repository import (
+    PROGRAM_DETAILS_JSON_SQL, PROGRAM_DETAILS_JSON_SQL_UNRANKED, build_program_details, program_details_statement,
+)
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+
+SCHEMA = "program_details_json_checks"
+
+
+@pytest.fixture(scope="module")
+def pg():
+    admin = create_engine(POSTGRES_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    Base.metadata.create_all(engine)
+    yield engine
+
+    engine.dispose()
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    admin.dispose()
+
+
+@pytest.fixture(scope="module")
+def program_id(pg):
+    with Session(pg) as db:
+        church = Church(name="Parity Church")
+        db.add(church)
+        db.flush()
+        program = Program(
+            church_id=church.id, title="Parity", theme=None,
+            # Not UTC and with microseconds: both paths must print the same instant the same way
+            date=datetime(2025, 3, 9, 10, 30, 0, 120000, tzinfo=timezone(timedelta(hours=2))),
+        )
+        db.add(program)
+        db.flush()
+        db.add_all([
+            ScheduleItem(program_id=program.id, title="Second", order_index=1, rank="n", start_time="10:00"),
+            ScheduleItem(program_id=program.id, title="First", order_index=1, rank="g", type=None),
+            ScheduleItem(program_id=program.id, title="Unranked", order_index=1, rank=None, description="Tied, no rank"),
+            ScheduleItem(program_id=program.id, title="Opening", order_index=0, duration_minutes=5,
+                         created_at=datetime(2025, 3, 1, 8, 0, tzinfo=timezone.utc)),
+            SpecialGuest(program_id=program.id, name="Guest B", display_order=0, rank="t", bio="Bio"),
+            SpecialGuest(program_id=program.id, name="Guest A", display_order=0, rank="c", role="Speaker"),
+        ])
+        db.commit()
+        return program.id
+
+
+def python_body(pg, program_id: int) -> bytes:
+    # asyncpg hands the API UTC datetimes; pin the session so psycopg2 does the same
+    with pg.connect() as conn:
+        conn.execute(text("SET TIME ZONE 'UTC'"))
+        program = build_program_details(conn.execute(program_details_statement(program_id)).all())
+    return TaggedBody.from_content(create_api_response(data=program)).body
+
+
+def postgres_body(pg, statement, program_id: int) -> bytes:
+    with pg.connect() as conn:
+        # The rendered timestamps must not depend on the session time zone
+        conn.execute(text("SET TIME ZONE 'America/New_York'"))
+        return conn.execute(statement, {"program_id": program_id}).scalar().encode()
+
+
+def canonical(body: bytes) -> str:
+    """Same JSON with whitespace normalised; key order is kept."""
+    return json.dumps(json.loads(body))
+
+
+def test_postgres_rendered_details_match_the_python_path(pg, program_id):
+    expected = python_body(pg, program_id)
+    rendered = postgres_body(pg, PROGRAM_DETAILS_JSON_SQL, program_id)
+
+    assert canonical(rendered) == canonical(expected)
+    data = json.loads(rendered)["data"]
+    assert [item["title"] for item in data["schedule_items"]] == ["Opening", "Unranked", "First", "Second"]
+    assert [guest["name"] for guest in data["special_guests"]] == ["Guest A", "Guest B"]
+    assert data["date"] == "2025-03-09T08:30:00.120000Z"
+
+
+def test_unranked_variant_orders_by_position_and_id(pg, program_id):
+    data = json.loads(postgres_body(pg, PROGRAM_DETAILS_JSON_SQL_UNRANKED, program_id))["data"]
+
+    assert [item["title"] for item in data["schedule_items"]] == ["Opening", "Second", "First", "Unranked"]
+    assert [guest["name"] for guest in data["special_guests"]] == ["Guest B", "Guest A"]
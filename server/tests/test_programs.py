@@ -0,0 +1,438 @@
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.database.connection import engine
+from app.database.schema_registry import schema_registry
+from app.models.database import Program, ScheduleItem, SpecialGuest
+
+
+def test_get_program_by_id_returns_ordered_details(client, program):
+    response = client.get(f"/api/v1/programs/{program.id}")
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["success"] is True
+    assert [item["title"] for item in body["data"]["schedule_items"]] == ["Opening Prayer", "Worship", "Sermon"]
+    assert [guest["name"] for guest in body["data"]["special_guests"]] == ["Pastor A", "Choir B"]
+
+
+def test_get_program_by_id_is_a_single_query(client, program, db, queries):
+    for index in range(20):
+        db.add(ScheduleItem(program_id=program.id, title=f"Extra {index}", order_index=10 + index))
+        db.add(SpecialGuest(program_id=program.id, name=f"Guest {index}", display_order=10 + index))
+    db.commit()
+
+    body = client.get(f"/api/v1/programs/{program.id}").json()
+
+    assert len(body["data"]["schedule_items"]) == 23
+    assert len(body["data"]["special_guests"]) == 22
+    assert len(queries) == 1, queries
+
+
+def test_get_program_by_id_without_children(client, church, db):
+    from app.models.database import Program
+
+    empty = Program(church_id=church.id, title="Empty")
+    db.add(empty)
+    db.commit()
+
+    body = client.get(f"/api/v1/programs/{empty.id}").json()
+    assert body["data"]["title"] == "Empty"
+    assert body["data"]["schedule_items"] == [] and body["data"]["special_guests"] == []
+
+
+def test_get_program_by_id_missing(client):
+    body = client.get("/api/v1/programs/9999").json()
+    assert body == {"success": False, "data": None, "error": "Program not found", "message": None}
+
+
+def test_get_programs_lists_programs(client, program):
+    body = client.get("/api/v1/programs/", params={"church_id": program.church_id}).json()
+    assert [p["id"] for p in body["data"]] == [program.id]
+
+
+def seed_weekly_programs(db, church, weeks, start=datetime(2024, 1, 7, 10, 0)):
+    programs = [Program(church_id=church.id, title=f"Week {week}", date=start + timedelta(weeks=week)) for week in range(weeks)]
+    programs.append(Program(church_id=church.id, title="Undated"))
+    db.add_all(programs)
+    db.commit()
+    return programs
+
+
+def test_get_programs_pages_with_keyset_cursor(client, db, church):
+    seed_weekly_programs(db, church, weeks=7)
+    # Two programs on the same date exercise the id tie-breaker
+    db.add(Program(church_id=church.id, title="Week 3 evening", date=datetime(2024, 1, 7, 10, 0) + timedelta(weeks=3)))
+    db.commit()
+
+    titles, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/v1/programs/", params=params).json()
+        titles += [p["title"] for p in body["data"]]
+        cursor = body["meta"]["next_cursor"]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert titles == [
+        "Week 6", "Week 5", "Week 4", "Week 3 evening", "Week 3", "Week 2", "Week 1", "Week 0", "Undated",
+    ]
+
+
+def test_get_programs_filters_by_date_range_and_caps_page_size(client, db, church):
+    seed_weekly_programs(db, church, weeks=5)
+
+    body = client.get("/api/v1/programs/", params={"from": "2024-01-14", "to": "2024-01-28"}).json()
+    assert [p["title"] for p in body["data"]] == ["Week 2", "Week 1"]
+
+    body = client.get("/api/v1/programs/", params={"limit": 10_000}).json()
+    assert body["meta"]["limit"] == 100
+
+
+def test_get_programs_without_limit_is_bounded(client, db, church, monkeypatch):
+    monkeypatch.setattr(settings, "PROGRAM_LIST_DEFAULT_LIMIT", 2)
+    seed_weekly_programs(db, church, weeks=4)
+
+    first = client.get("/api/v1/programs/").json()
+    assert [p["title"] for p in first["data"]] == ["Week 3", "Week 2"]
+    assert first["meta"]["limit"] == 2 and first["meta"]["next_cursor"]
+
+    # What the client's "Load more" sends: the cursor alone, same page size
+    rest = client.get("/api/v1/programs/", params={"cursor": first["meta"]["next_cursor"]}).json()
+    assert [p["title"] for p in rest["data"]] == ["Week 1", "Week 0"]
+
+
+def test_get_programs_upcoming_only(client, db, church):
+    seed_weekly_programs(db, church, weeks=2, start=datetime.utcnow() - timedelta(days=3))
+
+    body = client.get("/api/v1/programs/", params={"upcoming": "true"}).json()
+    assert [p["title"] for p in body["data"]] == ["Week 1"]
+
+
+def test_get_programs_rejects_malformed_cursor(client, program):
+    body = client.get("/api/v1/programs/", params={"cursor": "not-a-cursor"}).json()
+    assert body["success"] is False and body["error"] == "Invalid cursor"
+
+
+def test_add_update_and_delete_schedule_item(client, program, auth_headers):
+    created = client.post(
+        f"/api/v1/programs/{program.id}/schedule",
+        json={"title": "Offering", "start_time": "10:30:00", "order_index": 3},
+        headers=auth_headers,
+    ).json()
+    assert created["success"] is True
+    item_id = created["data"]["id"]
+    assert created["data"]["start_time"] == "10:30"
+
+    updated = client.put(
+        f"/api/v1/programs/{program.id}/schedule/{item_id}",
+        json={"title": "Tithes & Offering"},
+        headers=auth_headers,
+    ).json()
+    assert updated["data"]["title"] == "Tithes & Offering"
+
+    deleted = client.delete(f"/api/v1/programs/{program.id}/schedule/{item_id}", headers=auth_headers).json()
+    assert deleted["success"] is True
+
+
+def write_requests(program, item_id, guest_id):
+    base = f"/api/v1/programs/{program.id}"
+    return {
+        # name: (method, path, body, statements sent: existence check + the write; the user is cached)
+        "create program": ("post", "/api/v1/programs/", {"title": "Evening Service"}, 2),
+        "update program": ("put", base, {"theme": "Hope"}, 1),
+        "add schedule item": ("post", f"{base}/schedule", {"title": "Offering", "order_index": 3}, 2),
+        "update schedule item": ("put", f"{base}/schedule/{item_id}", {"title": "Praise", "start_time": "10:05:00"}, 1),
+        "add special guest": ("post", f"{base}/guests", {"name": "Usher C", "display_order": 2}, 2),
+        "update special guest": ("put", f"{base}/guests/{guest_id}", {"role": "Preacher"}, 1),
+        "update church settings": ("put", "/api/v1/church/settings", {"short_name": "TC"}, 1),
+    }
+
+
+def test_writes_build_responses_from_returning(client, program, auth_headers, queries, db):
+    item_id = db.query(ScheduleItem.id).filter(ScheduleItem.program_id == program.id).first()[0]
+    guest_id = db.query(SpecialGuest.id).filter(SpecialGuest.program_id == program.id).first()[0]
+    with engine.connect() as connection:
+        schema_registry.load(connection)
+    assert client.get("/api/v1/templates/", headers=auth_headers).json()["success"]  # caches the principal
+
+    for name, (method, path, payload, statements) in write_requests(program, item_id, guest_id).items():
+        queries.clear()
+        body = getattr(client, method)(path, json=payload, headers=auth_headers).json()
+
+        assert body["success"] is True, (name, body)
+        assert body["data"]["id"] and body["data"]["created_at"], name
+        assert len(queries) == statements, (name, queries)
+        assert not any(statement.lstrip().upper().startswith("SELECT") for statement in queries[statements - 1:]), name
+
+    assert db.get(ScheduleItem, item_id).start_time == "10:05"
+    assert client.get(f"/api/v1/programs/{program.id}").json()["data"]["theme"] == "Hope"
+
+
+def test_update_child_of_another_program_is_not_found(client, program, auth_headers, db, church):
+    other = Program(church_id=church.id, title="Other")
+    db.add(other)
+    db.commit()
+    item_id = db.query(ScheduleItem.id).filter(ScheduleItem.program_id == program.id).first()[0]
+
+    body = client.put(f"/api/v1/programs/{other.id}/schedule/{item_id}", json={"title": "Hijack"}, headers=auth_headers).json()
+
+    assert body["error"] == "Schedule item not found"
+    db.expire_all()
+    assert db.get(ScheduleItem, item_id).title == "Opening Prayer"
+
+
+def test_add_special_guest(client, program, auth_headers):
+    created = client.post(
+        f"/api/v1/programs/{program.id}/guests",
+        json={"name": "Guest Speaker", "role": "Speaker", "display_order": 5},
+        headers=auth_headers,
+    ).json()
+    assert created["success"] is True
+    assert created["data"]["display_order"] == 5
+
+
+def test_bulk_import_and_update(client, church, auth_headers):
+    payload = {
+        "title": "Conference",
+        "date": "2025-12-25",
+        "schedule_items": [{"title": f"Session {i}", "order_index": i} for i in range(3)],
+        "special_guests": [{"name": "Keynote", "display_order": 0}],
+    }
+    imported = client.post("/api/v1/programs/bulk-import", json=payload, headers=auth_headers).json()
+    assert imported["success"] is True, imported
+    program_id = imported["data"]["id"]
+    assert len(imported["data"]["schedule_items"]) == 3
+
+    payload["title"] = "Conference (updated)"
+    payload["schedule_items"] = [{"title": "Only Session", "order_index": 0}]
+    updated = client.put(f"/api/v1/programs/{program_id}/bulk-update", json=payload, headers=auth_headers).json()
+    assert updated["success"] is True, updated
+    assert updated["data"]["title"] == "Conference (updated)"
+    assert [item["title"] for item in updated["data"]["schedule_items"]] == ["Only Session"]
+
+
+def test_reorder_schedule_items_in_constant_round_trips(client, program, auth_headers, queries, db, church):
+    other = Program(church_id=church.id, title="Other")
+    db.add(other)
+    db.flush()
+    foreign = ScheduleItem(program_id=other.id, title="Not yours", order_index=0)
+    db.add(foreign)
+    db.commit()
+    items = client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"]
+    reversed_order = [{"id": item["id"], "order_index": index} for index, item in enumerate(reversed(items))]
+    with engine.connect() as connection:
+        schema_registry.load(connection)
+    queries.clear()
+
+    body = client.put(
+        f"/api/v1/programs/{program.id}/schedule/reorder",
+        json={"items": reversed_order + [{"id": foreign.id, "order_index": 99}]},
+        headers=auth_headers,
+    ).json()
+
+    assert body["success"] is True, body
+    assert [item["title"] for item in body["data"]] == ["Sermon", "Worship", "Opening Prayer"]
+    # current user, program check, UPDATE, ordered list - whatever the payload size
+    assert len(queries) == 4
+    db.refresh(foreign)
+    assert foreign.order_index == 0
+
+
+def test_program_details_before_the_rank_migration(client, program, queries, monkeypatch):
+    from app.programs.repository import PROGRAM_DETAILS_JSON_SQL_UNRANKED
+
+    monkeypatch.setattr(schema_registry, "_columns", {table: cols - {"rank"} for table, cols in schema_registry._columns.items()})
+    body = client.get(f"/api/v1/programs/{program.id}").json()
+
+    assert [item["title"] for item in body["data"]["schedule_items"]] == ["Opening Prayer", "Worship", "Sermon"]
+    assert len(queries) == 1 and "rank" not in queries[0]
+    assert "rank" not in str(PROGRAM_DETAILS_JSON_SQL_UNRANKED)
+
+
+def test_postgres_reorder_statement_orders_by_rank(program):
+    from sqlalchemy.dialects import postgresql
+    from app.programs.router import reorder_statement
+
+    table = ScheduleItem.__table__
+    existing_columns = {col.name for col in table.columns}
+    statement = reorder_statement(table, list(table.columns), program.id, {1: 0, 2: 1}, "order_index", existing_columns)
+    sql = str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+
+    assert sql.endswith("ORDER BY reordered.order_index, reordered.rank NULLS FIRST, reordered.id")
+
+
+def test_reorder_special_guests(client, program, auth_headers):
+    guests = client.get(f"/api/v1/programs/{program.id}").json()["data"]["special_guests"]
+    body = client.put(
+        f"/api/v1/programs/{program.id}/guests/reorder",
+        json={"guests": [{"id": guests[1]["id"], "display_order": 0}, {"id": guests[0]["id"], "display_order": 1}]},
+        headers=auth_headers,
+    ).json()
+
+    assert [guest["name"] for guest in body["data"]] == ["Choir B", "Pastor A"]
+    assert [guest["name"] for guest in client.get(f"/api/v1/programs/{program.id}").json()["data"]["special_guests"]] == ["Choir B", "Pastor A"]
+
+
+def schedule_titles(client, program):
+    return [item["title"] for item in client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"]]
+
+
+def test_move_schedule_item_writes_one_row(client, program, auth_headers, queries):
+    items = client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"]
+    opening, worship, sermon = (item["id"] for item in items)
+    queries.clear()
+
+    body = client.post(
+        f"/api/v1/programs/{program.id}/schedule/{sermon}/move", json={"after_id": opening}, headers=auth_headers,
+    ).json()
+
+    assert body["success"] is True, body
+    assert body["data"]["id"] == sermon
+    updates = [statement for statement in queries if statement.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1  # only the moved row, however long the list
+    assert schedule_titles(client, program) == ["Opening Prayer", "Sermon", "Worship"]
+
+    client.post(f"/api/v1/programs/{program.id}/schedule/{worship}/move", json={"before_id": opening}, headers=auth_headers)
+    assert schedule_titles(client, program) == ["Worship", "Opening Prayer", "Sermon"]
+
+
+def test_move_between_tied_rows_rebalances_first(client, program, auth_headers, db):
+    db.query(ScheduleItem).filter(ScheduleItem.program_id == program.id).update({ScheduleItem.order_index: 0})
+    db.commit()
+    opening, worship, sermon = (item["id"] for item in client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"])
+
+    body = client.post(
+        f"/api/v1/programs/{program.id}/schedule/{sermon}/move",
+        json={"after_id": opening, "before_id": worship},
+        headers=auth_headers,
+    ).json()
+
+    assert body["success"] is True, body
+    assert schedule_titles(client, program) == ["Opening Prayer", "Sermon", "Worship"]
+
+
+def test_long_rank_is_rebalanced_in_the_background(client, program, auth_headers, db, monkeypatch):
+    monkeypatch.setattr("app.programs.router.REBALANCE_LENGTH", 0)
+    opening, worship, sermon = (item["id"] for item in client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"])
+    client.post(f"/api/v1/programs/{program.id}/schedule/{sermon}/move", json={"after_id": opening}, headers=auth_headers)
+    client.post(f"/api/v1/programs/{program.id}/schedule/{worship}/move", json={"after_id": opening}, headers=auth_headers)
+
+    ranks = [item.rank for item in db.query(ScheduleItem).filter(ScheduleItem.program_id == program.id)]
+    assert len({len(rank) for rank in ranks}) == 1  # respaced: fixed-width keys on every row
+    assert schedule_titles(client, program) == ["Opening Prayer", "Worship", "Sermon"]
+
+
+def test_background_rebalance_invalidates_the_cached_program(client, program, db):
+    import asyncio
+    from app.programs.cache import program_cache
+    from app.programs.router import rebalance_child_ranks
+
+    db.add(ScheduleItem(program_id=program.id, title="Unplaced", order_index=None))
+    db.commit()
+    client.get(f"/api/v1/programs/{program.id}")
+    assert program_cache.get(program.id) is not None
+
+    asyncio.run(rebalance_child_ranks(ScheduleItem, program.id, "order_index"))
+
+    # The NULL position was filled in; the cached body may show it differently
+    assert program_cache.get(program.id) is None
+    db.expire_all()
+    assert None not in [item.order_index for item in db.query(ScheduleItem).filter(ScheduleItem.program_id == program.id)]
+
+
+def test_move_rejects_bad_anchors(client, program, auth_headers):
+    items = client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"]
+    path = f"/api/v1/programs/{program.id}/schedule/{items[0]['id']}/move"
+
+    assert client.post(path, json={}, headers=auth_headers).json()["error"] == "Either before_id or after_id is required"
+    assert client.post(path, json={"after_id": 999999}, headers=auth_headers).json()["success"] is False
+    assert client.post(path, json={"after_id": items[1]["id"], "before_id": items[1]["id"]}, headers=auth_headers).json()["success"] is False
+    missing = client.post(f"/api/v1/programs/{program.id}/schedule/999999/move", json={"after_id": items[0]["id"]}, headers=auth_headers)
+    assert missing.json()["error"] == "Schedule item not found"
+
+
+def test_move_special_guest(client, program, auth_headers):
+    guests = client.get(f"/api/v1/programs/{program.id}").json()["data"]["special_guests"]
+    body = client.post(
+        f"/api/v1/programs/{program.id}/guests/{guests[1]['id']}/move", json={"before_id": guests[0]["id"]}, headers=auth_headers,
+    ).json()
+
+    assert body["success"] is True, body
+    assert [guest["name"] for guest in client.get(f"/api/v1/programs/{program.id}").json()["data"]["special_guests"]] == ["Choir B", "Pastor A"]
+
+
+def test_bulk_update_reconciles_instead_of_rewriting(client, program, auth_headers):
+    path = f"/api/v1/programs/{program.id}"
+    before = client.get(path).json()["data"]
+    payload = {
+        "title": before["title"],
+        "schedule_items": [{"title": i["title"], "order_index": i["order_index"]} for i in before["schedule_items"]],
+        "special_guests": [{"name": g["name"], "display_order": g["display_order"]} for g in before["special_guests"]],
+    }
+
+    unchanged = client.put(f"{path}/bulk-update", json=payload, headers=auth_headers).json()
+    assert unchanged["meta"]["changes"]["changed"] is False
+    assert unchanged["meta"]["changes"]["schedule_items"]["unchanged"] == 3
+    assert {i["id"] for i in unchanged["data"]["schedule_items"]} == {i["id"] for i in before["schedule_items"]}
+
+    payload["schedule_items"][1]["title"] = "Praise"
+    del payload["schedule_items"][2]
+    payload["special_guests"].append({"name": "Usher C", "display_order": 2})
+    changed = client.put(f"{path}/bulk-update", json=payload, headers=auth_headers).json()["meta"]["changes"]
+    assert changed["schedule_items"] == {"inserted": 0, "updated": 1, "deleted": 1, "unchanged": 1}
+    assert changed["special_guests"] == {"inserted": 1, "updated": 0, "deleted": 0, "unchanged": 2}
+
+    after = client.get(path).json()["data"]
+    assert [i["title"] for i in after["schedule_items"]] == ["Opening Prayer", "Praise"]
+    assert after["schedule_items"][1]["id"] == before["schedule_items"][1]["id"]
+
+
+def test_bulk_update_replace_mode_rewrites_rows(client, program, auth_headers):
+    payload = {"mode": "replace", "schedule_items": [{"title": "Only"}], "special_guests": []}
+    changes = client.put(f"/api/v1/programs/{program.id}/bulk-update", json=payload, headers=auth_headers).json()["meta"]["changes"]
+
+    assert changes["schedule_items"] == {"inserted": 1, "updated": 0, "deleted": 3, "unchanged": 0}
+    assert changes["special_guests"]["deleted"] == 2
+
+
+def test_bulk_import_batches_inserts(client, church, auth_headers, queries):
+    payload = {
+        "title": "Conference",
+        "schedule_items": [{"title": f"Session {i}", "order_index": i, "description": "x" if i % 2 else None} for i in range(60)],
+        "special_guests": [{"name": f"Speaker {i}", "display_order": i} for i in range(12)],
+    }
+    imported = client.post("/api/v1/programs/bulk-import", json=payload, headers=auth_headers).json()
+
+    assert imported["success"] is True, imported
+    assert len(imported["data"]["schedule_items"]) == 60
+    inserts = [q for q in queries if q.startswith("INSERT INTO schedule_items") or q.startswith("INSERT INTO special_guests")]
+    assert len(inserts) == 2
+
+
+def test_bulk_import_skips_rows_that_fail(client, church, auth_headers):
+    payload = {
+        "title": "Conference",
+        "schedule_items": [{"title": "Opening"}, {"title": None}, {"title": "Closing", "order_index": 2}],
+        "special_guests": [{"name": "Keynote"}],
+    }
+    imported = client.post("/api/v1/programs/bulk-import", json=payload, headers=auth_headers).json()
+
+    assert imported["success"] is True, imported
+    assert sorted(item["title"] for item in imported["data"]["schedule_items"]) == ["Closing", "Opening"]
+    assert [guest["name"] for guest in imported["data"]["special_guests"]] == ["Keynote"]
+
+
+def test_mutations_require_authentication(client, program):
+    response = client.delete(f"/api/v1/programs/{program.id}")
+    assert response.status_code == 401
+
+
+def test_json_aggregation_flag_falls_back_to_python_path_on_sqlite(client, program, monkeypatch):
+    monkeypatch.setattr(settings, "PROGRAM_DETAILS_JSON_AGG", True)
+    body = client.get(f"/api/v1/programs/{program.id}").json()
+
+    assert body["success"] is True
+    assert len(body["data"]["schedule_items"]) == 3
@@ -0,0 +1,151 @@
+"""
+Query-plan regression suite for the hot read paths.
+
+Seeds a Postgres schema at realistic scale, ANALYZEs it and fails if
+EXPLAIN shows a sequential scan on any hot table. Postgres only: set
+TEST_POSTGRES_URL (e.g. postgresql+psycopg2://user@host/db) to run it.
+The suite works in its own schema and drops it afterwards.
+"""
+import importlib.util
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, select, text
+
+from app.database.connection import Base
+from app.models.database import ProgramTemplate
+from app.programs.pagination import program_list_statement
+from app.programs.repository import PROGRAM_DETAILS_JSON_SQL, program_details_statement
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+
+SCHEMA = "query_plan_checks"
+HOT_TABLES = {"programs", "schedule_items", "special_guests", "program_templates"}
+
+CHURCHES = 50
+PROGRAMS_PER_CHURCH = 400
+ITEMS_PER_PROGRAM = 10
+GUESTS_PER_PROGRAM = 2
+TEMPLATES_PER_CHURCH = 100
+
+SEED_SQL = [
+    f"INSERT INTO churches (id, name) SELECT c, 'Church ' || c FROM generate_series(1, {CHURCHES}) c",
+    f"""
+    INSERT INTO programs (id, church_id, title, date, is_active)
+    SELECT p, 1 + (p - 1) % {CHURCHES}, 'Program ' || p,
+           CASE WHEN p % 100 = 0 THEN NULL ELSE timestamptz '2015-01-04' + (p / {CHURCHES}) * interval '1 week' END,
+           p % 10 <> 0
+    FROM generate_series(1, {CHURCHES * PROGRAMS_PER_CHURCH}) p
+    """,
+    f"""
+    INSERT INTO schedule_items (program_id, title, order_index, type)
+    SELECT p, 'Item ' || i, i, 'worship'
+    FROM generate_series(1, {CHURCHES * PROGRAMS_PER_CHURCH}) p, generate_series(1, {ITEMS_PER_PROGRAM}) i
+    """,
+    f"""
+    INSERT INTO special_guests (program_id, name, display_order)
+    SELECT p, 'Guest ' || g, g
+    FROM generate_series(1, {CHURCHES * PROGRAMS_PER_CHURCH}) p, generate_series(1, {GUESTS_PER_PROGRAM}) g
+    """,
+    f"""
+    INSERT INTO program_templates (church_id, name, content)
+    SELECT 1 + t % {CHURCHES}, 'Template ' || t, repeat('x', 200)
+    FROM generate_series(1, {CHURCHES * TEMPLATES_PER_CHURCH}) t
+    """,
+    "ANALYZE",
+]
+
+
+@pytest.fixture(scope="module")
+def pg():
+    admin = create_engine(POSTGRES_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for statement in SEED_SQL:
+            conn.execute(text(statement))
+    yield engine
+
+    engine.dispose()
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    admin.dispose()
+
+
+def seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+def explain(engine, statement, params=None) -> dict:
+    with engine.connect() as conn:
+        compiled = statement.compile(dialect=conn.dialect)
+        sql = f"EXPLAIN (FORMAT JSON) {compiled}"
+        return conn.exec_driver_sql(sql, params or compiled.params).scalar()[0]["Plan"]
+
+
+HOT_PATHS = {
+    "program list": lambda: program_list_statement(),
+    "active program list (home page)": lambda: program_list_statement(is_active=True),
+    "church program list": lambda: program_list_statement(church_id=7),
+    "program list, later page": lambda: program_list_statement(cursor=(datetime(2018, 6, 3, tzinfo=timezone.utc), 8000)),
+    "program list, date range": lambda: program_list_statement(
+        date_from=datetime(2019, 1, 1, tzinfo=timezone.utc), date_to=datetime(2019, 3, 1, tzinfo=timezone.utc),
+    ),
+    "upcoming programs": lambda: program_list_statement(upcoming=True),
+    "program details": lambda: program_details_statement(4242),
+    "church templates": lambda: select(ProgramTemplate)
+        .where(ProgramTemplate.church_id == 7)
+        .order_by(ProgramTemplate.created_at.desc()),
+}
+
+
+@pytest.mark.parametrize("name", list(HOT_PATHS))
+def test_hot_path_uses_indexes(pg, name):
+    plan = explain(pg, HOT_PATHS[name]())
+    assert list(seq_scans(plan)) == [], f"{name} falls back to a sequential scan: {plan}"
+
+
+def test_postgres_rendered_program_details_uses_indexes(pg):
+    plan = explain(pg, PROGRAM_DETAILS_JSON_SQL, {"program_id": 4242})
+    assert list(seq_scans(plan)) == [], plan
+
+
+NEW_INDEXES = {
+    "ix_programs_church_id_date_id",
+    "ix_programs_date_id",
+    "ix_schedule_items_program_id_order",
+    "ix_special_guests_program_id_order",
+    "ix_program_templates_church_id_created_at",
+}
+MIGRATION_PATH = Path(__file__).parent.parent / "alembic" / "versions" / "008_add_hot_path_indexes.py"
+
+
+def test_migration_008_matches_models_and_round_trips(pg):
+    spec = importlib.util.spec_from_file_location("migration_008", MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    with pg.begin() as conn:
+        assert NEW_INDEXES <= indexes(conn)  # declared on the models as well
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.downgrade()
+            assert not NEW_INDEXES & indexes(conn)
+            migration.upgrade()
+        assert NEW_INDEXES <= indexes(conn)
+
+
+def indexes(conn) -> set:
+    inspector = inspect(conn)
+    return {index["name"] for table in HOT_TABLES for index in inspector.get_indexes(table)}
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from app.programs.ranking import RankedRow, place_between, rank_between, rebalance_positions, spread_ranks
+
+
+def test_rank_between_stays_strictly_between():
+    assert rank_between(None, None) == "i"
+    assert "a" < rank_between("a", "b") < "b"
+    assert rank_between(None, "a") < "a"
+    assert rank_between("z", None) > "z"
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+
+
+def test_repeated_inserts_keep_order_without_trailing_zeros():
+    rng = random.Random(7)
+    keys = [rank_between(None, None)]
+    for _ in range(2000):
+        index = rng.randrange(len(keys) + 1)
+        lower = keys[index - 1] if index else None
+        upper = keys[index] if index < len(keys) else None
+        keys.insert(index, rank_between(lower, upper))
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert not any(key.endswith("0") for key in keys)
+
+
+def test_spread_ranks_are_fixed_width_and_ascending():
+    for count in (0, 1, 2, 35, 36, 1000):
+        ranks = spread_ranks(count)
+        assert len(ranks) == count
+        assert ranks == sorted(set(ranks))
+        assert len({len(rank) for rank in ranks}) <= 1
+        assert not any(rank.endswith("0") for rank in ranks)
+
+
+def test_place_between_keeps_positions_and_only_ranks_ties():
+    first, second, third = RankedRow(1, 0, None), RankedRow(2, 1, None), RankedRow(3, 1, "m")
+    assert place_between(None, first).position == -1
+    assert place_between(first, second).position == 0
+    assert place_between(first, second).rank > (first.rank or "")
+    between = place_between(second, third)
+    assert between.position == 1 and between.rank < "m"
+    assert place_between(third, None).rank > "m"
+    # Tied positions with nothing to rank between them need a rebalance first
+    assert place_between(RankedRow(4, 2, None), RankedRow(5, 2, None)) is None
+    assert place_between(RankedRow(4, None, None), None) is None
+
+
+def test_rebalance_positions_keeps_order():
+    rows = [RankedRow(1, None, None), RankedRow(2, 3, None), RankedRow(3, 3, None), RankedRow(4, None, "zz")]
+    rebalanced = rebalance_positions(rows)
+    assert [row.id for row in rebalanced] == [1, 2, 3, 4]
+    assert [row.position for row in rebalanced] == [0, 3, 3, 3]
+    keys = [(row.position, row.rank) for row in rebalanced]
+    assert keys == sorted(keys)
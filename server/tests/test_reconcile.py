@@ -0,0 +1,43 @@
+from app.programs.reconcile import plan_child_changes
+
+COLUMNS = ["title", "order_index"]
+
+
+def existing(*titles):
+    return [{"id": 10 + i, "title": title, "order_index": i} for i, title in enumerate(titles)]
+
+
+def incoming(*titles, ids=None):
+    ids = ids or [None] * len(titles)
+    return [(row_id, {"title": title, "order_index": i}) for i, (row_id, title) in enumerate(zip(ids, titles))]
+
+
+def test_identical_payload_changes_nothing():
+    changes = plan_child_changes(existing("A", "B", "C"), incoming("A", "B", "C"), COLUMNS, "order_index")
+    assert changes.counts() == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 3}
+    assert not changes.changed
+
+
+def test_edited_row_is_updated_in_place():
+    changes = plan_child_changes(existing("A", "B", "C"), incoming("A", "B2", "C"), COLUMNS, "order_index")
+    assert changes.updates == [(11, {"title": "B2"})]
+    assert changes.counts()["unchanged"] == 2
+
+
+def test_reorder_only_touches_positions():
+    changes = plan_child_changes(existing("A", "B", "C"), incoming("C", "A", "B", ids=[12, 10, 11]), COLUMNS, "order_index")
+    assert sorted(changes.updates) == [(10, {"order_index": 1}), (11, {"order_index": 2}), (12, {"order_index": 0})]
+    assert not changes.inserts and not changes.deletes
+
+
+def test_added_and_removed_rows():
+    grown = plan_child_changes(existing("A"), incoming("A", "B"), COLUMNS, "order_index")
+    assert grown.inserts == [{"title": "B", "order_index": 1}] and grown.unchanged == 1
+
+    shrunk = plan_child_changes(existing("A", "B", "C"), [(None, {"title": "A", "order_index": 0})], COLUMNS, "order_index")
+    assert shrunk.deletes == [11, 12] and shrunk.unchanged == 1
+
+
+def test_unknown_client_id_is_treated_as_new_row():
+    changes = plan_child_changes(existing("A"), incoming("A", "B", ids=[10, 999]), COLUMNS, "order_index")
+    assert changes.inserts == [{"title": "B", "order_index": 1}]
@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+
+from app.database.connection import get_read_db
+from app.database.instrumentation import RepeatedQueryError, repeated_query_detector, statement_shape
+from app.middleware.timing import ServerTimingMiddleware
+from app.models.database import ScheduleItem
+
+
+def test_shape_ignores_literals_and_parameter_lists():
+    assert statement_shape("SELECT a FROM t1\n  WHERE id IN ($1, $2, $3) AND x = 'o''k' LIMIT 10") == \
+        statement_shape("SELECT a FROM t1 WHERE id IN ($1) AND x = 'y' LIMIT 20") == \
+        "SELECT a FROM t1 WHERE id IN (?) AND x = ? LIMIT ?"
+    assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?)"
+
+
+def n_plus_one_app():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/items/{program_id}")
+    async def items(program_id: int, db=Depends(get_read_db)):
+        ids = (await db.execute(select(ScheduleItem.id).where(ScheduleItem.program_id == program_id))).scalars().all()
+        # One SELECT per item: what the guard is for
+        return [(await db.execute(select(ScheduleItem.title).where(ScheduleItem.id == item_id))).scalar_one() for item_id in ids]
+
+    return app
+
+
+async def get(app, path):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path)
+
+
+def add_items(db, program, count):
+    db.add_all(ScheduleItem(program_id=program.id, title=f"Item {i}", order_index=10 + i) for i in range(count))
+    db.commit()
+
+
+@pytest.mark.allow_repeated_queries
+def test_per_item_queries_are_reported_once_per_shape(db, program):
+    add_items(db, program, repeated_query_detector.threshold * 2)
+    seen = len(repeated_query_detector.violations)
+
+    response = asyncio.run(get(n_plus_one_app(), f"/items/{program.id}"))
+
+    assert response.status_code == 200
+    [violation] = repeated_query_detector.violations[seen:]
+    assert violation.request == f"GET /items/{program.id}"
+    assert violation.shape.startswith("SELECT schedule_items.title FROM schedule_items WHERE schedule_items.id = ?")
+    assert violation.count == repeated_query_detector.threshold + 1
+
+
+@pytest.mark.allow_repeated_queries
+def test_raise_mode_fails_the_request(db, program, monkeypatch):
+    add_items(db, program, repeated_query_detector.threshold * 2)
+    monkeypatch.setattr(repeated_query_detector, "raise_errors", True)
+
+    with pytest.raises(RepeatedQueryError, match="more than"):
+        asyncio.run(get(n_plus_one_app(), f"/items/{program.id}"))
+
+
+def test_batched_reorder_passes_the_guard(client, db, program, auth_headers):
+    add_items(db, program, repeated_query_detector.threshold * 3)
+    items = client.get(f"/api/v1/programs/{program.id}").json()["data"]["schedule_items"]
+
+    body = client.put(
+        f"/api/v1/programs/{program.id}/schedule/reorder",
+        json={"items": [{"id": item["id"], "order_index": index} for index, item in enumerate(reversed(items))]},
+        headers=auth_headers,
+    ).json()
+
+    assert body["success"] is True, body
+    # no_repeated_queries (conftest) fails the test if the reorder looped per item
@@ -0,0 +1,102 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.database import connection
+from app.database.connection import AsyncReadSessionLocal, create_read_engine, engine, read_sessionmaker
+from app.database.pool import PoolStats
+from app.database.replicas import ReadRouter, Replica
+from app.programs.cache import program_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def replica_from(url: str, name: str = "replica-0") -> Replica:
+    replica_engine = create_read_engine(url, PoolStats())
+    return Replica(name, replica_engine, read_sessionmaker(replica_engine))
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def lagging_replica(tmp_path, program, monkeypatch, clock):
+    """A second SQLite file holding a copy of the primary taken now: it never sees later writes."""
+    path = tmp_path / "replica.db"
+    with sqlite3.connect(engine.url.database) as source, sqlite3.connect(path) as target:
+        source.backup(target)
+    replica = replica_from(f"sqlite:///{path}")
+    router = ReadRouter(AsyncReadSessionLocal, [replica], sticky_seconds=5, clock=clock)
+    monkeypatch.setattr(connection, "read_router", router)
+    yield router
+    asyncio.run(replica.engine.dispose(close=False))
+
+
+def title_read(client, program_id, headers=None):
+    program_cache.clear()
+    return client.get(f"/api/v1/programs/{program_id}", headers=headers).json()["data"]["title"]
+
+
+def test_public_reads_go_to_the_replica(client, program, db, lagging_replica):
+    program.title = "Written after the snapshot"
+    db.commit()
+
+    assert title_read(client, program.id) == "Sunday Service"
+    assert lagging_replica.replica_reads == 1 and lagging_replica.primary_reads == 0
+
+
+def test_writer_reads_its_writes_until_the_window_ends(client, program, auth_headers, lagging_replica, clock):
+    updated = client.put(f"/api/v1/programs/{program.id}", json={"title": "Renamed"}, headers=auth_headers).json()
+    assert updated["success"] is True, updated
+
+    # The program that was written, for anyone, and anything the writing user reads
+    assert title_read(client, program.id) == "Renamed"
+    listed = client.get("/api/v1/programs/", headers=auth_headers).json()["data"]
+    assert [p["title"] for p in listed] == ["Renamed"]
+    assert lagging_replica.replica_reads == 0
+
+    clock.now += 6
+    assert title_read(client, program.id, auth_headers) == "Sunday Service"
+    assert lagging_replica.replica_reads == 1
+
+
+def test_bulk_update_is_read_back_from_the_primary(client, program, auth_headers, lagging_replica):
+    payload = {"mode": "replace", "schedule_items": [{"title": "Only"}], "special_guests": []}
+    assert client.put(f"/api/v1/programs/{program.id}/bulk-update", json=payload, headers=auth_headers).json()["success"]
+
+    program_cache.clear()
+    data = client.get(f"/api/v1/programs/{program.id}", headers=auth_headers).json()["data"]
+    assert [item["title"] for item in data["schedule_items"]] == ["Only"]
+
+
+def test_failed_replica_is_skipped_until_healthy(tmp_path, client, program, monkeypatch, clock):
+    replica = replica_from(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReadRouter(AsyncReadSessionLocal, [replica], sticky_seconds=5, clock=clock)
+    monkeypatch.setattr(connection, "read_router", router)
+
+    with asyncio.Runner() as runner:
+        assert runner.run(router.check_health(timeout_seconds=1)) == [False]
+        assert title_read(client, program.id) == "Sunday Service"
+        assert router.replica_reads == 0 and router.primary_reads == 1
+
+        (tmp_path / "missing").mkdir()
+        assert runner.run(router.check_health(timeout_seconds=1)) == [True]
+        runner.run(replica.engine.dispose())
+
+
+def test_health_lists_replicas_without_urls(client, lagging_replica, monkeypatch):
+    monkeypatch.setattr("app.main.read_router", lagging_replica)
+
+    replicas = client.get("/health").json()["database_replicas"]
+
+    assert [(r["name"], r["healthy"]) for r in replicas] == [("replica-0", True)]
+    assert "url" not in replicas[0]
@@ -0,0 +1,64 @@
+from sqlalchemy import text
+
+from app.database.connection import engine
+from app.database.schema_registry import SchemaRegistry, schema_registry
+
+
+def test_load_reports_existing_columns():
+    registry = SchemaRegistry()
+    with engine.connect() as connection:
+        registry.load(connection)
+
+    assert registry.loaded
+    assert registry.revision is None  # test schema is created without alembic
+    assert registry.has_column("schedule_items", "order_index")
+    assert registry.has_column("special_guests", "bio")
+    assert not registry.has_column("special_guests", "nickname")
+
+
+def test_insert_statements_are_cached_per_column_set():
+    registry = SchemaRegistry()
+    first = registry.insert_statement("schedule_items", ["program_id", "title"])
+
+    assert registry.insert_statement("schedule_items", ("program_id", "title")) is first
+    assert registry.insert_statement("schedule_items", ["program_id", "title", "type"]) is not first
+    assert str(first) == "INSERT INTO schedule_items (program_id, title) VALUES (:program_id, :title) RETURNING schedule_items.id"
+
+    full_row = registry.insert_statement("schedule_items", ["program_id", "title"], ("id", "title", "created_at"))
+    assert full_row is not first
+    assert str(full_row).endswith("RETURNING schedule_items.id, schedule_items.title, schedule_items.created_at")
+
+
+def test_reloads_only_when_alembic_revision_changes():
+    registry = SchemaRegistry()
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(text("INSERT INTO alembic_version VALUES ('007')"))
+    try:
+        with engine.connect() as connection:
+            registry.load(connection)
+            assert registry.revision == "007"
+
+            registry._last_revision_check = 0.0
+            assert registry.refresh_if_revision_changed(connection) is False
+
+            connection.execute(text("UPDATE alembic_version SET version_num = '008'"))
+            registry._last_revision_check = 0.0
+            assert registry.refresh_if_revision_changed(connection) is True
+            assert registry.revision == "008"
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE alembic_version"))
+
+
+def test_add_schedule_item_skips_catalog_queries(client, program, auth_headers, queries):
+    client.post(f"/api/v1/programs/{program.id}/schedule", json={"title": "Warm-up"}, headers=auth_headers)
+    assert schema_registry.loaded
+    queries.clear()
+
+    created = client.post(
+        f"/api/v1/programs/{program.id}/schedule", json={"title": "Announcements"}, headers=auth_headers
+    ).json()
+
+    assert created["success"] is True
+    assert not [s for s in queries if "PRAGMA" in s or "sqlite_master" in s or "information_schema" in s]
@@ -0,0 +1,40 @@
+import logging
+import re
+
+
+def server_timing(response) -> dict:
+    """{metric: (duration ms, description)} from the Server-Timing header."""
+    metrics = {}
+    for entry in response.headers["server-timing"].split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        values = dict(param.split("=", 1) for param in params)
+        metrics[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return metrics
+
+
+def test_program_details_report_one_query(client, program):
+    metrics = server_timing(client.get(f"/api/v1/programs/{program.id}"))
+
+    assert metrics["db"][1] == "1 queries"
+    assert metrics["app"][0] >= metrics["db"][0] >= 0
+
+    # Served from the program cache the second time
+    assert server_timing(client.get(f"/api/v1/programs/{program.id}"))["db"][1] == "0 queries"
+
+
+def test_statement_count_matches_what_the_engines_sent(client, program, auth_headers, queries):
+    payload = {"mode": "replace", "schedule_items": [{"title": "Only"}], "special_guests": []}
+    response = client.put(f"/api/v1/programs/{program.id}/bulk-update", json=payload, headers=auth_headers)
+
+    assert response.json()["success"] is True
+    count = int(re.match(r"(\d+) queries", server_timing(response)["db"][1]).group(1))
+    assert count == len(queries) > 0
+
+
+def test_timing_is_logged_with_structured_fields(client, program, caplog):
+    with caplog.at_level(logging.INFO, logger="app.middleware.timing"):
+        client.get(f"/api/v1/programs/{program.id}")
+
+    record = next(r for r in caplog.records if r.getMessage() == "Request timing")
+    assert (record.method, record.path, record.status_code) == ("GET", f"/api/v1/programs/{program.id}", 200)
+    assert record.db_statements == 1 and record.duration_ms >= record.db_ms >= 0
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, field_serializer
+from sqlalchemy import event, text
+
+from app.database.connection import ReleaseSessionRoute, async_engine, async_pool_stats, async_read_engine, get_async_db
+
+checked_out_while_serializing = []
+
+
+class Probe(BaseModel):
+    value: int
+
+    @field_serializer("value")
+    def record_pool(self, value):
+        checked_out_while_serializing.append(async_engine.pool.checkedout())
+        return value
+
+
+def probe_app(route_class):
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/probe")
+    async def probe(db=Depends(get_async_db)):
+        await db.execute(text("SELECT 1"))
+        return {"probe": Probe(value=1)}
+
+    @router.get("/untouched")
+    async def untouched(db=Depends(get_async_db)):
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def get(app, path):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return (await client.get(path)).json()
+
+
+@pytest.mark.parametrize("route_class, held", [(ReleaseSessionRoute, 0), (APIRoute, 1)])
+def test_connection_is_back_in_the_pool_before_serialization(route_class, held):
+    checked_out_while_serializing.clear()
+    body = asyncio.run(get(probe_app(route_class), "/probe"))
+
+    assert body == {"probe": {"value": 1}}
+    assert checked_out_while_serializing == [held]
+
+
+def test_session_without_statements_takes_no_connection():
+    before = async_pool_stats.checkouts
+    assert asyncio.run(get(probe_app(ReleaseSessionRoute), "/untouched")) == {"ok": True}
+    assert async_pool_stats.checkouts == before
+
+
+@pytest.fixture
+def engines_used():
+    """(engine name, statement) for every statement the API sends."""
+    used = []
+    listeners = []
+    for name, api_engine in (("write", async_engine), ("read", async_read_engine)):
+        def record(conn, cursor, statement, parameters, context, executemany, name=name):
+            used.append((name, statement))
+        event.listen(api_engine.sync_engine, "before_cursor_execute", record)
+        listeners.append((api_engine, record))
+    yield used
+    for api_engine, record in listeners:
+        event.remove(api_engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_public_reads_use_the_autocommit_read_engine(client, program, church, auth_headers, engines_used):
+    for path in ("/api/v1/programs/", f"/api/v1/programs/{program.id}", f"/api/v1/church/info?church_id={church.id}"):
+        engines_used.clear()
+        assert client.get(path).json()["success"] is True
+        assert engines_used and {name for name, _ in engines_used} == {"read"}, (path, engines_used)
+
+    engines_used.clear()
+    client.put(f"/api/v1/programs/{program.id}", json={"theme": "Hope"}, headers=auth_headers)
+    assert {name for name, _ in engines_used} == {"write"}
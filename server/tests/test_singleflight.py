@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+
+from app.main import app
+from app.singleflight import SingleFlight
+import app.church.router as church_router
+import app.programs.router as programs_router
+
+CONCURRENT_REQUESTS = 25
+
+
+def slow(loader, calls):
+    """Wrap a DB loader so it stays in flight long enough for every request to pile up."""
+    async def wrapped(*args, **kwargs):
+        calls.append(args)
+        await asyncio.sleep(0.05)
+        return await loader(*args, **kwargs)
+    return wrapped
+
+
+async def fire(path: str, count: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.get(path) for _ in range(count)))
+
+
+def test_concurrent_program_reads_share_one_load(program, monkeypatch, queries):
+    calls = []
+    monkeypatch.setattr(programs_router, "get_program_details", slow(programs_router.get_program_details, calls))
+
+    responses = asyncio.run(fire(f"/api/v1/programs/{program.id}", CONCURRENT_REQUESTS))
+
+    assert len(calls) == 1
+    assert len(queries) == 1
+    assert len({r.content for r in responses}) == 1
+    assert responses[0].json()["data"]["title"] == "Sunday Service"
+
+
+def test_concurrent_church_info_reads_share_one_load(church, monkeypatch, queries):
+    calls = []
+    monkeypatch.setattr(church_router, "load_church_info", slow(church_router.load_church_info, calls))
+
+    responses = asyncio.run(fire("/api/v1/church/info", CONCURRENT_REQUESTS))
+
+    assert len(calls) == 1
+    assert len(queries) == 1
+    assert all(r.json()["data"]["name"] == "Test Church" for r in responses)
+
+
+def test_church_update_detaches_in_flight_info_load(church, admin_user, auth_headers, monkeypatch):
+    calls = []
+    release = None
+    load_church_info = church_router.load_church_info
+
+    async def first_load_held(*args):
+        calls.append(args)
+        result = await load_church_info(*args)
+        if len(calls) == 1:
+            await release.wait()  # read before the update, answers after it
+        return result
+
+    monkeypatch.setattr(church_router, "load_church_info", first_load_held)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            stale = asyncio.ensure_future(client.get("/api/v1/church/info"))
+            while not calls:
+                await asyncio.sleep(0.005)
+            try:
+                await client.put("/api/v1/church/settings", json={"name": "Renamed Church"}, headers=auth_headers)
+                # Joining the held load would wait for it forever
+                fresh = await asyncio.wait_for(client.get("/api/v1/church/info"), timeout=5)
+            finally:
+                release.set()
+            return (await stale).json(), fresh.json()
+
+    stale, fresh = asyncio.run(scenario())
+
+    assert stale["data"]["name"] == "Test Church"
+    assert fresh["data"]["name"] == "Renamed Church"
+    assert len(calls) == 2
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("k", failing) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.stats() == {"in_flight": 0, "loads": 1, "shared": 0}
+
+
+def test_waiter_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "fresh"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do("k", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do("k", loader))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(scenario()) == "fresh"
+    assert len(calls) == 2
+
+
+def test_forget_detaches_in_flight_load():
+    flight = SingleFlight()
+    release = None
+
+    async def stale():
+        await release.wait()
+        return "stale"
+
+    async def fresh():
+        return "fresh"
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.ensure_future(flight.do("k", stale))
+        await asyncio.sleep(0)
+        flight.forget("k")
+        second = await flight.do("k", fresh)
+        release.set()
+        return await first, second
+
+    assert asyncio.run(scenario()) == ("stale", "fresh")